@@ -1,5 +1,8 @@
-__all__ = ['color',
+__all__ = ['campaign',
+           'color',
+           'columns',
            'corporation',
+           'distribution',
            'exception',
            'generator',
            'hexinfo',
@@ -9,13 +12,18 @@ __all__ = ['color',
            'orbitalobject',
            'random',
            'religion',
+           'rolltable',
+           'scan',
            'sector',
            'star',
            'system',
            'text',
            'world']
+import campaign
 import color
+import columns
 import corporation
+import distribution
 import exception
 import generator
 import hexinfo
@@ -25,6 +33,8 @@ import name
 import orbitalobject
 import random
 import religion
+import rolltable
+import scan
 import sector
 import star
 import system
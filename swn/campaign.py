@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+import exception
+import hexutils
+
+# Campaign class ---------------------------------------------------------------
+## Campaign class.
+#
+# Grid of adjacent sectors, see Generator.campaign. Each sector's major row
+# and column is its place in the grid, and hexes have global coordinates that
+# run across sectors: global row = majorRow*sectorRows + row, and likewise
+# for columns. Global hexes continue the odd-q layout of each sector when
+# sectors have an even number of columns, as the default sector does.
+class Campaign(object):
+    ## Campaign constructor.
+    #  @param self    The object pointer.
+    #  @param seed    Campaign seed string.
+    #  @param rows    Number of sector rows.
+    #  @param cols    Number of sector columns.
+    #  @param sectors Dictionary of sectors keyed by (majorRow, majorCol).
+    #                 Every sector must be the same size.
+    #  @param names   Name allocator shared by the sectors.
+    def __init__(self, seed, rows, cols, sectors, names):
+        self.seed    = exception.arg_check(seed,    str)
+        self.rows    = exception.arg_check(rows,    int)
+        self.cols    = exception.arg_check(cols,    int)
+        self.sectors = exception.arg_check(sectors, dict)
+        self.names   = names
+        for majorRow in xrange(rows):
+            for majorCol in xrange(cols):
+                if ((majorRow, majorCol) not in sectors):
+                    raise MissingSectorError(majorRow, majorCol)
+        # Hexes per sector
+        firstSector = sectors[(0, 0)]
+        self.sectorRows = firstSector.rows
+        self.sectorCols = firstSector.cols
+        for s in sectors.itervalues():
+            if ((s.rows != self.sectorRows) or (s.cols != self.sectorCols)):
+                raise SectorSizeMismatchError(s.name, s.rows, s.cols, self.sectorRows, self.sectorCols)
+
+    ## Sector of a major row and column.
+    def sector(self, majorRow, majorCol):
+        return(self.sectors[(majorRow, majorCol)])
+
+    ## Number of global hex rows.
+    def hex_rows(self):
+        return(self.rows*self.sectorRows)
+
+    ## Number of global hex columns.
+    def hex_cols(self):
+        return(self.cols*self.sectorCols)
+
+    ## Global hex of a sector hex.
+    #  @param majorRow Major row of the sector.
+    #  @param majorCol Major column of the sector.
+    #  @param row      Hex row in the sector.
+    #  @param col      Hex column in the sector.
+    #  @return (row, col) of the global hex.
+    def global_hex(self, majorRow, majorCol, row, col):
+        exception.arg_range_check(majorRow, 0, self.rows-1)
+        exception.arg_range_check(majorCol, 0, self.cols-1)
+        exception.arg_range_check(row,      0, self.sectorRows-1)
+        exception.arg_range_check(col,      0, self.sectorCols-1)
+        return((majorRow*self.sectorRows + row, majorCol*self.sectorCols + col))
+
+    ## Sector hex of a global hex.
+    #  @param gRow Global hex row.
+    #  @param gCol Global hex column.
+    #  @return (majorRow, majorCol, row, col) of the hex.
+    def local_hex(self, gRow, gCol):
+        exception.arg_range_check(gRow, 0, self.hex_rows()-1)
+        exception.arg_range_check(gCol, 0, self.hex_cols()-1)
+        (majorRow, row) = divmod(gRow, self.sectorRows)
+        (majorCol, col) = divmod(gCol, self.sectorCols)
+        return((majorRow, majorCol, row, col))
+
+    ## System in a global hex.
+    #  @return The system, None for an empty hex.
+    def system(self, gRow, gCol):
+        (majorRow, majorCol, row, col) = self.local_hex(gRow, gCol)
+        return(self.sectors[(majorRow, majorCol)].hexes[(row, col)].system)
+
+    ## Sort systems by global hex numbering.
+    #  @return List of (row, col) of every global hex with a system, sorted
+    #          by column then row.
+    def sorted_systems(self):
+        systemList = list()
+        for ((majorRow, majorCol), s) in self.sectors.iteritems():
+            for (row, col) in s.system_hex_list():
+                systemList.append(self.global_hex(majorRow, majorCol, row, col))
+        return(sorted(systemList, key=lambda e: (e[1], e[0])))
+
+    ## Distance between two global hexes.
+    def distance(self, aRow, aCol, bRow, bCol):
+        return(hexutils.odd_q_distance(aRow, aCol, bRow, bCol))
+
+# Exceptions -------------------------------------------------------------------
+class MissingSectorError(Exception):
+    def __init__(self,majorRow,majorCol):
+        eStringTemplate = 'Campaign has no sector at major row {0}, column {1}.'
+        self.eString = eStringTemplate.format(majorRow,majorCol)
+        Exception.__init__(self,self.eString)
+
+class SectorSizeMismatchError(Exception):
+    def __init__(self,sectorName,rows,cols,expectedRows,expectedCols):
+        eStringTemplate = 'Sector {0} is {1}x{2}, campaign sectors are {3}x{4}.'
+        self.eString = eStringTemplate.format(sectorName,rows,cols,expectedRows,expectedCols)
+        Exception.__init__(self,self.eString)
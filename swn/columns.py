@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+
+import mmap
+import numpy as np
+import os
+import shutil
+import tempfile
+
+import exception
+import orbitalobject
+import star
+import world
+
+# Directory of shared memory files. Files in /dev/shm are kept in memory, so
+# mapping one shares its pages instead of reading from disk.
+SHARED_MEMORY_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+# Column groups, each with its own number of rows per sector
+GROUP_SYSTEMS = 'systems'
+GROUP_WORLDS  = 'worlds'
+GROUP_STARS   = 'stars'
+GROUP_OBJECTS = 'objects'
+GROUPS = [GROUP_SYSTEMS, GROUP_WORLDS, GROUP_STARS, GROUP_OBJECTS]
+
+# Categories that code columns index
+OBJECT_TYPES = sorted(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE.values())
+CATEGORIES = {
+    'worldAtmospheres':  world.TABLE_ATMOSPHERE.categories,
+    'worldBiospheres':   world.TABLE_BIOSPHERE.categories,
+    'worldPopulations':  world.TABLE_POPULATION.categories,
+    'worldTags':         world.TAG_LIST,
+    'worldTemperatures': world.TABLE_TEMPERATURE.categories,
+    'worldTechLevels':   world.TABLE_TECH_LEVEL.categories,
+    'starColors':        star.TABLE_COLOR.categories,
+    'starColorTexts':    star.TABLE_COLOR_TEXT.categories,
+    'starClasses':       star.TABLE_COLOR_SEQUENCE.categories,
+    'objectTypes':       OBJECT_TYPES
+}
+# Code of each category, keyed by column name
+CATEGORY_CODES = dict((column, dict((c, i) for (i, c) in enumerate(categories)))
+                      for (column, categories) in CATEGORIES.iteritems())
+
+# Columns: name, group, dtype, and shape of each row. Names are byte strings
+# as wide as the longest name.
+COLUMNS = [
+    ('systemRows',          GROUP_SYSTEMS, np.int16,   ()),
+    ('systemCols',          GROUP_SYSTEMS, np.int16,   ()),
+    ('systemNames',         GROUP_SYSTEMS, np.string_, ()),
+    ('worldSystems',        GROUP_WORLDS,  np.int32,   ()),
+    ('worldNames',          GROUP_WORLDS,  np.string_, ()),
+    ('worldAtmospheres',    GROUP_WORLDS,  np.uint8,   ()),
+    ('worldBiospheres',     GROUP_WORLDS,  np.uint8,   ()),
+    ('worldPopulations',    GROUP_WORLDS,  np.uint8,   ()),
+    ('worldPopulationAlts', GROUP_WORLDS,  np.int64,   ()),
+    ('worldTags',           GROUP_WORLDS,  np.uint8,   (2,)),
+    ('worldTemperatures',   GROUP_WORLDS,  np.uint8,   ()),
+    ('worldTechLevels',     GROUP_WORLDS,  np.uint8,   ()),
+    ('starSystems',         GROUP_STARS,   np.int32,   ()),
+    ('starColors',          GROUP_STARS,   np.uint8,   ()),
+    ('starColorTexts',      GROUP_STARS,   np.uint8,   ()),
+    ('starClasses',         GROUP_STARS,   np.uint8,   ()),
+    ('starSubclasses',      GROUP_STARS,   np.int8,    ()),
+    ('starMasses',          GROUP_STARS,   np.float64, ()),
+    ('starRadii',           GROUP_STARS,   np.float64, ()),
+    ('objectSystems',       GROUP_OBJECTS, np.int32,   ()),
+    ('objectTypes',         GROUP_OBJECTS, np.uint8,   ()),
+    ('objectParents',       GROUP_OBJECTS, np.int32,   ()),
+    ('objectWorlds',        GROUP_OBJECTS, np.int32,   ()),
+    ('objectRings',         GROUP_OBJECTS, bool,       ())
+]
+
+# Column that counts the rows of each group
+_GROUP_COLUMNS = {GROUP_SYSTEMS: 'systemRows',
+                  GROUP_WORLDS:  'worldSystems',
+                  GROUP_STARS:   'starSystems',
+                  GROUP_OBJECTS: 'objectSystems'}
+
+# Byte alignment of columns in shared memory
+_ALIGNMENT = 8
+
+# Sector columns class ---------------------------------------------------------
+## Sector columns class.
+#
+# Sector data as numpy columns instead of objects, so many sectors can be
+# moved between processes as a few buffers, see write_shared and read_shared.
+# Columns are grouped by what their rows are, see COLUMNS:
+#   systems: Systems in sorted hex order, with their hex and name.
+#   worlds:  Worlds of each system in order, with the index of their system.
+#   stars:   Stars of each system in order, with the index of their system.
+#   objects: Orbital objects of each system, innermost first, each followed
+#            by its space stations then moons. Orbit objects have a parent of
+#            -1, stations and moons have the index of their planet. World is
+#            the index of the world on the object, -1 for none.
+# Code columns hold indices into their CATEGORIES list, e.g. worldTags holds
+# indices into world.TAG_LIST. Corporations and religions aren't included.
+class SectorColumns(object):
+    ## Sector columns constructor.
+    #  @param self       The object pointer.
+    #  @param sectorName Sector name.
+    #  @param columns    Dictionary of column arrays keyed by column name.
+    def __init__(self, sectorName, columns):
+        self.name = exception.arg_check(sectorName, str)
+        columns   = exception.arg_check(columns, dict)
+        for (column, group, dtype, shape) in COLUMNS:
+            setattr(self, column, columns[column])
+
+    ## Number of rows of a column group.
+    #  @param self  The object pointer.
+    #  @param group Column group, see GROUPS.
+    def num_rows(self, group):
+        return(len(getattr(self, _GROUP_COLUMNS[group])))
+
+    ## Decode a code column.
+    #  @param self   The object pointer.
+    #  @param column Column name, see CATEGORIES.
+    #  @return List of category values.
+    def values(self, column):
+        categories = CATEGORIES[column]
+        return([categories[c] for c in getattr(self, column).flat])
+
+# Functions --------------------------------------------------------------------
+## Category codes.
+#  @param column Column name, see CATEGORIES.
+#  @param values List of values.
+#  @return List of the index of each value in the column's categories.
+def _codes(column, values):
+    codes = CATEGORY_CODES[column]
+    for v in values:
+        if (v not in codes):
+            raise UnknownCategoryError(v, column)
+    return([codes[v] for v in values])
+
+## Sector columns.
+#
+#  Encodes a generated sector, up to whichever stage it was generated to.
+#  @param sectorObj Sector.
+#  @return SectorColumns of the sector.
+def sector_columns(sectorObj):
+    rows = dict((column, list()) for (column, group, dtype, shape) in COLUMNS)
+    for (systemIndex, (row, col)) in enumerate(sectorObj.sorted_systems()):
+        systemObj = sectorObj.hexes[(row, col)].system
+        rows['systemRows'].append(row)
+        rows['systemCols'].append(col)
+        rows['systemNames'].append(systemObj.name)
+        # Worlds, indexed by object so orbital objects can point to them
+        worldIndices = dict()
+        for w in systemObj.worlds:
+            worldIndices[id(w)] = len(rows['worldSystems'])
+            rows['worldSystems'].append(systemIndex)
+            rows['worldNames'].append(w.name)
+            rows['worldAtmospheres'].append(w.atmosphere)
+            rows['worldBiospheres'].append(w.biosphere)
+            rows['worldPopulations'].append(w.population)
+            rows['worldPopulationAlts'].append(w.populationAlt)
+            rows['worldTags'].extend(w.tags)
+            rows['worldTemperatures'].append(w.temperature)
+            rows['worldTechLevels'].append(w.techLevel)
+        for s in systemObj.stars:
+            rows['starSystems'].append(systemIndex)
+            rows['starColors'].append(s.color)
+            rows['starColorTexts'].append(s.colorText)
+            rows['starClasses'].append(s.classification)
+            rows['starSubclasses'].append(s.spectralSubclass)
+            rows['starMasses'].append(s.solarMass)
+            rows['starRadii'].append(s.solarRadius)
+        # Orbit objects, then their stations and moons
+        for o in systemObj.objects:
+            parent = len(rows['objectSystems'])
+            children = getattr(o, 'stations', []) + getattr(o, 'moons', [])
+            for (child, childParent) in [(o, -1)] + [(c, parent) for c in children]:
+                rows['objectSystems'].append(systemIndex)
+                rows['objectTypes'].append(child.objectType)
+                rows['objectParents'].append(childParent)
+                rows['objectWorlds'].append(-1 if (child.world is None) else worldIndices[id(child.world)])
+                rows['objectRings'].append(getattr(child, 'rings', False))
+    columns = dict()
+    for (column, group, dtype, shape) in COLUMNS:
+        values = rows[column]
+        if (column in CATEGORIES):
+            values = _codes(column, values)
+        columns[column] = np.array(values, dtype=dtype).reshape((-1,) + shape)
+    return(SectorColumns(sectorObj.name, columns))
+
+## New shared memory directory.
+#
+#  Files of one writer and reader pair can be written into their own 
+#  directory, so files that are never read can be removed with it, see 
+#  remove_shared_dir.
+#  @return Directory path.
+def new_shared_dir():
+    return(tempfile.mkdtemp(prefix='swn-columns-', dir=SHARED_MEMORY_DIR))
+
+## Remove a shared memory directory and any files left in it.
+#  @param directory Directory path, see new_shared_dir.
+def remove_shared_dir(directory):
+    shutil.rmtree(directory, ignore_errors=True)
+
+## Write sector columns to shared memory.
+#
+#  Columns of every sector are written one after another into one shared
+#  memory file, see read_shared. Only the layout has to be sent to the reader,
+#  so sending the sectors costs the same no matter how many objects they have.
+#  @param sectorColumns List of SectorColumns.
+#  @param directory     Directory to write to. Default is SHARED_MEMORY_DIR.
+#  @return Shared memory file path and layout.
+def write_shared(sectorColumns, directory=None):
+    directory = exception.arg_check(directory, str, SHARED_MEMORY_DIR)
+    # Rows of each group in each sector, as offsets into the written columns
+    offsets = dict()
+    for group in GROUPS:
+        offsets[group] = np.cumsum([0] + [c.num_rows(group) for c in sectorColumns]).tolist()
+    (fd, path) = tempfile.mkstemp(prefix='swn-columns-', dir=directory)
+    columnLayout = list()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            position = 0
+            for (column, group, dtype, shape) in COLUMNS:
+                data = np.concatenate([getattr(c, column) for c in sectorColumns] +
+                                      [np.zeros((0,) + shape, dtype=dtype)])
+                padding = -position % _ALIGNMENT
+                f.write('\0'*padding)
+                position += padding
+                columnLayout.append((column, position, data.dtype.str))
+                f.write(data.tobytes())
+                position += data.nbytes
+            # Files can't be mapped empty
+            f.write('\0'*_ALIGNMENT)
+    except:
+        os.remove(path)
+        raise
+    layout = {'names':   [c.name for c in sectorColumns],
+              'offsets': offsets,
+              'columns': columnLayout}
+    return(path, layout)
+
+## Read sector columns from shared memory.
+#
+#  Maps the shared memory file written by write_shared, and removes it. The
+#  columns are read only views of the mapped file, nothing is copied. The file
+#  is unmapped once no columns use it.
+#  @param path   Shared memory file path.
+#  @param layout Layout returned by write_shared.
+#  @return List of SectorColumns.
+def read_shared(path, layout):
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    os.remove(path)
+    offsets = layout['offsets']
+    data = dict()
+    for ((column, group, columnType, shape), (layoutColumn, position, dtype)) in zip(COLUMNS, layout['columns']):
+        if (column != layoutColumn):
+            raise LayoutMismatchError(layoutColumn, column)
+        count = offsets[group][-1]*int(np.prod(shape))
+        data[column] = np.frombuffer(buf, dtype=dtype, count=count, offset=position).reshape((-1,) + shape)
+    sectorColumns = list()
+    for (s, sectorName) in enumerate(layout['names']):
+        columns = dict()
+        for (column, group, dtype, shape) in COLUMNS:
+            columns[column] = data[column][offsets[group][s]:offsets[group][s+1]]
+        sectorColumns.append(SectorColumns(sectorName, columns))
+    return(sectorColumns)
+
+# Exceptions -------------------------------------------------------------------
+class LayoutMismatchError(Exception):
+    def __init__(self,column,expected):
+        eStringTemplate = 'Shared column {0} found where {1} was expected.'
+        self.eString = eStringTemplate.format(column,expected)
+        Exception.__init__(self,self.eString)
+
+class UnknownCategoryError(Exception):
+    def __init__(self,value,column):
+        eStringTemplate = 'No {1} code for {0}.'
+        self.eString = eStringTemplate.format(value,column)
+        Exception.__init__(self,self.eString)
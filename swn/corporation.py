@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 
+import rolltable
+
 # Tables -----------------------------------------------------------------------
 TABLE_BUSINESS = {
     1:  'Aeronautics',
@@ -213,6 +215,13 @@ TABLE_REPUTATION = {
     100: 'Deeply entangled with the planetary underworld'
 }
 
+# Roll tables ------------------------------------------------------------------
+# Tables compiled into arrays and checked to cover every roll, see rolltable
+TABLE_BUSINESS     = rolltable.register('corporation.TABLE_BUSINESS',TABLE_BUSINESS,1,50)
+TABLE_NAME         = rolltable.register('corporation.TABLE_NAME',TABLE_NAME,1,25)
+TABLE_ORGANIZATION = rolltable.register('corporation.TABLE_ORGANIZATION',TABLE_ORGANIZATION,1,25)
+TABLE_REPUTATION   = rolltable.register('corporation.TABLE_REPUTATION',TABLE_REPUTATION,1,100)
+
 # Corporation class ------------------------------------------------------------
 class Corporation(object):
     def __init__(self,
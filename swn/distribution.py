@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+import exception
+import generator
+import orbitalobject
+import random
+import sector
+import star
+import system
+import world
+
+# Exact outcome distributions of sector generation. Probabilities are worked
+# out from the dice and tables used by generator.Generator instead of sampled,
+# and are returned as numpy arrays. Every generation version gives the same
+# distributions.
+
+MAX_SYSTEMS = 30 # Most star systems a sector can have (1d10+20)
+
+# Tech levels from lowest to highest
+TECH_LEVELS = sorted(world.TABLE_TECH_LEVEL_REVERSE, key=world.TABLE_TECH_LEVEL_REVERSE.get)
+
+# Star colors in star.TABLE_COLOR id order
+STAR_COLORS = [star.TABLE_COLOR[i] for i in sorted(star.TABLE_COLOR)]
+
+# Functions --------------------------------------------------------------------
+## Dice distribution.
+#
+# Distribution of the sum of N number of D dice plus M.
+# @param num Number of dice.
+# @param die Which sided die.
+# @param mod Modifier added to the sum. Default is 0.
+# @return Array of sums and array of their probabilities.
+def dice(num, die, mod=0):
+    ways   = random.dice_distribution(num,die)
+    totals = sorted(ways)
+    return(np.array(totals)+mod,
+           np.array([ways[t] for t in totals],dtype=float)/die**num)
+
+## Table distribution.
+#
+# Distribution of the entries of a table rolled with N number of D dice.
+# @param table Table dictionary keyed by roll.
+# @param num   Number of dice rolled. Default is 1.
+# @param die   Which sided die rolled. Default is the largest table key.
+# @return List of entries and array of their probabilities.
+def table(table, num=1, die=None):
+    die = exception.arg_check(die,int,max(table))
+    probs = dict()
+    for (roll, p) in zip(*dice(num,die)):
+        probs[table[roll]] = probs.get(table[roll],0.) + p
+    entries = sorted(probs)
+    return(entries, np.array([probs[e] for e in entries]))
+
+## Number of systems.
+#
+# Counts are scaled to the sector's area, see generator.scaled_count.
+# @param rows Number of hex rows. Default is sector.SECTOR_ROWS.
+# @param cols Number of hex columns. Default is sector.SECTOR_COLS.
+# @return Array of numbers of systems and array of their probabilities.
+def num_systems(rows=None, cols=None):
+    rows = exception.arg_check(rows,int,sector.SECTOR_ROWS)
+    cols = exception.arg_check(cols,int,sector.SECTOR_COLS)
+    (rolls, pRolls) = dice(1,10,20)
+    probs = dict()
+    for (roll, p) in zip(rolls, pRolls):
+        count = min(generator.scaled_count(int(roll),rows*cols),rows*cols)
+        probs[count] = probs.get(count,0.) + p
+    counts = sorted(probs)
+    return(np.array(counts), np.array([probs[c] for c in counts]))
+
+## Worlds per system.
+#
+# Systems get worlds in sorted hex order, rolling on the worlds table until
+# the sector has MAX_WORLDS worlds, then one world each.
+# @return Array of the probability that the system at each sorted index
+#         exists and has each number of worlds, indexed [system, worlds].
+def worlds_per_system():
+    (numWorlds, pWorlds) = table(system.TABLE_WORLDS)
+    maxWorlds = max(numWorlds)
+    # Probability of each world count before each system
+    pCount = np.zeros(MAX_SYSTEMS*maxWorlds+1)
+    pCount[0] = 1.
+    (systems, pSystems) = num_systems()
+    pExists = np.array([pSystems[systems > s].sum() for s in xrange(MAX_SYSTEMS)])
+    ret = np.zeros((MAX_SYSTEMS,maxWorlds+1))
+    for s in xrange(MAX_SYSTEMS):
+        nextCount = np.zeros_like(pCount)
+        # Below the cap, roll on the table
+        rolled = pCount[:generator.MAX_WORLDS]
+        for (n, p) in zip(numWorlds, pWorlds):
+            ret[s,n]                    += rolled.sum()*p
+            nextCount[n:n+len(rolled)] += rolled*p
+        # At or over the cap, one world
+        capped = pCount[generator.MAX_WORLDS:-1]
+        ret[s,1] += capped.sum()
+        nextCount[generator.MAX_WORLDS+1:] += capped
+        pCount = nextCount
+        ret[s] *= pExists[s]
+    return(ret)
+
+## Number of worlds in a sector.
+#
+# @return Array of numbers of worlds and array of their probabilities.
+def world_count():
+    (numWorlds, pWorlds) = table(system.TABLE_WORLDS)
+    (systems, pSystems)  = num_systems()
+    pCount = np.zeros(MAX_SYSTEMS*max(numWorlds)+1)
+    pCount[0] = 1.
+    ret = np.zeros_like(pCount)
+    for s in xrange(1,MAX_SYSTEMS+1):
+        nextCount = np.zeros_like(pCount)
+        rolled = pCount[:generator.MAX_WORLDS]
+        for (n, p) in zip(numWorlds, pWorlds):
+            nextCount[n:n+len(rolled)] += rolled*p
+        nextCount[generator.MAX_WORLDS+1:] += pCount[generator.MAX_WORLDS:-1]
+        pCount = nextCount
+        # Sectors with exactly s systems stop here
+        ret += pCount*pSystems[systems == s].sum()
+    return(np.arange(len(ret)), ret)
+
+## Main world tech level.
+#
+# The main world is the world with the highest tech level in its system.
+# @param numWorlds Number of worlds in the system. Default is a system picked
+#                  at random from a random sector.
+# @return List of tech levels, lowest first, and array of their probabilities.
+def main_world_tech_level(numWorlds=None):
+    (levels, pLevels) = table(world.TABLE_TECH_LEVEL,2,6)
+    pLevels = np.array([pLevels[levels.index(t)] for t in TECH_LEVELS])
+    cdf     = np.cumsum(pLevels)
+    # Highest of N worlds is at most a tech level if all N are
+    def highest(n):
+        return(np.diff(np.concatenate(([0.],cdf**n))))
+    if (numWorlds is not None):
+        exception.arg_range_check(numWorlds,1)
+        return(TECH_LEVELS, highest(numWorlds))
+    # Mix over the number of worlds of every system
+    pWorlds = worlds_per_system().sum(axis=0)
+    pWorlds = pWorlds/pWorlds.sum()
+    ret = sum(pWorlds[n]*highest(n) for n in xrange(1,len(pWorlds)))
+    return(TECH_LEVELS, ret)
+
+## Main world temperature modifier.
+#
+# @return Array of d12 modifiers and array of their probabilities.
+def _temperature_mod():
+    (temperatures, pTemperatures) = table(world.TABLE_TEMPERATURE,2,6)
+    mods = [world.TABLE_MAIN_WORLD_ORBIT_TEMP_MOD[t] for t in temperatures]
+    return(mods, pTemperatures)
+
+## System stars.
+#
+# Follows the one roll star system (ORSS) star rules of
+# generator.Generator.fill_system.
+# @return Array of the probability of 1 and 2 stars, array of the first star
+#         color probabilities, and array of the probability of a second star
+#         of each color. Colors are in STAR_COLORS order.
+def system_stars():
+    (mods, pMods) = _temperature_mod()
+    pStars  = np.zeros(2)
+    pFirst  = np.zeros(len(STAR_COLORS))
+    pSecond = np.zeros(len(STAR_COLORS))
+    for d4 in xrange(1,5):
+        for d6 in xrange(1,7):
+            for d12 in xrange(1,13):
+                for (mod, pMod) in zip(mods, pMods):
+                    p = pMod/(4*6*12.)
+                    d12Mod = max(d12+mod,1)
+                    d4Mod  = d4
+                    if (d6 == 1):
+                        d4Mod  = 1
+                        d12Mod = 0
+                    elif ((d6 == 2) or (d6 == 3)):
+                        if (d4 == 4):
+                            d12Mod += 12
+                    elif (d6 == 6):
+                        d4Mod += 1
+                    pFirst[star.TABLE_COLOR_ID[d12Mod]-1] += p
+                    numStars = system.TABLE_STARS[d4Mod]
+                    pStars[numStars-1] += p
+                    if (numStars > 1):
+                        pSecond[star.TABLE_COLOR_ID[d12Mod+4]-1] += p
+    return(pStars, pFirst, pSecond)
+
+## Probability the main world is a moon of a gas giant.
+#
+# The main world is a moon when it is airless (airless or thin atmosphere,
+# then 1 on a d2), its d20 orbit roll gives it moons to be one of, and its
+# tech level is above 2. It orbits a gas giant if the system has any.
+def main_world_gas_giant_moon():
+    (atmospheres, pAtmospheres) = table(world.TABLE_ATMOSPHERE,2,6)
+    pAirless = pAtmospheres[atmospheres.index(world.TABLE_ATMOSPHERE[4])]/2.
+    pMoons   = np.mean([orbitalobject.TABLE_SMALL_MOONS[d20] + orbitalobject.TABLE_MEDIUM_MOONS[d20] > 0
+                        for d20 in xrange(1,21)])
+    pGas     = np.mean([system.TABLE_GAS_GIANT_SMALL[d10] + system.TABLE_GAS_GIANT_LARGE[d10] > 0
+                        for d10 in xrange(1,11)])
+    # Tech level 2 or lower main worlds are always planets
+    (levels, pLevels) = main_world_tech_level()
+    lowLevels = [world.TABLE_TECH_LEVEL[r] for r in (2,3,4)]
+    pHighTech = sum(p for (t, p) in zip(levels, pLevels) if t not in lowLevels)
+    return(pAirless*pMoons*pGas*pHighTech)
+
+## Hex occupancy.
+#
+# Probability each hex has a star system. Only exact for grouping method 0,
+# where every system is placed in a random empty hex, so every hex is equally
+# likely. The other methods place systems by distance to the systems already
+# placed, so they have to be sampled, see test.py stats().
+# @param groupingMethod Grouping method. Only 0 is supported.
+# @param rows           Number of hex rows. Default is sector.SECTOR_ROWS.
+# @param cols           Number of hex columns. Default is sector.SECTOR_COLS.
+# @return Array of probabilities indexed [row, col].
+def hex_occupancy(groupingMethod=0, rows=None, cols=None):
+    exception.arg_range_check(groupingMethod,0,0)
+    rows = exception.arg_check(rows,int,sector.SECTOR_ROWS)
+    cols = exception.arg_check(cols,int,sector.SECTOR_COLS)
+    (systems, pSystems) = num_systems(rows,cols)
+    return(np.full((rows,cols),(systems*pSystems).sum()/(rows*cols)))
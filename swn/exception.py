@@ -53,6 +53,23 @@ class MaxLoopIterationsExceed(Exception):
         self.eString = eStringTemplate.format(count)
         Exception.__init__(self,self.eString)
 
+class NoSystem(Exception):
+    def __init__(self,key):
+        eStringTemplate = 'No star system in hex {0}.'
+        self.eString = eStringTemplate.format(key)
+        Exception.__init__(self,self.eString)
+
+class NoSectorSeed(Exception):
+    def __init__(self,sectorName):
+        eStringTemplate = 'Sector {0} has no seed to regenerate from.'
+        self.eString = eStringTemplate.format(sectorName)
+        Exception.__init__(self,self.eString)
+
+class NoEmptyHex(Exception):
+    def __init__(self):
+        self.eString = 'No empty hexes left.'
+        Exception.__init__(self,self.eString)
+
 class OutsideArgRange(Exception):
     def __init__(self,arg,low,high):
         eStringTemplate = 'Argument outside allowed range. Low: {low}, high: {high}, received: {arg}.'
@@ -2,6 +2,11 @@
 
 from __future__ import print_function
 
+import campaign
+import columns
+import copy
+import itertools
+import multiprocessing as mp
 import numpy as np
 import operator
 
@@ -22,6 +27,9 @@ MAX_WORLDS       = 36
 MAX_CORPORATIONS = 20
 MAX_RELIGIONS    = 20
 
+SECTORS_CHUNK_SIZE  = 10 # Seeds per task sent to a worker, see Generator.sectors
+CAMPAIGN_CHUNK_SIZE = 1  # Sectors per task sent to a worker, see Generator.campaign
+
 # Grouping method for placing stars after the first 20
 # 0: Completely Random
 # 1: Minimize the sum of distances between all systems
@@ -37,99 +45,265 @@ MAX_RELIGIONS    = 20
 #    linking to their nearest
 GROUPING_METHOD = 8
 
-# Generator class --------------------------------------------------------------
-class Generator(object):
-    def __init__(self):
-        self.seed = random.random_seed()
+# Generation versions. A seed always generates the same sector with the same
+# version, a newer version can generate a different sector from the same seed.
+# 1: Every stage rolls from one random stream, in order
+# 2: Each stage rolls from its own keyed random stream, and each hex from its 
+#    own stream within the world and ORSS stages, so systems can be generated 
+#    independently and in any order
+# 3: World tables are sampled with one draw each from compiled alias samplers,
+#    and the second tag is drawn from the tags other than the first instead of
+#    rerolling duplicates
+# 4: Random star positions are drawn with one roll from the empty hexes 
+#    instead of rerolling occupied hexes, so placement can't run out of tries
+# 5: System and world names are drawn without replacement from their name 
+#    pools, see name.NameAllocator, instead of rerolling used names
+# 6: Gas giants are put in a random open orbit with one draw instead of 
+#    shuffling every orbit, see system.OrbitSlots
+# 7: Sectors can be any size, with star and world counts scaled by area, see
+#    scaled_count, and groups of systems can be any size when linking groups
+GENERATOR_VERSION = 7
 
-    def corporation(self):
-        name         = corporation.TABLE_NAME[random.dice_roll(1,25)]
-        organization = corporation.TABLE_ORGANIZATION[random.dice_roll(1,25)]
-        business     = corporation.TABLE_BUSINESS[random.dice_roll(1,50)]
-        newCorporation = corporation.Corporation(name,organization,business)
-        return(newCorporation)
+# Generation stages, used to key random streams
+STAGE_SECTOR       = 0
+STAGE_POSITIONS    = 1
+STAGE_NAMES        = 2
+STAGE_WORLDS       = 3
+STAGE_ORSS         = 4
+STAGE_CORPORATIONS = 5
+STAGE_RELIGIONS    = 6
+# Regenerated systems roll from streams keyed under this stage, see 
+# Generator.regenerate_system
+STAGE_REGENERATE   = 7
+# Campaign sector seeds and renames roll from streams keyed under this stage,
+# see Generator.campaign
+STAGE_CAMPAIGN     = 8
 
-    def load(self):
-        raise Exception('Not implemented yet.')
+# Added to the names of worlds on space stations
+STATION_SUFFIX = ' Station'
 
-    def moons(self,d20):
-        numSmallMoons  = orbitalobject.TABLE_SMALL_MOONS[d20]
-        numMediumMoons = orbitalobject.TABLE_MEDIUM_MOONS[d20]
-        moonList  = [orbitalobject.Moon(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['SMALL_MOON']) for sm in xrange(numSmallMoons)]
-        moonList += [orbitalobject.Moon(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['MEDIUM_MOON']) for mm in xrange(numMediumMoons)]
-        np.random.shuffle(moonList)
-        return(moonList)
+# Functions --------------------------------------------------------------------
+## Count scaled to a sector's area.
+#
+#  Counts are set for sectors of the default size, sector.SECTOR_ROWS by 
+#  sector.SECTOR_COLS, and scaled by the number of hexes for other sizes, 
+#  rounded to the nearest integer, at least 1. A sector of the default size
+#  gets the count unchanged.
+#  @param count    Count for a sector of the default size.
+#  @param numHexes Number of hexes in the sector.
+def scaled_count(count,numHexes):
+    defaultHexes = sector.SECTOR_ROWS*sector.SECTOR_COLS
+    return(max(1,(count*numHexes + defaultHexes/2)/defaultHexes))
 
-    def name_sector(self):
-        sectorName  = np.random.choice(name.sectorFirstNameList) + ' '
-        sectorName += np.random.choice(name.sectorSecondNameList)
-        sectorName += np.random.choice(['',' I',' II',' III',' IV',' V',' VI',' VII',' VIII',' IX',' X'])
-        return(sectorName)
+## Seed of a campaign sector.
+#
+#  Keyed by the campaign seed and the sector's major row and column, so each
+#  sector's seed is known without generating any other sector.
+#  @param campaignSeed Campaign seed string.
+#  @param majorRow     Major row of the sector.
+#  @param majorCol     Major column of the sector.
+#  @return Seed string.
+def campaign_sector_seed(campaignSeed,majorRow,majorCol):
+    key = random.substream_key(random.seed_alphabet_decode(campaignSeed),
+                               STAGE_CAMPAIGN,majorRow,majorCol)
+    return(random.seed_alphabet_encode(key % (random.SEED_MAX_UINT+1)))
 
-    def name_system(self):
-        systemName = np.random.choice(name.starNameList)
-        return(systemName)
+## Sorted distance sum position.
+#
+#  Hex at an index of the distance sums sorted together with their hexes, the
+#  same as sorted(zip(sumDistAll,sumDistAllPos))[index][1]. Uses a partition 
+#  instead of a full sort.
+#  @param sumDistAll    Array of distance sums, see Sector.system_distances_test.
+#  @param sumDistAllPos List of hexes of the distance sums.
+#  @param index         Index into the sorted sums.
+def _sorted_position(sumDistAll,sumDistAllPos,index):
+    (rows,cols) = np.array(sumDistAllPos).T
+    # Order by sum, then row, then column
+    key = (sumDistAll*(rows.max()+1) + rows)*(cols.max()+1) + cols
+    return(sumDistAllPos[np.argpartition(key,index)[index]])
 
-    def name_world(self):
-        worldName = np.random.choice(name.worldNameList)
-        return(worldName)
+# Workers ----------------------------------------------------------------------
+# Each worker process keeps one generator for all of its chunks
+_workerGenerator      = None
+_workerGroupingMethod = None
+_workerLastStage      = None
+_workerRows           = None
+_workerCols           = None
+_workerSharedDir      = None
 
-    def religion(self):
-        evolution   = religion.TABLE_EVOLUTION[random.dice_roll(1,8)]
-        leadership  = religion.TABLE_LEADERSHIP[random.dice_roll(1,6)]
-        origin      = religion.TABLE_ORIGIN_TRADITION[random.dice_roll(1,12)]
-        newReligion = religion.Religion(evolution,leadership,origin)
-        return(newReligion)    
+## Initialize sector worker.
+#
+#  Name pools and tables are loaded when the module is imported, so workers
+#  forked from the parent already have them. The distance table of the sector
+#  size is built here so the first sector of every worker doesn't pay for it.
+#  @param version        Generation version to generate sectors with.
+#  @param groupingMethod Grouping method to generate sectors with.
+#  @param lastStage      Last stage to generate.
+#  @param rows           Number of hex rows.
+#  @param cols           Number of hex columns.
+#  @param sharedDir      Directory to write shared memory files to, see
+#                        _generate_chunk_columns.
+def _init_worker(version,groupingMethod,lastStage,rows,cols,sharedDir=None):
+    global _workerGenerator, _workerGroupingMethod, _workerLastStage, _workerRows, _workerCols
+    global _workerSharedDir
+    _workerGenerator      = Generator(version)
+    _workerGroupingMethod = groupingMethod
+    _workerLastStage      = lastStage
+    _workerRows           = rows
+    _workerCols           = cols
+    _workerSharedDir      = sharedDir
+    hexutils.odd_q_distance_table(rows,cols)
 
-    def rings(self,d20):
-        return(orbitalobject.TABLE_MINOR_RINGS[d20])
+## Generate a chunk of sectors.
+#  @param seeds List of seed strings.
+#  @return List of (seed, sector) pairs in seed order.
+def _generate_chunk(seeds):
+    sectors = list()
+    for seedString in seeds:
+        _workerGenerator.set_seed(seedString)
+        sectors.append((seedString,_workerGenerator.sector(_workerGroupingMethod,_workerLastStage,
+                                                            _workerRows,_workerCols)))
+    return(sectors)
 
-    def save(self,fName):
-        raise Exception('Not implemented yet.')
+## Generate a chunk of sectors into shared memory.
+#
+#  Sectors are written as columns, see columns.write_shared.
+#  @param seeds List of seed strings.
+#  @return List of seeds, shared memory file path, and layout.
+def _generate_chunk_columns(seeds):
+    sectorColumns = [columns.sector_columns(newSector) for (seedString, newSector) in _generate_chunk(seeds)]
+    (path, layout) = columns.write_shared(sectorColumns,_workerSharedDir)
+    return(seeds, path, layout)
 
-    def sector(self,
-               groupingMethod = GROUPING_METHOD):
-        # Generate random sector name
-        newsectorName = self.name_sector()
-        # Create new sector object
-        newSector = sector.Sector(newsectorName,
-                                  sector.SECTOR_MAJOR_ROW,
-                                  sector.SECTOR_MAJOR_COL,
-                                  sector.SECTOR_ROWS,
-                                  sector.SECTOR_COLS)
-        # Generate number of stars
-        numStars = random.dice_roll(1,10,20)
-        # Create list of names used
-        usedNames = list()
+# Generator class --------------------------------------------------------------
+class Generator(object):
+    ## Generator constructor.
+    #  @param self    The object pointer.
+    #  @param version Generation version. Default is the latest version.
+    def __init__(self,
+                 version = None):
+        # Check arguments
+        self.version = exception.arg_check(version,int,GENERATOR_VERSION)
+        exception.arg_range_check(self.version,1,GENERATOR_VERSION)
+        # Each generator owns its random number generator so generators can
+        # run concurrently without sharing the global numpy random state.
+        # Rolls are buffered through a dice stream.
+        self.rng  = random.DiceStream(random.new_rng())
+        self.seed = random.random_seed(self.rng)
+        # Roll tracer, see random.RollTrace and random.RollReplay. Rolls are
+        # neither traced nor replayed when None.
+        self.tracer = None
+        # Defer each system's ORSS data until it's first used, see 
+        # DeferredOrss. Needs version 2 or later, and no tracer.
+        self.lazyOrss = False
+        # Sector being generated, and the last stage generated for it
+        self.partialSector   = None
+        self._stage          = None
+        self._groupingMethod = GROUPING_METHOD
+        self._rows           = sector.SECTOR_ROWS
+        self._cols           = sector.SECTOR_COLS
+        self._names          = name.NameAllocator()
+        self._nameRng        = None
+
+    ## Add worlds to the systems of a sector.
+    #  @param self      The object pointer.
+    #  @param newSector Sector with blank systems.
+    #  @param names     Name allocator of the sector.
+    #  @param nameRng   Random stream for names.
+    def _add_worlds(self,newSector,names,nameRng):
+        systemKeys = newSector.sorted_systems()
+        # World limit, scaled to the sector's area
+        maxWorlds = scaled_count(MAX_WORLDS,newSector.rows*newSector.cols)
+        # From version 3 worlds are rolled together from their streams, see
+        # worlds, unless rolls are traced
+        batch = ((self.version >= 3) and (self.tracer is None))
+        if (batch):
+            (rows,cols) = np.array(systemKeys,dtype=int).reshape(-1,2).T
+            worldRolls  = self.stream_batch(STAGE_WORLDS,rows,cols,0).randint(1,11).tolist()
+            newWorlds   = list()
+        worldCount = 0
+        for (sIndex, systemKey) in enumerate(systemKeys):
+            systemObj = newSector.hexes[systemKey].system
+            # If world count has reached max, limit number of new worlds to one
+            #    per system
+            if ( worldCount < maxWorlds):
+                if (batch):
+                    worldRoll = worldRolls[sIndex]
+                else:
+                    # Hex random stream
+                    worldRoll = random.dice_roll(1,10,rng=self.stream(STAGE_WORLDS,systemKey[0],systemKey[1]))
+                numWorlds = system.TABLE_WORLDS[worldRoll]
+                worldCount += numWorlds
+            else:
+                numWorlds = 1
+                worldCount += numWorlds
+            # Add worlds to system
+            for nm in xrange(numWorlds):
+                newWorldName = self._new_name(name.NAME_POOL_WORLD,self.name_world,names,nameRng)
+                if (batch):
+                    newWorlds.append((systemObj,newWorldName,systemKey[0],systemKey[1],nm+1))
+                else:
+                    # Each world has its own random stream
+                    newWorld = self.world(newWorldName,self.stream(STAGE_WORLDS,systemKey[0],systemKey[1],nm+1))
+                    systemObj.worlds.append(newWorld)
+        # Roll the worlds
+        if (batch and newWorlds):
+            (systemObjs,worldNames,rows,cols,indices) = zip(*newWorlds)
+            for (systemObj,newWorld) in zip(systemObjs,self.worlds(worldNames,rows,cols,indices)):
+                systemObj.worlds.append(newWorld)
+
+    ## New name for a system or world.
+    #
+    #  Version 5 and later draw without replacement from the name pool, 
+    #  earlier versions reroll used names.
+    #  @param self     The object pointer.
+    #  @param pool     Name pool, see name.NAME_POOLS.
+    #  @param nameFunc Name function of the pool, for earlier versions.
+    #  @param names    Name allocator of the sector.
+    #  @param rng      Random stream for names.
+    def _new_name(self,pool,nameFunc,names,rng):
+        if (self.version >= 5):
+            return(names.allocate(pool,rng))
+        return(self.unique_name(nameFunc,names,rng))
+
+    ## Place star systems in a sector.
+    #  @param self           The object pointer.
+    #  @param newSector      Sector to add blank systems to.
+    #  @param groupingMethod Grouping method for stars after the first 20.
+    #  @param names          Name allocator of the sector.
+    #  @param rng            Random stream for positions.
+    #  @param nameRng        Random stream for names.
+    def _place_systems(self,newSector,groupingMethod,names,rng,nameRng):
+        numHexes = newSector.rows*newSector.cols
+        # Generate number of stars, scaled to the sector's area
+        numStars = min(scaled_count(random.dice_roll(1,10,20,rng=rng),numHexes),numHexes)
+        # Group searches were capped before version 7
+        groupSearchMax = MAX_LOOP_ITER if (self.version < 7) else None
         # Generate first 20 star system positions ------------------------------
+        # Scaled to the sector's area
+        numRandom = min(scaled_count(20,numHexes),numStars)
         loopCount = 0
         sCount = 0
-        while (sCount < 20):
-            # Generate row and column
-            #   Subtract 1 to start numbers at 0
-            row = random.dice_roll(1,10)-1
-            col = random.dice_roll(1,8)-1
+        while (sCount < numRandom):
+            if (self.version >= 4):
+                (row,col) = newSector.random_empty_hex(rng)
+            else:
+                # Generate row and column
+                #   Subtract 1 to start numbers at 0
+                row = random.dice_roll(1,newSector.rows,rng=rng)-1
+                col = random.dice_roll(1,newSector.cols,rng=rng)-1
             # Check for empy hex
             if (newSector.hex_empty(row,col)):
                 # Hex is empty, create new star system
-                nameLoopCount = 0
-                nameCheck = False
-                while (not nameCheck):
-                    newSystemName = self.name_system()
-                    if ( not (newSystemName in usedNames) ):
-                        usedNames.append(newSystemName)
-                        nameCheck = True
-                    nameLoopCount += 1
-                    if (nameLoopCount>100):
-                        raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
+                newSystemName = self._new_name(name.NAME_POOL_STAR,self.name_system,names,nameRng)
                 newSector.add_blank_system(newSystemName,row,col)
                 sCount += 1
             else:
                 # Hex is occupied, do nothing
                 pass
-            # Catch runaway loop
+            # Catch runaway loop. From version 4 every try places a system.
             loopCount +=1
-            if (loopCount>100):
+            if ((self.version < 4) and (loopCount > MAX_LOOP_ITER)):
                 raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
 
         # Add remaining system positions based on grouping method --------------
@@ -138,98 +312,89 @@ class Generator(object):
             # Get row and column that fits grouping method
             #  0: Random
             loopCount = 0
-            if (groupingMethod == 0):
+            if ((groupingMethod == 0) and (self.version >= 4)):
+                (newRow,newCol) = newSector.random_empty_hex(rng)
+            elif (groupingMethod == 0):
                 while ( True ):
-                    newRow = random.dice_roll(1,10)-1
-                    newCol = random.dice_roll(1,8)-1
+                    newRow = random.dice_roll(1,newSector.rows,rng=rng)-1
+                    newCol = random.dice_roll(1,newSector.cols,rng=rng)-1
                     if ( newSector.hex_empty(newRow,newCol) ):
                         break
                     loopCount += 1
-                    if (loopCount>100):
+                    if (loopCount > MAX_LOOP_ITER):
                         raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
             # 1: Minimize the sum of distances between all systems
             elif (groupingMethod == 1):
                 # Sum system distances for all new possible positions
-                (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
-                (newRow,newCol) = sumDistAllPos[sumDistAll.index(min(sumDistAll))]
+                (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
+                (newRow,newCol) = sumDistAllPos[sumDistAll.argmin()]
             # 2: Maximize the sum of distances between all systems
             elif (groupingMethod == 2):
                 # Sum system distances for all new possible positions
-                (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
-                (newRow,newCol) = sumDistAllPos[sumDistAll.index(max(sumDistAll))]
+                (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
+                (newRow,newCol) = sumDistAllPos[sumDistAll.argmax()]
             # 3: 1/4 between min and max of the sum of distances between all 
             #    systems
             elif (groupingMethod == 3):
                 # Sum system distances for all new possible positions
-                (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
-                sumDistJoined = zip(sumDistAll,sumDistAllPos)
-                (newRow,newCol) = sorted(sumDistJoined)[len(sumDistJoined)/4][1]
+                (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
+                (newRow,newCol) = _sorted_position(sumDistAll,sumDistAllPos,len(sumDistAll)/4)
             # 4: 1/3 between min and max of the sum of distances between all 
             #    systems
             elif (groupingMethod == 4):
                 # Sum system distances for all new possible positions
-                (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
-                sumDistJoined = zip(sumDistAll,sumDistAllPos)
-                (newRow,newCol) = sorted(sumDistJoined)[len(sumDistJoined)/3][1]
+                (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
+                (newRow,newCol) = _sorted_position(sumDistAll,sumDistAllPos,len(sumDistAll)/3)
             # 5: 1/2 between min and max of the sum of distances between all 
             #    systems
             elif (groupingMethod == 5):
                 # Sum system distances for all new possible positions
-                (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
-                sumDistJoined = zip(sumDistAll,sumDistAllPos)
-                (newRow,newCol) = sorted(sumDistJoined)[len(sumDistJoined)/2][1]
+                (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
+                (newRow,newCol) = _sorted_position(sumDistAll,sumDistAllPos,len(sumDistAll)/2)
             # 6: Link groups of stars together by joining the groups with the
             #    furthest nearest neighbors first
             elif (groupingMethod == 6):
                 # Get groups of systems
-                systemGroups = newSector.system_groups()
+                systemGroups = newSector.system_group_roots(groupSearchMax)
                 # If only one large group, do something to add variety
                 if ( len(systemGroups) == 1 ):
                     # Sum system distances for all new possible positions
-                    (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
+                    (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
                     # Choose new position that maximizes sum of distances
-                    (newRow,newCol) = sumDistAllPos[sumDistAll.index(max(sumDistAll))]
+                    (newRow,newCol) = sumDistAllPos[sumDistAll.argmax()]
                 else:
-                    # Calculate distance between groups
-                    # Calculate systems in the groups whose distance define the
-                    # group distance
-                    (groupDistances,minDistGroupSystems) = newSector.system_group_distances()
-                    # Distance of each group to nearest group
-                    minDist      = [0] * len(groupDistances)
-                    # Index of nearest group to each group
-                    minDistIndex = [0] * len(groupDistances)
-                    for gAIndex in xrange(len(groupDistances)):
-                        # Don't compare current group to itself during comparison
-                        minDist[gAIndex]      = min(groupDistances[gAIndex][:gAIndex]+groupDistances[gAIndex][gAIndex+1:])
-                        minDistIndex[gAIndex] = groupDistances[gAIndex].index(minDist[gAIndex])
+                    # Distance of each group to nearest group, and index of
+                    # nearest group to each group
+                    (minDist,minDistIndex) = newSector.system_group_nearest(systemGroups)
                     # Group that has furthest nearest neighboring group
-                    maxDistAIndex = minDist.index(max(minDist))
-                    maxDistBIndex = minDistIndex[maxDistAIndex]
+                    maxDistAIndex = int(minDist.argmax())
+                    maxDistBIndex = int(minDistIndex[maxDistAIndex])
                     # Stars that define the distance between the groups
-                    ((aRow,aCol),(bRow,bCol)) = minDistGroupSystems[maxDistAIndex][maxDistBIndex]
+                    ((aRow,aCol),(bRow,bCol)) = newSector.system_group_pair(systemGroups[maxDistAIndex],
+                                                                            systemGroups[maxDistBIndex])
                     # Try places stars in the middle of a line between the groups
                     line = hexutils.odd_q_line(aRow,aCol,bRow,bCol)
                     (newRow,newCol) = line[len(line)/2]
                     # Check for lines that fall outside the grid
-                    if ( (newRow == sector.SECTOR_ROWS) or 
+                    if ( (newRow == newSector.rows) or 
                          (newRow < 0) or 
-                         (newCol == sector.SECTOR_COLS) or 
+                         (newCol == newSector.cols) or 
                          (newCol < 0 )):
                         # Sum system distances for all new possible positions
-                        (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
+                        (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
                         # Choose new position that maximizes sum of distances
-                        (newRow,newCol) = sumDistAllPos[sumDistAll.index(min(sumDistAll))]
+                        (newRow,newCol) = sumDistAllPos[sumDistAll.argmin()]
 
             # 7: Link groups of stars together, starting with the smallest,  
             #    linking to their nearest
             elif (groupingMethod == 7):
                 # Get groups of systems
-                systemGroups = newSector.system_groups()
+                systemGroups = newSector.system_group_roots(groupSearchMax)
                 # Shuffle groups to not favor any specific row or column
-                systemGroupsShuffled = newSector.system_groups()
-                np.random.shuffle(systemGroupsShuffled)
+                systemGroupsShuffled = list(systemGroups)
+                rng.shuffle(systemGroupsShuffled)
                 # Sort systemGroups by number of stars in group
-                sortedMinNumberGroups = sorted(systemGroupsShuffled,key=lambda g: len(g))
+                sortedMinNumberGroups = sorted(systemGroupsShuffled,key=newSector.system_group_size)
                 # First smallest group
                 smallestGroup = sortedMinNumberGroups[0]
                 # Smallest group index in unshuffled and unsorted list
@@ -237,45 +402,43 @@ class Generator(object):
                 # If only one large group, do something to add variety
                 if ( len(systemGroups) == 1 ):
                     # Sum system distances for all new possible positions
-                    (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
+                    (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
                     # Choose new position that maximizes sum of distances
-                    (newRow,newCol) = sumDistAllPos[sumDistAll.index(max(sumDistAll))]
+                    (newRow,newCol) = sumDistAllPos[sumDistAll.argmax()]
                 else:
                     # Calculate distance between groups
-                    # Calculate systems in the groups whose distance define the
-                    # group distance
                     # Note this order not based off of the shuffled, sorted 
                     # list above
-                    (groupDistances,minDistGroupSystems) = newSector.system_group_distances()
+                    groupDistances = [newSector.system_group_distance(smallestGroup,g) for g in systemGroups]
                     # Distance of smallest group to nearest group
-                    minDist      = min(groupDistances[smallestGroupIndex][:smallestGroupIndex]+groupDistances[smallestGroupIndex][smallestGroupIndex+1:])
+                    minDist      = min(groupDistances[:smallestGroupIndex]+groupDistances[smallestGroupIndex+1:])
                     # Indices of min distance systems of nearest group to 
                     # smallest group
-                    minDistIndex = groupDistances[smallestGroupIndex].index(minDist)
+                    minDistIndex = groupDistances.index(minDist)
                     # Stars that define the distance between the groups
-                    ((aRow,aCol),(bRow,bCol)) = minDistGroupSystems[smallestGroupIndex][minDistIndex]
+                    ((aRow,aCol),(bRow,bCol)) = newSector.system_group_pair(smallestGroup,systemGroups[minDistIndex])
                     # Try places stars in the middle of a line between the groups
                     line = hexutils.odd_q_line(aRow,aCol,bRow,bCol)
                     (newRow,newCol) = line[len(line)/2]
                     # Check for lines that fall outside the grid
-                    if ( (newRow == sector.SECTOR_ROWS) or 
+                    if ( (newRow == newSector.rows) or 
                          (newRow < 0) or 
-                         (newCol == sector.SECTOR_COLS) or 
+                         (newCol == newSector.cols) or 
                          (newCol < 0 )):
                         # Sum system distances for all new possible positions
-                        (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
+                        (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
                         # Choose new position that maximizes sum of distances
-                        (newRow,newCol) = sumDistAllPos[sumDistAll.index(min(sumDistAll))]
+                        (newRow,newCol) = sumDistAllPos[sumDistAll.argmin()]
             # 8: Link groups of stars together, starting with the largest, 
             #    linking to their nearest
             elif (groupingMethod == 8):
                 # Get groups of systems
-                systemGroups = newSector.system_groups()
+                systemGroups = newSector.system_group_roots(groupSearchMax)
                 # Shuffle groups to not favor any specific row or column
-                systemGroupsShuffled = newSector.system_groups()
-                np.random.shuffle(systemGroupsShuffled)
+                systemGroupsShuffled = list(systemGroups)
+                rng.shuffle(systemGroupsShuffled)
                 # Sort systemGroups by number of stars in group
-                sortedMinNumberGroups = sorted(systemGroupsShuffled,key=lambda g: len(g))
+                sortedMinNumberGroups = sorted(systemGroupsShuffled,key=newSector.system_group_size)
                 # Last largest group
                 largestGroup = sortedMinNumberGroups[len(sortedMinNumberGroups)-1]
                 # largest group index in unshuffled and unsorted list
@@ -283,599 +446,1210 @@ class Generator(object):
                 # If only one large group, do something to add variety
                 if ( len(systemGroups) == 1 ):
                     # Sum system distances for all new possible positions
-                    (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
+                    (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
                     # Choose new position that maximizes sum of distances
-                    (newRow,newCol) = sumDistAllPos[sumDistAll.index(max(sumDistAll))]
+                    (newRow,newCol) = sumDistAllPos[sumDistAll.argmax()]
                 else:
                     # Calculate distance between groups
-                    # Calculate systems in the groups whose distance define the
-                    # group distance
                     # Note this order not based off of the shuffled, sorted 
                     # list above
-                    (groupDistances,minDistGroupSystems) = newSector.system_group_distances()
+                    groupDistances = [newSector.system_group_distance(largestGroup,g) for g in systemGroups]
                     # Distance of largest group to nearest group
-                    minDist      = min(groupDistances[largestGroupIndex][:largestGroupIndex]+groupDistances[largestGroupIndex][largestGroupIndex+1:])
+                    minDist      = min(groupDistances[:largestGroupIndex]+groupDistances[largestGroupIndex+1:])
                     # Indices of min distance systems of nearest group to 
                     # largest group
-                    minDistIndex = groupDistances[largestGroupIndex].index(minDist)
+                    minDistIndex = groupDistances.index(minDist)
                     # Stars that define the distance between the groups
-                    ((aRow,aCol),(bRow,bCol)) = minDistGroupSystems[largestGroupIndex][minDistIndex]
+                    ((aRow,aCol),(bRow,bCol)) = newSector.system_group_pair(largestGroup,systemGroups[minDistIndex])
                     # Try places stars in the middle of a line between the groups
                     line = hexutils.odd_q_line(aRow,aCol,bRow,bCol)
                     (newRow,newCol) = line[len(line)/2]
                     # Check for lines that fall outside the grid
-                    if ( (newRow == sector.SECTOR_ROWS) or 
+                    if ( (newRow == newSector.rows) or 
                          (newRow < 0) or 
-                         (newCol == sector.SECTOR_COLS) or 
+                         (newCol == newSector.cols) or 
                          (newCol < 0 )):
                         # Sum system distances for all new possible positions
-                        (sumDistAll,sumDistAllPos) = newSector.system_distances_test()
+                        (sumDistAll,sumDistAllPos) = newSector.system_distances_test(rng)
                         # Choose new position that maximizes sum of distances
-                        (newRow,newCol) = sumDistAllPos[sumDistAll.index(min(sumDistAll))]
+                        (newRow,newCol) = sumDistAllPos[sumDistAll.argmin()]
             else:
-                (newRow,newCol) = sumDistAllPos[sumDistAll.index(min(sumDistAll))]
+                (newRow,newCol) = sumDistAllPos[sumDistAll.argmin()]
 
             # Create new system
-            nameLoopCount = 0
-            nameCheck = False
-            while (not nameCheck):
-                newSystemName = self.name_system()
-                if ( not (newSystemName in usedNames) ):
-                    usedNames.append(newSystemName)
-                    nameCheck = True
-                nameLoopCount += 1
-                if (nameLoopCount>100):
-                    raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
+            newSystemName = self._new_name(name.NAME_POOL_STAR,self.name_system,names,nameRng)
             newSector.add_blank_system(newSystemName,newRow,newCol)
             # Update count of created systems
             sCount += 1
-            # Catch runaway loop
+            # Catch runaway loop. From version 4 every try places a system.
             loopCount +=1
-            if (loopCount>100):
+            if ((self.version < 4) and (loopCount > MAX_LOOP_ITER)):
                 raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
 
-        # Add worlds -----------------------------------------------------------
-        worldCount = 0
-        for systemKey in newSector.sorted_systems():
-            systemObj = newSector.hexes[systemKey].system
-            # If world count has reached max, limit number of new worlds to one
-            #    per system
-            if ( worldCount < MAX_WORLDS):
-                numWorlds = system.TABLE_WORLDS[random.dice_roll(1,10)]
-                worldCount += numWorlds
-            else:
-                numWorlds = 1
-                worldCount += numWorlds
-            # Add worlds to system
-            for nm in xrange(numWorlds):
-                nameLoopCount = 0
-                nameCheck = False
-                while (not nameCheck):
-                    newWorldName = self.name_world()
-                    if ( not (newWorldName in usedNames) ):
-                        usedNames.append(newWorldName)
-                        nameCheck = True
-                    nameLoopCount += 1
-                    if (nameLoopCount>100):
-                        raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
-                # Roll tags
-                atmosphere    = world.TABLE_ATMOSPHERE[random.dice_roll(2,6)]
-                biosphere     = world.TABLE_BIOSPHERE[random.dice_roll(2,6)]
-                pop2d6        = random.dice_roll(2,6)
-                population    = world.TABLE_POPULATION[pop2d6]
-                populationAlt = np.random.randint(world.TABLE_POPULATION_ALT[pop2d6][0],
-                                                  world.TABLE_POPULATION_ALT[pop2d6][1]+1)
-                t1d6          = random.dice_roll(1,6)
-                t1d10         = random.dice_roll(1,10)
-                t2d6          = random.dice_roll(1,6)
-                t2d10         = random.dice_roll(1,10)
-                # Don't allow duplicate tags, reroll until a new one is generated
-                loopCount = 0
-                while ( (t1d6 == t2d6) and (t1d10 == t2d10) ):
-                    t2d6  = random.dice_roll(1,6)
-                    t2d10 = random.dice_roll(1,10)
-                    # Catch runaway loop
-                    loopCount +=1
-                    if (loopCount>100):
-                        raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
-                tag1       = world.TABLE_TAGS[t1d6][t1d10]
-                tag2       = world.TABLE_TAGS[t2d6][t2d10]
-                techLevel  = world.TABLE_TECH_LEVEL[random.dice_roll(2,6)]
-                temperatue = world.TABLE_TEMPERATURE[random.dice_roll(2,6)]
-                newWorld = world.World(name          = newWorldName,
-                                       atmosphere    = atmosphere,
-                                       biosphere     = biosphere,
-                                       population    = population,
-                                       populationAlt = populationAlt,
-                                       tags          = [tag1,tag2],
-                                       temperature   = temperatue,
-                                       techLevel     = techLevel)
-                systemObj.worlds.append(newWorld)
+    def corporation(self,rng=None):
+        if (rng is None):
+            rng = self.rng
+        name         = corporation.TABLE_NAME[random.dice_roll(1,25,rng=rng)]
+        organization = corporation.TABLE_ORGANIZATION[random.dice_roll(1,25,rng=rng)]
+        business     = corporation.TABLE_BUSINESS[random.dice_roll(1,50,rng=rng)]
+        newCorporation = corporation.Corporation(name,organization,business)
+        return(newCorporation)
 
-        # Fill system data -----------------------------------------------------
-        # Use one roll star system (ORSS) rules
-        for systemKey in newSector.sorted_systems():
-            # Get current system
-            systemObj = newSector.hexes[systemKey].system
-            # Rolls (ORSS)
-            d4       = random.dice_roll(1,4)
-            d6       = random.dice_roll(1,6)
-            d8       = random.dice_roll(1,8)
-            d10_star = random.dice_roll(1,10)
-            d10_gas  = random.dice_roll(1,10)
-            d12      = random.dice_roll(1,12)
-            d20      = random.dice_roll(1,20)
-            # Get main world from system (i.e. the first in the list with the highest TL)
-            mainWorld = max(systemObj.worlds,key=lambda w: world.TABLE_TECH_LEVEL_REVERSE[w.techLevel])
-            # Get main world orbit temperature mod
-            d12Mod = d12 + world.TABLE_MAIN_WORLD_ORBIT_TEMP_MOD[mainWorld.temperature]
-            # At this point, the modified d12 roll cannot be lower than 1
-            if (d12Mod < 1):
-                d12Mod = 1
-            # Check d6 to determine usage of d4 and d12 rolls (ORSS)
-            d4Mod = d4
-            #    If d6 is 1, d4 becomes single red dwarf star system (ORSS)
-            if ( d6 == 1):
-                d4Mod  = 1
-                d12Mod = 0
-            #    If d6 is 2 or 3 and d4 is 4 add 12 to d12 (ORSS)
-            elif ( (d6==2) or (d6==3) ):
-                if ( d4 == 4):
-                    d12Mod += 12
-            #    If d6 is 4, add 1 to d4
-            elif ( d6 == 6):
-                d4Mod += 1
-            # Main world orbit
-            #    d6 table is base orbit position
-            mainOrbit  = system.TABLE_MAIN_WORLD_ORBIT[d6]
-            #    d12 table modifies orbit position
+    ## Fill system data.
+    #
+    #  Uses the one roll star system (ORSS) rules to add stars and orbital 
+    #  objects to a system, placing its worlds in orbits.
+    #  @param self      The object pointer.
+    #  @param systemObj System to fill. Must already have its worlds.
+    #  @param rng       Random stream to roll the system with.
+    def fill_system(self,systemObj,rng=None):
+        if (rng is None):
+            rng = self.rng
+        # Rolls (ORSS)
+        d4       = random.dice_roll(1,4,rng=rng)
+        d6       = random.dice_roll(1,6,rng=rng)
+        d8       = random.dice_roll(1,8,rng=rng)
+        d10_star = random.dice_roll(1,10,rng=rng)
+        d10_gas  = random.dice_roll(1,10,rng=rng)
+        d12      = random.dice_roll(1,12,rng=rng)
+        d20      = random.dice_roll(1,20,rng=rng)
+        # Get main world from system (i.e. the first in the list with the highest TL)
+        mainWorld = max(systemObj.worlds,key=lambda w: world.TABLE_TECH_LEVEL_REVERSE[w.techLevel])
+        # Get main world orbit temperature mod
+        d12Mod = d12 + world.TABLE_MAIN_WORLD_ORBIT_TEMP_MOD[mainWorld.temperature]
+        # At this point, the modified d12 roll cannot be lower than 1
+        if (d12Mod < 1):
+            d12Mod = 1
+        # Check d6 to determine usage of d4 and d12 rolls (ORSS)
+        d4Mod = d4
+        #    If d6 is 1, d4 becomes single red dwarf star system (ORSS)
+        if ( d6 == 1):
+            d4Mod  = 1
+            d12Mod = 0
+        #    If d6 is 2 or 3 and d4 is 4 add 12 to d12 (ORSS)
+        elif ( (d6==2) or (d6==3) ):
+            if ( d4 == 4):
+                d12Mod += 12
+        #    If d6 is 4, add 1 to d4
+        elif ( d6 == 6):
+            d4Mod += 1
+        # Main world orbit
+        #    d6 table is base orbit position
+        mainOrbit  = system.TABLE_MAIN_WORLD_ORBIT[d6]
+        #    d12 table modifies orbit position
+        mainOrbit += system.TABLE_MAIN_WORLD_ORBIT_MOD[d12Mod]
+        # First star color and spectral subclass
+        color               = star.TABLE_COLOR[star.TABLE_COLOR_ID[d12Mod]]
+        colorText           = star.TABLE_COLOR_TEXT[d12Mod]
+        sequence            = star.TABLE_COLOR_SEQUENCE[star.TABLE_COLOR_ID[d12Mod]]
+        spectralSubclass    = star.TABLE_SPECTRAL_SUBCLASS[d10_star]
+        spectralSubclassMod = rng.random_sample()
+        # Add first star
+        systemObj.stars.append(star.Star(color, colorText, sequence, spectralSubclass, spectralSubclassMod))
+        # Use modified d4 to determine if there should be a second star (ORSS)
+        numStars = system.TABLE_STARS[d4Mod]
+        # Add 2nd star if necessary (ORSS)
+        if ( numStars > 1 ):
+            # 2nd star has +4 to existing d12 roll(ORSS)
+            d12Mod += 4
+            # 2nd star has alternate d10 roll (ORSS)    
+            d10_star2   = random.dice_roll(1,10,rng=rng)
+            # d12 table modifies orbit position (ORSS)
             mainOrbit += system.TABLE_MAIN_WORLD_ORBIT_MOD[d12Mod]
-            # First star color and spectral subclass
-            color               = star.TABLE_COLOR[star.TABLE_COLOR_ID[d12Mod]]
-            colorText           = star.TABLE_COLOR_TEXT[d12Mod]
-            sequence            = star.TABLE_COLOR_SEQUENCE[star.TABLE_COLOR_ID[d12Mod]]
-            spectralSubclass    = star.TABLE_SPECTRAL_SUBCLASS[d10_star]
-            spectralSubclassMod = np.random.random()
-            # Add first star
+            # Second star color and spectral subclass (ORSS)
+            color            = star.TABLE_COLOR[star.TABLE_COLOR_ID[d12Mod]]
+            colorText        = star.TABLE_COLOR_TEXT[d12Mod]
+            sequence         = star.TABLE_COLOR_SEQUENCE[star.TABLE_COLOR_ID[d12Mod]]
+            spectralSubclass = star.TABLE_SPECTRAL_SUBCLASS[d10_star2]
+            spectralSubclassMod = rng.random_sample()
+            # Add star
             systemObj.stars.append(star.Star(color, colorText, sequence, spectralSubclass, spectralSubclassMod))
-            # Use modified d4 to determine if there should be a second star (ORSS)
-            numStars = system.TABLE_STARS[d4Mod]
-            # Add 2nd star if necessary (ORSS)
-            if ( numStars > 1 ):
-                # 2nd star has +4 to existing d12 roll(ORSS)
-                d12Mod += 4
-                # 2nd star has alternate d10 roll (ORSS)    
-                d10_star2   = random.dice_roll(1,10)
-                # d12 table modifies orbit position (ORSS)
-                mainOrbit += system.TABLE_MAIN_WORLD_ORBIT_MOD[d12Mod]
-                # Second star color and spectral subclass (ORSS)
-                color            = star.TABLE_COLOR[star.TABLE_COLOR_ID[d12Mod]]
-                colorText        = star.TABLE_COLOR_TEXT[d12Mod]
-                sequence         = star.TABLE_COLOR_SEQUENCE[star.TABLE_COLOR_ID[d12Mod]]
-                spectralSubclass = star.TABLE_SPECTRAL_SUBCLASS[d10_star2]
-                spectralSubclassMod = np.random.random()
-                # Add star
-                systemObj.stars.append(star.Star(color, colorText, sequence, spectralSubclass, spectralSubclassMod))
-            # Gas giants (ORSS)
-            numSmallGas = system.TABLE_GAS_GIANT_SMALL[d10_gas]
-            numLargeGas = system.TABLE_GAS_GIANT_LARGE[d10_gas]
-            # Create list of gas giants
-            gasList  = [orbitalobject.Planet(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['SMALL_GAS']) for sg in xrange(numSmallGas)]
-            gasList += [orbitalobject.Planet(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['LARGE_GAS']) for lg in xrange(numLargeGas)]
-            # Shuffle gas giants into random order
-            np.random.shuffle(gasList)
-            # Add moons and rings to gas giants. Will replace with main world moons and rings if necessary.
-            for gl in gasList:
-                # Roll a d20 to determine the number of moons and rings for the giant
-                gasD20 = random.dice_roll(1,20)
-                # Does the giant have rings
-                gl.rings = self.rings(gasD20)
-                # Add moons to the gas giant
-                gl.moons = self.moons(gasD20)
-            # Total number of objects (ORSS)
-            numObjects = d4 + d8 - 1
-            # Place objects in orbits
-            # Create an empty list of orbital objects
-            orbitalList = list()
-            for o in xrange(numObjects):
-                orbitalList.append(None)
-            # Check if orbitalList is long enough
-            if ( mainOrbit > len(orbitalList) ):
-                # Add extra blank spaces if list is not long enough
-                for o in xrange(mainOrbit-len(orbitalList)):
-                    orbitalList.append(None)
-            # Fill main world orbit
-            moonList = self.moons(d20)
-            #    If airless or thin, determine which one
-            if ( mainWorld.atmosphere == world.TABLE_ATMOSPHERE[4] ):
-                #    On a d2, 1 is airless, 2 is thin
-                #    Airless are going to be space stations or moon bases
-                #    Thin are going to be thin atmosphere rocky planets
-                if (random.dice_roll(1,2) == 1):
-                    # If airless, world is a moon or space station
-                    # If main world table rolls has moons, it is a moon, else it is a station
-                    if ( len(moonList) > 0 ):
-                        isMoon    = True
-                        isStation = False
-                        # If main world is a moon, is it a moon of a gas giant or rocky world
-                        # If the system has gas giants, it is a gas giant moon
-                        # Else it is a moon of a rocky planet (should be rare)
-                        if ( numSmallGas + numLargeGas > 0):
-                            ofGas = True
-                        else:
-                            ofGas = False
+        # Gas giants (ORSS)
+        numSmallGas = system.TABLE_GAS_GIANT_SMALL[d10_gas]
+        numLargeGas = system.TABLE_GAS_GIANT_LARGE[d10_gas]
+        # Place objects in orbits
+        self._fill_orbits(systemObj,mainWorld,d4,d8,d20,mainOrbit,numSmallGas,numLargeGas,rng)
+
+    ## Fill many systems' data.
+    #
+    #  Fills the same systems as fill_system with each hex's ORSS stream, but
+    #  rolls the dice and looks up the star, orbit, and gas giant tables for 
+    #  every system at once with numpy arrays. Only placing objects in orbits
+    #  is done one system at a time. Only for version 2 and later.
+    #  @param self       The object pointer.
+    #  @param systemObjs Systems to fill.
+    #  @param rows       Hex row of each system.
+    #  @param cols       Hex column of each system.
+    def fill_systems(self,systemObjs,rows,cols):
+        exception.arg_range_check(self.version,2)
+        rng = self.stream_batch(STAGE_ORSS,rows,cols,0)
+        # Rolls (ORSS)
+        d4       = rng.randint(1,5)
+        d6       = rng.randint(1,7)
+        d8       = rng.randint(1,9)
+        d10_star = rng.randint(1,11)
+        d10_gas  = rng.randint(1,11)
+        d12      = rng.randint(1,13)
+        d20      = rng.randint(1,21)
+        # Main world of each system and its orbit temperature mod
+        mainWorlds = [max(s.worlds,key=lambda w: world.TABLE_TECH_LEVEL_REVERSE[w.techLevel]) for s in systemObjs]
+        tempMods   = np.array([world.TABLE_MAIN_WORLD_ORBIT_TEMP_MOD[w.temperature] for w in mainWorlds],dtype=int)
+        # The modified d12 roll cannot be lower than 1
+        d12Mod = np.maximum(d12 + tempMods,1)
+        # Check d6 to determine usage of d4 and d12 rolls (ORSS)
+        d4Mod = d4.copy()
+        #    If d6 is 1, d4 becomes single red dwarf star system (ORSS)
+        d4Mod[d6 == 1]  = 1
+        d12Mod[d6 == 1] = 0
+        #    If d6 is 2 or 3 and d4 is 4 add 12 to d12 (ORSS)
+        d12Mod[((d6 == 2) | (d6 == 3)) & (d4 == 4)] += 12
+        #    If d6 is 6, add 1 to d4
+        d4Mod[d6 == 6] += 1
+        # Main world orbit
+        mainOrbit = system.TABLE_MAIN_WORLD_ORBIT.lookup(d6) + system.TABLE_MAIN_WORLD_ORBIT_MOD.lookup(d12Mod)
+        # First star
+        colorId             = star.TABLE_COLOR_ID.lookup(d12Mod)
+        colors              = star.TABLE_COLOR.lookup(colorId).tolist()
+        colorTexts          = star.TABLE_COLOR_TEXT.lookup(d12Mod).tolist()
+        sequences           = star.TABLE_COLOR_SEQUENCE.lookup(colorId).tolist()
+        spectralSubclasses  = star.TABLE_SPECTRAL_SUBCLASS.lookup(d10_star).tolist()
+        spectralSubclassMod = rng.random_sample().tolist()
+        # Second star, with +4 to the d12 roll and its own d10 roll (ORSS)
+        second    = system.TABLE_STARS.lookup(d4Mod) > 1
+        d12Mod2   = d12Mod[second] + 4
+        d10_star2 = rng.randint(1,11,second)[second]
+        mainOrbit[second] += system.TABLE_MAIN_WORLD_ORBIT_MOD.lookup(d12Mod2)
+        colorId2             = star.TABLE_COLOR_ID.lookup(d12Mod2)
+        secondStars          = zip(star.TABLE_COLOR.lookup(colorId2).tolist(),
+                                   star.TABLE_COLOR_TEXT.lookup(d12Mod2).tolist(),
+                                   star.TABLE_COLOR_SEQUENCE.lookup(colorId2).tolist(),
+                                   star.TABLE_SPECTRAL_SUBCLASS.lookup(d10_star2).tolist(),
+                                   rng.random_sample(second)[second].tolist())
+        # Gas giants (ORSS)
+        numSmallGas = system.TABLE_GAS_GIANT_SMALL.lookup(d10_gas).tolist()
+        numLargeGas = system.TABLE_GAS_GIANT_LARGE.lookup(d10_gas).tolist()
+        # Add stars and place objects in orbits
+        (d4, d8, d20, mainOrbit, second) = (d4.tolist(), d8.tolist(), d20.tolist(), mainOrbit.tolist(), second.tolist())
+        secondStars.reverse()
+        for (i, systemObj) in enumerate(systemObjs):
+            systemObj.stars.append(star.Star(colors[i], colorTexts[i], sequences[i], spectralSubclasses[i], spectralSubclassMod[i]))
+            if (second[i]):
+                systemObj.stars.append(star.Star(*secondStars.pop()))
+            self._fill_orbits(systemObj,mainWorlds[i],d4[i],d8[i],d20[i],mainOrbit[i],
+                              numSmallGas[i],numLargeGas[i],rng.stream(i))
+
+    ## Place a system's objects in orbits.
+    #
+    #  Rest of the one roll star system (ORSS) rules after the stars, see
+    #  fill_system.
+    #  @param self        The object pointer.
+    #  @param systemObj   System to fill.
+    #  @param mainWorld   Main world of the system.
+    #  @param d4          ORSS d4 roll.
+    #  @param d8          ORSS d8 roll.
+    #  @param d20         ORSS d20 roll.
+    #  @param mainOrbit   Main world orbit.
+    #  @param numSmallGas Number of small gas giants.
+    #  @param numLargeGas Number of large gas giants.
+    #  @param rng         Random stream of the system.
+    def _fill_orbits(self,systemObj,mainWorld,d4,d8,d20,mainOrbit,numSmallGas,numLargeGas,rng):
+        # Create list of gas giants
+        gasList  = [orbitalobject.Planet(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['SMALL_GAS']) for sg in xrange(numSmallGas)]
+        gasList += [orbitalobject.Planet(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['LARGE_GAS']) for lg in xrange(numLargeGas)]
+        # Shuffle gas giants into random order
+        rng.shuffle(gasList)
+        # Add moons and rings to gas giants. Will replace with main world moons and rings if necessary.
+        for gl in gasList:
+            # Roll a d20 to determine the number of moons and rings for the giant
+            gasD20 = random.dice_roll(1,20,rng=rng)
+            # Does the giant have rings
+            gl.rings = self.rings(gasD20)
+            # Add moons to the gas giant
+            gl.moons = self.moons(gasD20,rng)
+        # Total number of objects (ORSS)
+        numObjects = d4 + d8 - 1
+        # Place objects in orbits
+        # Create empty orbits, with extra orbits if there aren't enough to 
+        # reach the main world orbit
+        orbits = system.OrbitSlots(max(numObjects,mainOrbit))
+        # Fill main world orbit
+        moonList = self.moons(d20,rng)
+        #    If airless or thin, determine which one
+        if ( mainWorld.atmosphere == world.TABLE_ATMOSPHERE[4] ):
+            #    On a d2, 1 is airless, 2 is thin
+            #    Airless are going to be space stations or moon bases
+            #    Thin are going to be thin atmosphere rocky planets
+            if (random.dice_roll(1,2,rng=rng) == 1):
+                # If airless, world is a moon or space station
+                # If main world table rolls has moons, it is a moon, else it is a station
+                if ( len(moonList) > 0 ):
+                    isMoon    = True
+                    isStation = False
+                    # If main world is a moon, is it a moon of a gas giant or rocky world
+                    # If the system has gas giants, it is a gas giant moon
+                    # Else it is a moon of a rocky planet (should be rare)
+                    if ( numSmallGas + numLargeGas > 0):
+                        ofGas = True
                     else:
-                        isMoon    = False
-                        isStation = True
-                        # If the main world is a space station, is it a space station of a gas giant or rocky world
-                        # If the system has gas giants, it is a gas giant station
-                        # Else it is a station of a rocky planet (should be rare)
-                        if ( numSmallGas + numLargeGas > 0):
-                            ofGas = True
-                        else:
-                            ofGas = False
+                        ofGas = False
                 else:
-                    # Main world is just a thin atmosphere rocky planet
                     isMoon    = False
-                    isStation = False
-                    ofGas     = False
+                    isStation = True
+                    # If the main world is a space station, is it a space station of a gas giant or rocky world
+                    # If the system has gas giants, it is a gas giant station
+                    # Else it is a station of a rocky planet (should be rare)
+                    if ( numSmallGas + numLargeGas > 0):
+                        ofGas = True
+                    else:
+                        ofGas = False
             else:
-                isMoon        = False
-                isStation     = False
-                ofGas         = False
-            # If we just chose a space station for TL2 or lower, turn it into a
-            # planet instead. There is no way a TL2- civilization could survive
-            # on a space station so we'll remove airless/thin and inert gas
-            # atmospheres as options. If a hostile atmoshere still exists, then
-            # They'll likely live in the rememants of an underground bunker or 
-            # maybe a biodome or something.
-            if ( (mainWorld.techLevel == world.TABLE_TECH_LEVEL[2]) or
-                 (mainWorld.techLevel == world.TABLE_TECH_LEVEL[3]) or
-                 (mainWorld.techLevel == world.TABLE_TECH_LEVEL[4]) ):
-                # Planet flags
-                isMoon        = False
-                isStation     = False
-                ofGas         = False
-                # New atmosphere roll
-                roll2d5 = random.dice_roll(2,5)
-                mainWorld.atmosphere = world.TABLE_ALT_ATMOSPHERE[roll2d5]
-            # Does it have rings
-            hasRings = orbitalobject.TABLE_MINOR_RINGS[d20]
-            # Insert main world
-            # Moon of another body
-            if ( isMoon ):
-                # Attach main world to a moon
-                moonList[random.dice_roll(1,len(moonList))-1].world = mainWorld
-                # Moon of a gas giant
-                if ( ofGas ):
-                    # Get gas giant to attach world as a moon to
-                    gasGiant = gasList.pop(0)
-                    # Replace gas giant moon list
-                    gasGiant.moons = moonList
-                    # Add rings to gas giant if necessary
-                    gasGiant.rings = hasRings
-                    # Put gas giant into orbit list
-                    orbitalList[mainOrbit-1] = gasGiant
-                # Moon of a rocky planet
-                else:
-                    # Create rocky planet
-                    rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
-                                                       moons      = moonList,
-                                                       rings      = hasRings)
-                    # Put rocky planet into orbit list
-                    orbitalList[mainOrbit-1] = rockyPlanet
-            # Space station around another body
-            elif ( isStation ):
-                # Create space station and attach world to it
-                spaceStation = orbitalobject.SpaceStation(worldObj = mainWorld)
-                mainWorld.name += ' Station'
-                # Space station around a gas giant
-                if ( ofGas ):
-                    # Get gas giant to attach world as a space station to
-                    gasGiant = gasList.pop(0)
-                    # Add world as space station to giant
-                    gasGiant.stations.append(spaceStation)
-                    # Add main world moons to  gas giant moon list
-                    gasGiant.moons += moonList
-                    # Add rings to gas giant if necessary
-                    gasGiant.rings = hasRings
-                    # Put gas giant into orbit list
-                    orbitalList[mainOrbit-1] = gasGiant
-                # Space station around a rocky planet
-                else:
-                    # Create rocky planet
-                    rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
-                                                       moons      = moonList,
-                                                       rings      = hasRings)
-                    # Add world as space station to rocky planet
-                    rockyPlanet.stations.append(spaceStation)
-                    # Replace rocky planet moon list
-                    rockyPlanet.moons = moonList
-                    # Add rings to rocky planet if necessary
-                    rockyPlanet.rings = hasRings
-                    # Put gas giant into orbit list
-                    orbitalList[mainOrbit-1] = rockyPlanet
-            # Rocky world
+                # Main world is just a thin atmosphere rocky planet
+                isMoon    = False
+                isStation = False
+                ofGas     = False
+        else:
+            isMoon        = False
+            isStation     = False
+            ofGas         = False
+        # If we just chose a space station for TL2 or lower, turn it into a
+        # planet instead. There is no way a TL2- civilization could survive
+        # on a space station so we'll remove airless/thin and inert gas
+        # atmospheres as options. If a hostile atmoshere still exists, then
+        # They'll likely live in the rememants of an underground bunker or 
+        # maybe a biodome or something.
+        if ( (mainWorld.techLevel == world.TABLE_TECH_LEVEL[2]) or
+             (mainWorld.techLevel == world.TABLE_TECH_LEVEL[3]) or
+             (mainWorld.techLevel == world.TABLE_TECH_LEVEL[4]) ):
+            # Planet flags
+            isMoon        = False
+            isStation     = False
+            ofGas         = False
+            # New atmosphere roll
+            roll2d5 = random.dice_roll(2,5,rng=rng)
+            mainWorld.atmosphere = world.TABLE_ALT_ATMOSPHERE[roll2d5]
+        # Does it have rings
+        hasRings = orbitalobject.TABLE_MINOR_RINGS[d20]
+        # Insert main world
+        # Moon of another body
+        if ( isMoon ):
+            # Attach main world to a moon
+            moonList[random.dice_roll(1,len(moonList),rng=rng)-1].world = mainWorld
+            # Moon of a gas giant
+            if ( ofGas ):
+                # Get gas giant to attach world as a moon to
+                gasGiant = gasList.pop(0)
+                # Replace gas giant moon list
+                gasGiant.moons = moonList
+                # Add rings to gas giant if necessary
+                gasGiant.rings = hasRings
+                # Put gas giant into orbit list
+                orbits.place(mainOrbit-1,gasGiant)
+            # Moon of a rocky planet
             else:
                 # Create rocky planet
                 rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
                                                    moons      = moonList,
-                                                   rings      = hasRings,
-                                                   worldObj   = mainWorld)
-                orbitalList[mainOrbit-1] = rockyPlanet
-            # Asteroid belts (ORSS)
-            innerBelts = list()
-            for b in xrange(system.TABLE_HYDROCARBON_INNER_ASTEROID_BELTS[d8]):
-                innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['HYDROCARBON_ASTEROID_BELT']))
-            for b in xrange(system.TABLE_ICY_INNER_ASTEROID_BELTS[d8]):
-                innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ICY_ASTEROID_BELT']))
-            for b in xrange(system.TABLE_METALLIC_INNER_ASTEROID_BELTS[d8]):
-                innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['METALLIC_ASTEROID_BELT']))
-            for b in xrange(system.TABLE_ROCKY_INNER_ASTEROID_BELTS[d8]):
-                innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY_ASTEROID_BELT']))
-            outerBelts = list()
-            for b in xrange(system.TABLE_HYDROCARBON_OUTER_ASTEROID_BELTS[d8]):
-                outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['HYDROCARBON_ASTEROID_BELT']))
-            for b in xrange(system.TABLE_ICY_OUTER_ASTEROID_BELTS[d8]):
-                outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ICY_ASTEROID_BELT']))
-            for b in xrange(system.TABLE_METALLIC_OUTER_ASTEROID_BELTS[d8]):
-                outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['METALLIC_ASTEROID_BELT']))
-            for b in xrange(system.TABLE_ROCKY_OUTER_ASTEROID_BELTS[d8]):
-                outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY_ASTEROID_BELT']))
-            # Insert inner asteroid belts (ORSS)
-            for ib in innerBelts:
-                # Create inner and outer orbits indices
-                innerMin = 0
-                innerMax = mainOrbit
-                outerMin = mainOrbit+1
-                outerMax = len(orbitalList)
-                # Try to place in the middle of the inner orbits.
-                placed = False
-                # If that is full go closer to the main world orbit.
-                # If that is full try the beginning of the inner orbits.
-                # If that is full place in the first open spot in the outer orbits.
-                searchOrder = range(innerMax/2,innerMax) + range(innerMin,innerMax/2) + range(outerMin,outerMax)
-                for orbitIndex in searchOrder:
-                    # Look for a None slot in the orbitalList to fill
-                    if ( orbitalList[orbitIndex] == None ):
-                        # Replace None slot with inner belt
-                        orbitalList[orbitIndex] = ib
-                        placed = True
-                        # Stop searching
+                                                   rings      = hasRings)
+                # Put rocky planet into orbit list
+                orbits.place(mainOrbit-1,rockyPlanet)
+        # Space station around another body
+        elif ( isStation ):
+            # Create space station and attach world to it
+            spaceStation = orbitalobject.SpaceStation(worldObj = mainWorld)
+            mainWorld.name += STATION_SUFFIX
+            # Space station around a gas giant
+            if ( ofGas ):
+                # Get gas giant to attach world as a space station to
+                gasGiant = gasList.pop(0)
+                # Add world as space station to giant
+                gasGiant.stations.append(spaceStation)
+                # Add main world moons to  gas giant moon list
+                gasGiant.moons += moonList
+                # Add rings to gas giant if necessary
+                gasGiant.rings = hasRings
+                # Put gas giant into orbit list
+                orbits.place(mainOrbit-1,gasGiant)
+            # Space station around a rocky planet
+            else:
+                # Create rocky planet
+                rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
+                                                   moons      = moonList,
+                                                   rings      = hasRings)
+                # Add world as space station to rocky planet
+                rockyPlanet.stations.append(spaceStation)
+                # Replace rocky planet moon list
+                rockyPlanet.moons = moonList
+                # Add rings to rocky planet if necessary
+                rockyPlanet.rings = hasRings
+                # Put gas giant into orbit list
+                orbits.place(mainOrbit-1,rockyPlanet)
+        # Rocky world
+        else:
+            # Create rocky planet
+            rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
+                                               moons      = moonList,
+                                               rings      = hasRings,
+                                               worldObj   = mainWorld)
+            orbits.place(mainOrbit-1,rockyPlanet)
+        # Asteroid belts (ORSS)
+        innerBelts = list()
+        for b in xrange(system.TABLE_HYDROCARBON_INNER_ASTEROID_BELTS[d8]):
+            innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['HYDROCARBON_ASTEROID_BELT']))
+        for b in xrange(system.TABLE_ICY_INNER_ASTEROID_BELTS[d8]):
+            innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ICY_ASTEROID_BELT']))
+        for b in xrange(system.TABLE_METALLIC_INNER_ASTEROID_BELTS[d8]):
+            innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['METALLIC_ASTEROID_BELT']))
+        for b in xrange(system.TABLE_ROCKY_INNER_ASTEROID_BELTS[d8]):
+            innerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY_ASTEROID_BELT']))
+        outerBelts = list()
+        for b in xrange(system.TABLE_HYDROCARBON_OUTER_ASTEROID_BELTS[d8]):
+            outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['HYDROCARBON_ASTEROID_BELT']))
+        for b in xrange(system.TABLE_ICY_OUTER_ASTEROID_BELTS[d8]):
+            outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ICY_ASTEROID_BELT']))
+        for b in xrange(system.TABLE_METALLIC_OUTER_ASTEROID_BELTS[d8]):
+            outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['METALLIC_ASTEROID_BELT']))
+        for b in xrange(system.TABLE_ROCKY_OUTER_ASTEROID_BELTS[d8]):
+            outerBelts.append(orbitalobject.AsteroidBelt(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY_ASTEROID_BELT']))
+        # Insert inner asteroid belts (ORSS)
+        for ib in innerBelts:
+            # Create inner and outer orbits indices
+            innerMin = 0
+            innerMax = mainOrbit
+            outerMin = mainOrbit+1
+            outerMax = len(orbits)
+            # Try to place in the middle of the inner orbits.
+            # If that is full go closer to the main world orbit.
+            orbitIndex = orbits.first_free(innerMax/2,innerMax)
+            # If that is full try the beginning of the inner orbits.
+            if ( orbitIndex is None ):
+                orbitIndex = orbits.first_free(innerMin,innerMax/2)
+            # If that is full place in the first open spot in the outer orbits.
+            if ( orbitIndex is None ):
+                orbitIndex = orbits.first_free(outerMin,outerMax)
+            if ( orbitIndex is not None ):
+                orbits.place(orbitIndex,ib)
+            # If there were no slots open, append belt to end of system
+            else:
+                orbits.append(ib)
+        # Insert outer asteroid belts (ORSS)
+        for ob in outerBelts:
+            # Create outer orbits indices
+            outerMin = mainOrbit+1
+            outerMax = len(orbits)
+            # Try to place in the middle of the outer orbits.
+            # If that is full go towards the outer orbits
+            orbitIndex = orbits.first_free(outerMax/2,outerMax)
+            # If that is full try the beginning of the outer orbits
+            if ( orbitIndex is None ):
+                orbitIndex = orbits.first_free(outerMin,outerMax/2)
+            if ( orbitIndex is not None ):
+                orbits.place(orbitIndex,ob)
+            # If there were no slots open, append belt to end of system
+            else:
+                orbits.append(ob)
+        # Create list of worlds still to be placed
+        otherAirless = list()
+        otherWorlds = list()
+        for w in systemObj.worlds:
+            # We have already placed the main world
+            if ( w is not mainWorld ):
+                # Save airless worlds for later
+                if ( w.atmosphere == world.TABLE_ATMOSPHERE[4] ):
+                    # If TL2-, put in other worlds, else put in airless
+                    if ( (w.techLevel == world.TABLE_TECH_LEVEL[2]) or
+                         (w.techLevel == world.TABLE_TECH_LEVEL[3]) or
+                         (w.techLevel == world.TABLE_TECH_LEVEL[4]) ):
+                        otherWorlds.append(w)
+                    else:
+                        # Space stations are cool
+                        otherAirless.append(w)
+                else:
+                    # Add world to list
+                    otherWorlds.append(w)
+        ## Place remaining worlds that don't have airless/thin atomspheres
+        for ow in otherWorlds:
+            # d20 roll for planet stats
+            d20 = random.dice_roll(1,20,rng=rng)
+            # Create moons
+            moonList = self.moons(d20,rng)
+            # Create rings
+            hasRings = self.rings(d20)
+            # Create rocky planet
+            rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
+                                               moons      = moonList,
+                                               rings      = hasRings,
+                                               worldObj   = ow)
+            # If burning start from 1/6 from the innermost orbit
+            if ( ow.temperature == world.TABLE_TEMPERATURE[12] ):
+                searchIndex = len(orbits)/6
+            # If warm start 1/4 from the innermost orbit
+            elif ( ow.temperature == world.TABLE_TEMPERATURE[10] ):
+                searchIndex = len(orbits)/4
+            # If temperate-to-warm start 1/3 from the innermost orbit
+            elif ( ow.temperature == world.TABLE_TEMPERATURE[11] ):
+                searchIndex = len(orbits)/3
+            # If temperate try to put near the middle orbit
+            elif ( ow.temperature == world.TABLE_TEMPERATURE[7] ):
+                searchIndex = len(orbits)/2
+            # If cold to temperate start 2/3 from the innermost orbit
+            elif ( ow.temperature == world.TABLE_TEMPERATURE[3] ):
+                searchIndex = 2*len(orbits)/3
+            # If cold start from 3/4 from the innermost orbit
+            elif ( ow.temperature == world.TABLE_TEMPERATURE[4] ):
+                searchIndex = 3*len(orbits)/4
+            # If frozen start from 5/6 from the innermost orbit
+            elif ( ow.temperature == world.TABLE_TEMPERATURE[2] ):
+                searchIndex = 5*len(orbits)/6
+            # Go outward both directions from starting index
+            orbitIndex = orbits.nearest_free(searchIndex)
+            if ( orbitIndex is not None ):
+                # Place rocky planet
+                orbits.place(orbitIndex,rockyPlanet)
+            # If no open orbit slots, append to end
+            else:
+                orbits.append(rockyPlanet)
+        # Insert gas giants evenly into inner and outer orbits (ORSS)
+        for gl in gasList:
+            # Random open orbit
+            if (self.version >= 6):
+                orbitIndex = orbits.random_free(rng)
+            else:
+                # Get list of indicies of orbits
+                orbitIndices = range(len(orbits))
+                # Shuffle list of indices
+                rng.shuffle(orbitIndices)
+                # First open orbit of the shuffled list
+                orbitIndex = next((o for o in orbitIndices if orbits.is_free(o)),None)
+            if ( orbitIndex is not None ):
+                orbits.place(orbitIndex,gl)
+            # If no open orbit slots, append to end
+            else:
+                orbits.append(gl)
+        # Insert hot rock, cold stone, and ice planets to fill rest of orbits (ORSS)
+        for ioIndex in orbits.free_orbits(0,mainOrbit):
+            # d20 roll for planet stats
+            d20 = random.dice_roll(1,20,rng=rng)
+            # Create moons
+            moonList = self.moons(d20,rng)
+            # Create rings
+            hasRings = self.rings(d20)
+            # Create hot planet
+            rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['HOT_ROCK'],
+                                               moons      = moonList,
+                                               rings      = hasRings)
+            # Place planet
+            orbits.place(ioIndex,rockyPlanet)
+        for ooIndex in orbits.free_orbits(mainOrbit,len(orbits)):
+            # d20 roll for planet stats
+            d20 = random.dice_roll(1,20,rng=rng)
+            # Create moons
+            moonList = self.moons(d20,rng)
+            # Create rings
+            hasRings = self.rings(d20)
+            # Create cold planet
+            # On a d2, 1 is a cold stone planet and 2 is an ice planet
+            if (random.dice_roll(1,2,rng=rng) == 1):
+                objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['COLD_STONE']
+            else:
+                objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ICE']
+            rockyPlanet = orbitalobject.Planet(objectType = objectType,
+                                               moons      = moonList,
+                                               rings      = hasRings)
+            # Place planet
+            orbits.place(ooIndex,rockyPlanet)
+        # Every orbit is filled, the rest works on the list of objects
+        orbitalList = orbits.objects
+        # Place remaining worlds that have airless/thin atmospheres
+        for oa in otherAirless:
+            # Planet index to try to place station/base world at
+            randomOrbitIndices = range(0,len(orbitalList))
+            rng.shuffle(randomOrbitIndices)
+            for roi in randomOrbitIndices:
+                # Avoid asteroid belts
+                if ( not isinstance(orbitalList[roi],orbitalobject.AsteroidBelt) ):
+                    # We'll treat all airless/thin as airless at this point to 
+                    # offset how we changed the TL2- worlds to something with a 
+                    # thicker atmosphere
+                    # If 1 it can be a space station
+                    # If 2 it can be a moon base if the chosen planet has any moons
+                    # otherwise we'll revert to it being a space station
+                    isMoon    = False
+                    isStation = True
+                    if (random.dice_roll(1,2,rng=rng) == 2):
+                        if ( len(orbitalList[roi].moons) > 0 ):
+                            # If the randomly chosen moon has a world already, just
+                            # make this a station instead
+                            moonRoll = random.dice_roll(1,len(orbitalList[roi].moons),rng=rng)
+                            if ( orbitalList[roi].moons[moonRoll-1].world == None ):
+                                isMoon    = True
+                                isStation = False
+                                moonIndex = moonRoll
+                    # Create moon world
+                    if ( isMoon ):
+                        orbitalList[roi].moons[moonIndex-1].world = oa
                         break
-                # If there were no slots open, append belt to end of system
-                if ( not placed ):
-                    orbitalList.append(ib)
-            # Insert outer asteroid belts (ORSS)
-            for ob in outerBelts:
-                # Create outer orbits indices
-                outerMin = mainOrbit+1
-                outerMax = len(orbitalList)
-                # Try to place in the middle of the outer orbits.
-                placed = False
-                # If that is full go towards the outer orbits
-                # If that is full try the beginning of the outer orbits
-                searchOrder = range(outerMax/2,outerMax) + range(outerMin,outerMax/2)
-                for orbitIndex in searchOrder:
-                    # Look for a None slot in the orbitalList to fill
-                    if ( orbitalList[orbitIndex] == None ):
-                        # Replace None slot with inner belt
-                        orbitalList[orbitIndex] = ob
-                        placed = True
-                        # Stop searching
+                    # Create space station and attach world to it
+                    if ( isStation ):
+                        spaceStation = orbitalobject.SpaceStation(worldObj = oa)
+                        oa.name += STATION_SUFFIX
+                        # Add world as space station to rocky planet
+                        orbitalList[roi].stations.append(spaceStation)
                         break
-                # If there were no slots open, append belt to end of system
-                if ( not placed ):
-                    orbitalList.append(ob)
-            # Create list of worlds still to be placed
-            otherAirless = list()
-            otherWorlds = list()
-            for w in systemObj.worlds:
-                # We have already placed the main world
-                if ( w is not mainWorld ):
-                    # Save airless worlds for later
-                    if ( w.atmosphere == world.TABLE_ATMOSPHERE[4] ):
-                        # If TL2-, put in other worlds, else put in airless
-                        if ( (w.techLevel == world.TABLE_TECH_LEVEL[2]) or
-                             (w.techLevel == world.TABLE_TECH_LEVEL[3]) or
-                             (w.techLevel == world.TABLE_TECH_LEVEL[4]) ):
-                            otherWorlds.append(w)
-                        else:
-                            # Space stations are cool
-                            otherAirless.append(w)
-                    else:
-                        # Add world to list
-                        otherWorlds.append(w)
-            ## Place remaining worlds that don't have airless/thin atomspheres
-            for ow in otherWorlds:
+        # If for some reason a world didn't get put into an orbit, randomly
+        # insert it into the orbit list somewhere
+        # Get list of worlds in this orbit list
+        orbitWorldList = list()
+        for ol in orbitalList:
+            orbitWorldList += ol.world_list()
+        # Compare orbit list worlds system worlds
+        for owl in orbitWorldList:
+            if ( owl not in systemObj.worlds ):
                 # d20 roll for planet stats
-                d20 = random.dice_roll(1,20)
+                d20 = random.dice_roll(1,20,rng=rng)
                 # Create moons
-                moonList = self.moons(d20)
+                moonList = self.moons(d20,rng)
                 # Create rings
                 hasRings = self.rings(d20)
                 # Create rocky planet
                 rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
                                                    moons      = moonList,
                                                    rings      = hasRings,
-                                                   worldObj   = ow)
-                # Planet has not been placed yet
-                placed = False
-                # If burning start from 1/6 from the innermost orbit
-                if ( ow.temperature == world.TABLE_TEMPERATURE[12] ):
-                    searchIndex = len(orbitalList)/6
-                # If warm start 1/4 from the innermost orbit
-                elif ( ow.temperature == world.TABLE_TEMPERATURE[10] ):
-                    searchIndex = len(orbitalList)/4
-                # If temperate-to-warm start 1/3 from the innermost orbit
-                elif ( ow.temperature == world.TABLE_TEMPERATURE[11] ):
-                    searchIndex = len(orbitalList)/3
-                # If temperate try to put near the middle orbit
-                elif ( ow.temperature == world.TABLE_TEMPERATURE[7] ):
-                    searchIndex = len(orbitalList)/2
-                # If cold to temperate start 2/3 from the innermost orbit
-                elif ( ow.temperature == world.TABLE_TEMPERATURE[3] ):
-                    searchIndex = 2*len(orbitalList)/3
-                # If cold start from 3/4 from the innermost orbit
-                elif ( ow.temperature == world.TABLE_TEMPERATURE[4] ):
-                    searchIndex = 3*len(orbitalList)/4
-                # If frozen start from 5/6 from the innermost orbit
-                elif ( ow.temperature == world.TABLE_TEMPERATURE[2] ):
-                    searchIndex = 5*len(orbitalList)/6
-                # Go outward both directions from starting index
-                innerSplit = range(0,searchIndex)[::-1]
-                outerSplit = range(searchIndex,len(orbitalList))
-                # Create search list from the split lists
-                searchList = list()
-                for index in xrange(max(len(innerSplit),len(outerSplit))):
-                    if ( index < len(innerSplit) ):
-                        searchList.append(innerSplit[index])
-                    if ( index < len(outerSplit) ):
-                        searchList.append(outerSplit[index])
-                # Search orbitalList
-                for orbitIndex in searchList:
-                    # Look for a None slot in the orbital to fill
-                    if ( orbitalList[orbitIndex] == None ):
-                        # Place rocky planet
-                        orbitalList[orbitIndex] = rockyPlanet
-                        placed = True
-                        # Stop searching
-                        break
-                # If no open orbit slots, append to end
-                if ( not placed ):
-                    orbitalList.append(rockyPlanet)
-            # Insert gas giants evenly into inner and outer orbits (ORSS)
-            for gl in gasList:
-                placed = False
-                # Get list of indicies of orbits
-                orbitIndices = range(len(orbitalList))
-                # Shuffle list of indices
-                np.random.shuffle(orbitIndices)
-                # Search shuffled index list
-                for orbitIndex in orbitIndices:
-                    # Look for a None slot in the orbital to fill
-                    if ( orbitalList[orbitIndex] == None ):
-                        # Place rocky planet
-                        orbitalList[orbitIndex] = gl
-                        placed = True
-                        # Stop searching
-                        break
-                # If no open orbit slots, append to end
-                if ( not placed ):
-                    orbitalList.append(gl)
-            # Insert hot rock, cold stone, and ice planets to fill rest of orbits (ORSS)
-            innerOrbits = range(0,mainOrbit)
-            for ioIndex in innerOrbits:
-                if ( orbitalList[ioIndex] == None ):
-                    # d20 roll for planet stats
-                    d20 = random.dice_roll(1,20)
-                    # Create moons
-                    moonList = self.moons(d20)
-                    # Create rings
-                    hasRings = self.rings(d20)
-                    # Create hot planet
-                    rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['HOT_ROCK'],
-                                                       moons      = moonList,
-                                                       rings      = hasRings)
-                    # Place planet
-                    orbitalList[ioIndex] = rockyPlanet
-            outerOrbits = range(mainOrbit,len(orbitalList))
-            for ooIndex in outerOrbits:
-                if ( orbitalList[ooIndex] == None ):
-                    # d20 roll for planet stats
-                    d20 = random.dice_roll(1,20)
-                    # Create moons
-                    moonList = self.moons(d20)
-                    # Create rings
-                    hasRings = self.rings(d20)
-                    # Create cold planet
-                    # On a d2, 1 is a cold stone planet and 2 is an ice planet
-                    if (random.dice_roll(1,2) == 1):
-                        objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['COLD_STONE']
-                    else:
-                        objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ICE']
-                    rockyPlanet = orbitalobject.Planet(objectType = objectType,
-                                                       moons      = moonList,
-                                                       rings      = hasRings)
-                    # Place planet
-                    orbitalList[ooIndex] = rockyPlanet
-            # Place remaining worlds that have airless/thin atmospheres
-            for oa in otherAirless:
-                # Planet index to try to place station/base world at
-                randomOrbitIndices = range(0,len(orbitalList))
-                np.random.shuffle(randomOrbitIndices)
-                for roi in randomOrbitIndices:
-                    # Avoid asteroid belts
-                    if ( not isinstance(orbitalList[roi],orbitalobject.AsteroidBelt) ):
-                        # We'll treat all airless/thin as airless at this point to 
-                        # offset how we changed the TL2- worlds to something with a 
-                        # thicker atmosphere
-                        # If 1 it can be a space station
-                        # If 2 it can be a moon base if the chosen planet has any moons
-                        # otherwise we'll revert to it being a space station
-                        isMoon    = False
-                        isStation = True
-                        if (random.dice_roll(1,2) == 2):
-                            if ( len(orbitalList[roi].moons) > 0 ):
-                                # If the randomly chosen moon has a world already, just
-                                # make this a station instead
-                                moonRoll = random.dice_roll(1,len(orbitalList[roi].moons))
-                                if ( orbitalList[roi].moons[moonRoll-1].world == None ):
-                                    isMoon    = True
-                                    isStation = False
-                                    moonIndex = moonRoll
-                        # Create moon world
-                        if ( isMoon ):
-                            orbitalList[roi].moons[moonIndex-1].world = oa
-                            break
-                        # Create space station and attach world to it
-                        if ( isStation ):
-                            spaceStation = orbitalobject.SpaceStation(worldObj = oa)
-                            oa.name += ' Station'
-                            # Add world as space station to rocky planet
-                            orbitalList[roi].stations.append(spaceStation)
-                            break
-            # If for some reason a world didn't get put into an orbit, randomly
-            # insert it into the orbit list somewhere
-            # Get list of worlds in this orbit list
-            orbitWorldList = list()
-            for ol in orbitalList:
-                orbitWorldList += ol.world_list()
-            # Compare orbit list worlds system worlds
-            for owl in orbitWorldList:
-                if ( owl not in systemObj.worlds ):
-                    # d20 roll for planet stats
-                    d20 = random.dice_roll(1,20)
-                    # Create moons
-                    moonList = self.moons(d20)
-                    # Create rings
-                    hasRings = self.rings(d20)
-                    # Create rocky planet
-                    rockyPlanet = orbitalobject.Planet(objectType = orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY'],
-                                                       moons      = moonList,
-                                                       rings      = hasRings,
-                                                       worldObj   = owl)
-                    # Randomly place world
-                    orbitInsert = random.dice_roll(1,len(orbitalList))-1
-                    orbitalList.insert(orbitInsert,rockyPlanet)
-            # Put orbital list into system objects list
-            systemObj.objects = orbitalList
+                                                   worldObj   = owl)
+                # Randomly place world
+                orbitInsert = random.dice_roll(1,len(orbitalList),rng=rng)-1
+                orbitalList.insert(orbitInsert,rockyPlanet)
+        # Put orbital list into system objects list
+        systemObj.objects = orbitalList
+
+    ## Fork a generator from a snapshot.
+    #
+    #  The new generator continues the snapshot's sector from the stage it was
+    #  taken at, see resume. The snapshot is copied, so it can be forked any
+    #  number of times. Its partial sector can be changed before resuming.
+    #  @param self       The object pointer.
+    #  @param snapshot   Generator snapshot, see snapshot.
+    #  @param seedString Seed to roll the remaining stages from. Default is the
+    #                    snapshot's seed, giving the same sector. The forked 
+    #                    sector takes this seed, so its systems are rerolled
+    #                    from it too, see regenerate_system.
+    def fork(self,snapshot,seedString=None):
+        # Check arguments
+        snapshot = exception.arg_check(snapshot,GeneratorSnapshot)
+        # New generator with a copy of the snapshot state
+        newGenerator = Generator(snapshot.version)
+        newGenerator.__dict__.update(copy.deepcopy(snapshot.state))
+        newGenerator.seed = snapshot.seed
+        if (seedString is not None):
+            newGenerator.set_seed(seedString)
+            if (newGenerator.partialSector is not None):
+                newGenerator.partialSector.seed = newGenerator.seed
+        return(newGenerator)
+
+    def load(self):
+        raise Exception('Not implemented yet.')
+
+    def moons(self,d20,rng=None):
+        if (rng is None):
+            rng = self.rng
+        numSmallMoons  = orbitalobject.TABLE_SMALL_MOONS[d20]
+        numMediumMoons = orbitalobject.TABLE_MEDIUM_MOONS[d20]
+        moonList  = [orbitalobject.Moon(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['SMALL_MOON']) for sm in xrange(numSmallMoons)]
+        moonList += [orbitalobject.Moon(orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['MEDIUM_MOON']) for mm in xrange(numMediumMoons)]
+        rng.shuffle(moonList)
+        return(moonList)
+
+    def name_sector(self,rng=None):
+        if (rng is None):
+            rng = self.rng
+        sectorName  = rng.choice(name.sectorFirstNameList) + ' '
+        sectorName += rng.choice(name.sectorSecondNameList)
+        sectorName += rng.choice(['',' I',' II',' III',' IV',' V',' VI',' VII',' VIII',' IX',' X'])
+        return(sectorName)
+
+    def name_system(self,rng=None):
+        if (rng is None):
+            rng = self.rng
+        systemName = rng.choice(name.starNameList)
+        return(systemName)
+
+    def name_world(self,rng=None):
+        if (rng is None):
+            rng = self.rng
+        worldName = rng.choice(name.worldNameList)
+        return(worldName)
+
+    ## Regenerate one star system.
+    #
+    #  Rerolls the worlds and ORSS data of the system in a hex, keeping its
+    #  name, position, and the rest of the sector. Rolls come from streams 
+    #  keyed by the seed the sector was generated from, the salt, and the 
+    #  hex, so the same sector and salt reroll the same worlds and orbits, no
+    #  matter what the generator's seed is now, and each salt is a different
+    #  reroll.
+    #
+    #  The number of worlds is rolled on the worlds table without the 
+    #  sector's MAX_WORLDS limit. The old worlds' names are released and new
+    #  ones drawn from the sector's names, and the system's images are updated
+    #  if the sector's images have been created. Needs version 2 or later.
+    #  @param self      The object pointer.
+    #  @param sectorObj Sector with a system in the hex.
+    #  @param row       Hex row.
+    #  @param col       Hex column.
+    #  @param salt      Reroll number, 0 or more.
+    #  @return The regenerated system.
+    def regenerate_system(self,sectorObj,row,col,salt=0):
+        # Check arguments
+        sectorObj = exception.arg_check(sectorObj,sector.Sector)
+        row       = exception.arg_check(row,int)
+        col       = exception.arg_check(col,int)
+        salt      = exception.arg_range_check(exception.arg_check(salt,int),0)
+        exception.arg_range_check(self.version,2)
+        if (((row,col) not in sectorObj.hexes) or sectorObj.hex_empty(row,col)):
+            raise exception.NoSystem((row,col))
+        if (sectorObj.seed is None):
+            raise exception.NoSectorSeed(sectorObj.name)
+        systemObj = sectorObj.hexes[(row,col)].system
+        # Keyed streams of this reroll
+        def stream(stage,index=0):
+            rng = random.KeyedStream(random.substream_key(random.seed_alphabet_decode(sectorObj.seed),
+                                                          STAGE_REGENERATE,salt,stage,row,col,index))
+            if (self.tracer is not None):
+                return(self.tracer.stream(rng,stage))
+            return(rng)
+        # Drop the old ORSS data, without generating it if it was deferred
+        systemObj.reset_orss()
+        # Release the old worlds' names, as they were drawn
+        names = sectorObj.names
+        for w in systemObj.worlds:
+            names.release(w.name)
+            if (w.name.endswith(STATION_SUFFIX)):
+                names.release(w.name[:-len(STATION_SUFFIX)])
+        # Worlds
+        numWorlds = system.TABLE_WORLDS[random.dice_roll(1,10,rng=stream(STAGE_WORLDS))]
+        nameRng   = stream(STAGE_NAMES)
+        newWorlds = list()
+        for nm in xrange(numWorlds):
+            newWorldName = self._new_name(name.NAME_POOL_WORLD,self.name_world,names,nameRng)
+            newWorlds.append(self.world(newWorldName,stream(STAGE_WORLDS,nm+1)))
+        systemObj.worlds = newWorlds
+        # ORSS data
+        self.fill_system(systemObj,stream(STAGE_ORSS))
+        # Images
+        sectorObj.update_system_images(row,col)
+        return(systemObj)
+
+    def religion(self,rng=None):
+        if (rng is None):
+            rng = self.rng
+        evolution   = religion.TABLE_EVOLUTION[random.dice_roll(1,8,rng=rng)]
+        leadership  = religion.TABLE_LEADERSHIP[random.dice_roll(1,6,rng=rng)]
+        origin      = religion.TABLE_ORIGIN_TRADITION[random.dice_roll(1,12,rng=rng)]
+        newReligion = religion.Religion(evolution,leadership,origin)
+        return(newReligion)    
+
+    ## Continue generating the partial sector.
+    #
+    #  Generates the stages after the last one generated, up to lastStage. 
+    #  Starts a new sector if there isn't one.
+    #  @param self      The object pointer.
+    #  @param lastStage Stop after this stage, leaving later stages out of the
+    #                   sector. Default is to generate every stage.
+    def resume(self,lastStage=None):
+        # Check arguments
+        lastStage = exception.arg_check(lastStage,int,STAGE_RELIGIONS)
+
+        # Create sector --------------------------------------------------------
+        if (self._stage is None):
+            # Generate random sector name
+            newsectorName = self.name_sector(self.stream(STAGE_SECTOR))
+            # Create new sector object
+            self.partialSector = sector.Sector(newsectorName,
+                                               sector.SECTOR_MAJOR_ROW,
+                                               sector.SECTOR_MAJOR_COL,
+                                               self._rows,
+                                               self._cols,
+                                               self.seed)
+            # Names used in the sector
+            self._names = self.partialSector.names
+            # Names are drawn in order from their own stream
+            self._nameRng = self.stream(STAGE_NAMES)
+            self._stage   = STAGE_SECTOR
+        newSector = self.partialSector
+
+        # Generate star system positions ---------------------------------------
+        if ((self._stage < STAGE_POSITIONS) and (lastStage >= STAGE_POSITIONS)):
+            self._place_systems(newSector,self._groupingMethod,self._names,
+                                self.stream(STAGE_POSITIONS),self._nameRng)
+            self._stage = STAGE_POSITIONS
+
+        # Add worlds -----------------------------------------------------------
+        if ((self._stage < STAGE_WORLDS) and (lastStage >= STAGE_WORLDS)):
+            self._add_worlds(newSector,self._names,self._nameRng)
+            self._stage = STAGE_WORLDS
+
+        # Fill system data -----------------------------------------------------
+        # Use one roll star system (ORSS) rules
+        if ((self._stage < STAGE_ORSS) and (lastStage >= STAGE_ORSS)):
+            systemKeys = newSector.sorted_systems()
+            # From version 2 systems are filled together from their streams,
+            # see fill_systems, or when first used in lazy mode, unless rolls
+            # are traced
+            if (self.lazyOrss and (self.version >= 2) and (self.tracer is None)):
+                source = DeferredOrss(self.version,self.seed)
+                for systemKey in systemKeys:
+                    newSector.hexes[systemKey].system.defer_orss(source,systemKey)
+            elif ((self.version >= 2) and (self.tracer is None)):
+                if (systemKeys):
+                    (rows,cols) = np.array(systemKeys,dtype=int).T
+                    self.fill_systems([newSector.hexes[k].system for k in systemKeys],rows,cols)
+            else:
+                for systemKey in systemKeys:
+                    self.fill_system(newSector.hexes[systemKey].system,
+                                     self.stream(STAGE_ORSS,systemKey[0],systemKey[1]))
+            self._stage = STAGE_ORSS
 
         # Add corporations -----------------------------------------------------
-        for i in xrange(MAX_CORPORATIONS):
-            newSector.corporations.append(self.corporation())
+        if ((self._stage < STAGE_CORPORATIONS) and (lastStage >= STAGE_CORPORATIONS)):
+            rng = self.stream(STAGE_CORPORATIONS)
+            for i in xrange(MAX_CORPORATIONS):
+                newSector.corporations.append(self.corporation(rng))
+            self._stage = STAGE_CORPORATIONS
 
         # Add religions --------------------------------------------------------
-        for i in xrange(MAX_RELIGIONS):
-            newSector.religions.append(self.religion())
+        if ((self._stage < STAGE_RELIGIONS) and (lastStage >= STAGE_RELIGIONS)):
+            rng = self.stream(STAGE_RELIGIONS)
+            for i in xrange(MAX_RELIGIONS):
+                newSector.religions.append(self.religion(rng))
+            self._stage = STAGE_RELIGIONS
 
-        # Return new sector ----------------------------------------------------
+        # Return sector --------------------------------------------------------
         return(newSector)
 
+    def rings(self,d20):
+        return(orbitalobject.TABLE_MINOR_RINGS[d20])
+
+    def save(self,fName):
+        raise Exception('Not implemented yet.')
+
+    ## Generate a sector.
+    #
+    #  Sectors of other sizes than the default need version 7 or later. Their
+    #  star and world counts are scaled by area, see scaled_count.
+    #  @param self           The object pointer.
+    #  @param groupingMethod Grouping method for stars after the first 20.
+    #  @param lastStage      Stop after this stage, leaving later stages out of
+    #                        the sector. Default is to generate every stage.
+    #  @param rows           Number of hex rows. Default is sector.SECTOR_ROWS.
+    #  @param cols           Number of hex columns. Default is 
+    #                        sector.SECTOR_COLS.
+    def sector(self,
+               groupingMethod = GROUPING_METHOD,
+               lastStage      = None,
+               rows           = None,
+               cols           = None):
+        # Check arguments
+        rows = exception.arg_range_check(exception.arg_check(rows,int,sector.SECTOR_ROWS),1)
+        cols = exception.arg_range_check(exception.arg_check(cols,int,sector.SECTOR_COLS),1)
+        if ((rows != sector.SECTOR_ROWS) or (cols != sector.SECTOR_COLS)):
+            exception.arg_range_check(self.version,7)
+        # Start a new sector
+        self._groupingMethod = groupingMethod
+        self._rows           = rows
+        self._cols           = cols
+        self._stage          = None
+        return(self.resume(lastStage))
+
+    ## Generate sectors from many seeds.
+    #
+    #  Generator yielding (seed, sector) pairs. Seeds are split into chunks 
+    #  that are generated in a process pool, and sectors are streamed back as
+    #  chunks finish. Every sector is the one a single generator of the same 
+    #  version makes from its seed. Errors raised generating a sector, e.g.
+    #  exception.MaxLoopIterationsExceed, are raised here.
+    #
+    #  With sectorColumns set, workers send sectors back as columns in shared
+    #  memory instead of pickling them, and (seed, columns) pairs are yielded,
+    #  see columns.SectorColumns.
+    #  @param self           The object pointer.
+    #  @param seeds          Iterable of seed strings.
+    #  @param groupingMethod Grouping method for stars after the first 20.
+    #  @param lastStage      Stop after this stage, leaving later stages out of
+    #                        the sectors. Default is to generate every stage.
+    #  @param workers        Number of worker processes. Default is CPU count.
+    #  @param chunkSize      Number of seeds per worker task.
+    #  @param ordered        Yield sectors in seed order if True, else in the
+    #                        order chunks finish.
+    #  @param sectorColumns  Yield sector columns instead of sectors.
+    #  @param rows           Number of hex rows, see sector.
+    #  @param cols           Number of hex columns, see sector.
+    def sectors(self,
+                seeds,
+                groupingMethod = GROUPING_METHOD,
+                lastStage      = None,
+                workers        = None,
+                chunkSize      = None,
+                ordered        = True,
+                sectorColumns  = False,
+                rows           = None,
+                cols           = None):
+        # Check arguments
+        workers   = exception.arg_check(workers,  int,mp.cpu_count())
+        chunkSize = exception.arg_check(chunkSize,int,SECTORS_CHUNK_SIZE)
+        exception.arg_range_check(workers,  1)
+        exception.arg_range_check(chunkSize,1)
+        rows = exception.arg_check(rows,int,sector.SECTOR_ROWS)
+        cols = exception.arg_check(cols,int,sector.SECTOR_COLS)
+        # Chunks of seeds
+        seeds = iter(seeds)
+        def chunks():
+            chunk = list(itertools.islice(seeds,chunkSize))
+            while (chunk):
+                yield(chunk)
+                chunk = list(itertools.islice(seeds,chunkSize))
+        # Shared memory files are written to a directory of their own, so 
+        # files of chunks that are never read are removed with it
+        sharedDir = columns.new_shared_dir() if sectorColumns else None
+        try:
+            pool = mp.Pool(workers,
+                           _init_worker,
+                           (self.version,groupingMethod,lastStage,rows,cols,sharedDir))
+            chunkFunc = _generate_chunk_columns if sectorColumns else _generate_chunk
+            try:
+                if (ordered):
+                    results = pool.imap(chunkFunc,chunks())
+                else:
+                    results = pool.imap_unordered(chunkFunc,chunks())
+                for result in results:
+                    if (sectorColumns):
+                        (chunkSeeds, path, layout) = result
+                        result = zip(chunkSeeds,columns.read_shared(path,layout))
+                    for seedSector in result:
+                        yield(seedSector)
+            finally:
+                pool.terminate()
+                pool.join()
+        finally:
+            if (sharedDir is not None):
+                columns.remove_shared_dir(sharedDir)
+
+    ## Generate a campaign of adjacent sectors.
+    #
+    #  Sectors are generated independently in a process pool, see sectors, 
+    #  each from its own seed, see campaign_sector_seed. Each sector is the one
+    #  a single generator makes from that seed, placed at its major row and
+    #  column, except for names used by an earlier sector. Going through the 
+    #  sectors in major row then column order, and each sector's systems in
+    #  sorted order, a sector, system, or world name that's already been used
+    #  is replaced by a new one, rolled from a stream keyed by the campaign 
+    #  seed and hex. The sectors then share one name allocator, so systems 
+    #  regenerated later get names unused in the whole campaign.
+    #  @param self           The object pointer.
+    #  @param rows           Number of sector rows.
+    #  @param cols           Number of sector columns.
+    #  @param seed           Campaign seed string.
+    #  @param groupingMethod Grouping method for stars after the first 20.
+    #  @param lastStage      Stop after this stage, see sectors.
+    #  @param workers        Number of worker processes. Default is CPU count.
+    #  @param chunkSize      Number of sectors per worker task.
+    #  @param sectorRows     Number of hex rows of each sector, see sector.
+    #  @param sectorCols     Number of hex columns of each sector, see sector.
+    #  @return campaign.Campaign of the sectors.
+    def campaign(self,
+                 rows,
+                 cols,
+                 seed,
+                 groupingMethod = GROUPING_METHOD,
+                 lastStage      = None,
+                 workers        = None,
+                 chunkSize      = None,
+                 sectorRows     = None,
+                 sectorCols     = None):
+        # Check arguments
+        rows      = exception.arg_range_check(exception.arg_check(rows,int),1)
+        cols      = exception.arg_range_check(exception.arg_check(cols,int),1)
+        seed      = exception.arg_check(seed,str)
+        chunkSize = exception.arg_check(chunkSize,int,CAMPAIGN_CHUNK_SIZE)
+        majors = [(majorRow,majorCol) for majorRow in xrange(rows) for majorCol in xrange(cols)]
+        seeds  = [campaign_sector_seed(seed,majorRow,majorCol) for (majorRow,majorCol) in majors]
+        # Generate the sectors
+        sectors = dict()
+        results = self.sectors(seeds,
+                               groupingMethod,
+                               lastStage,
+                               workers,
+                               chunkSize,
+                               ordered = True,
+                               rows    = sectorRows,
+                               cols    = sectorCols)
+        for ((majorRow,majorCol), (sectorSeed,newSector)) in zip(majors,results):
+            newSector.majorRow = majorRow
+            newSector.majorCol = majorCol
+            sectors[(majorRow,majorCol)] = newSector
+        # Replace repeated names
+        names = self._campaign_names(seed,majors,sectors)
+        return(campaign.Campaign(seed,rows,cols,sectors,names))
+
+    ## Replace names repeated across the sectors of a campaign.
+    #  @param self    The object pointer.
+    #  @param seed    Campaign seed string.
+    #  @param majors  List of (majorRow, majorCol) of the sectors, in order.
+    #  @param sectors Dictionary of sectors keyed by (majorRow, majorCol).
+    #  @return Name allocator now shared by the sectors.
+    def _campaign_names(self,seed,majors,sectors):
+        names   = name.NameAllocator()
+        seedInt = random.seed_alphabet_decode(seed)
+        for (majorRow,majorCol) in majors:
+            sectorObj = sectors[(majorRow,majorCol)]
+            # Random stream for the renames of a hex
+            def stream(stage,row=0,col=0):
+                return(random.KeyedStream(random.substream_key(seedInt,STAGE_CAMPAIGN,majorRow,majorCol,
+                                                               stage,row,col)))
+            # Sector name
+            if (not names.add(sectorObj.name)):
+                sectorObj.name = self.unique_name(self.name_sector,names,stream(STAGE_SECTOR))
+            for (row,col) in sectorObj.sorted_systems():
+                systemObj = sectorObj.hexes[(row,col)].system
+                nameRng   = None
+                # System name
+                if (not names.add(systemObj.name)):
+                    nameRng = stream(STAGE_NAMES,row,col)
+                    systemObj.name = self._new_name(name.NAME_POOL_STAR,self.name_system,names,nameRng)
+                # World names, without the station suffix
+                for w in systemObj.worlds:
+                    isStation = w.name.endswith(STATION_SUFFIX)
+                    worldName = w.name[:-len(STATION_SUFFIX)] if isStation else w.name
+                    if (not names.add(worldName)):
+                        if (nameRng is None):
+                            nameRng = stream(STAGE_NAMES,row,col)
+                        worldName = self._new_name(name.NAME_POOL_WORLD,self.name_world,names,nameRng)
+                        w.name = worldName + STATION_SUFFIX if isStation else worldName
+        # Share the campaign's names
+        for sectorObj in sectors.itervalues():
+            sectorObj.names = names
+        return(names)
+
     def set_seed(self,seedString):
         # Check arguments
         #   name
         seedString = exception.arg_check(seedString,str)
         # Set seed
-        random.set_seed(random.seed_alphabet_decode(seedString))
-        self.seed = seedString
\ No newline at end of file
+        random.set_seed(random.seed_alphabet_decode(seedString),self.rng)
+        self.seed = seedString
+
+    ## Snapshot of the partial sector.
+    #
+    #  Captures the partial sector and random number generator position at 
+    #  the last stage generated, e.g. after sector(groupingMethod,STAGE_WORLDS).
+    #  Variants of the sector can then be generated from the snapshot with
+    #  fork, generating only the remaining stages.
+    #  @param self The object pointer.
+    def snapshot(self):
+        return(GeneratorSnapshot(self))
+
+    ## Random stream for a stage of generation.
+    #
+    #  Version 1 rolls everything from the generator's own stream. Later
+    #  versions key a new stream from the seed, stage, hex, and index so rolls
+    #  in one stream don't depend on how many rolls were made in another.
+    #  When a tracer is set the stream is wrapped to record or replay rolls.
+    #  @param self  The object pointer.
+    #  @param stage Generation stage.
+    #  @param row   Hex row.
+    #  @param col   Hex column.
+    #  @param index Index within the hex, e.g. world number.
+    def stream(self,stage,row=0,col=0,index=0):
+        if (self.version == 1):
+            rng = self.rng
+        else:
+            rng = random.KeyedStream(random.substream_key(random.seed_alphabet_decode(self.seed),
+                                                          stage,row,col,index))
+        if (self.tracer is not None):
+            return(self.tracer.stream(rng,stage))
+        return(rng)
+
+    ## Random streams for many hexes of a stage of generation.
+    #
+    #  Batch of the streams stream would return for each hex and index, for
+    #  version 2 and later. Rolls from a batch aren't traced.
+    #  @param self    The object pointer.
+    #  @param stage   Generation stage.
+    #  @param rows    Hex rows.
+    #  @param cols    Hex columns.
+    #  @param indices Indices within the hexes.
+    def stream_batch(self,stage,rows,cols,indices):
+        exception.arg_range_check(self.version,2)
+        return(random.KeyedStreamBatch(random.substream_keys(random.seed_alphabet_decode(self.seed),
+                                                             stage,rows,cols,indices)))
+
+    ## Pick a name that has not been used yet.
+    #  @param self      The object pointer.
+    #  @param nameFunc  Name function to draw names from.
+    #  @param usedNames Names already used, a name.NameAllocator. The new name
+    #                   is added to it.
+    #  @param rng       Random stream to draw names from.
+    def unique_name(self,nameFunc,usedNames,rng=None):
+        nameLoopCount = 0
+        while (True):
+            newName = nameFunc(rng)
+            if (usedNames.add(newName)):
+                return(newName)
+            nameLoopCount += 1
+            if (nameLoopCount>100):
+                raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
+
+    ## Roll a new world.
+    #  @param self      The object pointer.
+    #  @param worldName Name of the world.
+    #  @param rng       Random stream to roll the world with.
+    def world(self,worldName,rng=None):
+        if (rng is None):
+            rng = self.rng
+        if (self.version >= 3):
+            # Sample tables (one draw each)
+            atmosphere = world.SAMPLER_ATMOSPHERE.sample(rng)
+            biosphere  = world.SAMPLER_BIOSPHERE.sample(rng)
+            (population, populationRange) = world.SAMPLER_POPULATION.sample(rng)
+            populationAlt = rng.randint(populationRange[0],populationRange[1]+1)
+            # Second tag is any tag but the first
+            t1 = rng.randint(0,len(world.TAG_LIST))
+            t2 = rng.randint(0,len(world.TAG_LIST)-1)
+            if (t2 >= t1):
+                t2 += 1
+            tag1       = world.TAG_LIST[t1]
+            tag2       = world.TAG_LIST[t2]
+            techLevel  = world.SAMPLER_TECH_LEVEL.sample(rng)
+            temperatue = world.SAMPLER_TEMPERATURE.sample(rng)
+        else:
+            # Roll tags
+            atmosphere    = world.TABLE_ATMOSPHERE[random.dice_roll(2,6,rng=rng)]
+            biosphere     = world.TABLE_BIOSPHERE[random.dice_roll(2,6,rng=rng)]
+            pop2d6        = random.dice_roll(2,6,rng=rng)
+            population    = world.TABLE_POPULATION[pop2d6]
+            populationAlt = rng.randint(world.TABLE_POPULATION_ALT[pop2d6][0],
+                                        world.TABLE_POPULATION_ALT[pop2d6][1]+1)
+            t1d6          = random.dice_roll(1,6,rng=rng)
+            t1d10         = random.dice_roll(1,10,rng=rng)
+            t2d6          = random.dice_roll(1,6,rng=rng)
+            t2d10         = random.dice_roll(1,10,rng=rng)
+            # Don't allow duplicate tags, reroll until a new one is generated
+            loopCount = 0
+            while ( (t1d6 == t2d6) and (t1d10 == t2d10) ):
+                t2d6  = random.dice_roll(1,6,rng=rng)
+                t2d10 = random.dice_roll(1,10,rng=rng)
+                # Catch runaway loop
+                loopCount +=1
+                if (loopCount>100):
+                    raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
+            tag1       = world.TABLE_TAGS[t1d6][t1d10]
+            tag2       = world.TABLE_TAGS[t2d6][t2d10]
+            techLevel  = world.TABLE_TECH_LEVEL[random.dice_roll(2,6,rng=rng)]
+            temperatue = world.TABLE_TEMPERATURE[random.dice_roll(2,6,rng=rng)]
+        newWorld = world.World(name          = worldName,
+                               atmosphere    = atmosphere,
+                               biosphere     = biosphere,
+                               population    = population,
+                               populationAlt = populationAlt,
+                               tags          = [tag1,tag2],
+                               temperature   = temperatue,
+                               techLevel     = techLevel)
+        return(newWorld)
+
+    ## Roll many new worlds.
+    #
+    #  Rolls the same worlds as world with each world's own stream, but rolls
+    #  every world at once with numpy arrays, one table at a time. Only for
+    #  version 3 and later.
+    #  @param self       The object pointer.
+    #  @param worldNames Names of the worlds.
+    #  @param rows       Hex row of each world.
+    #  @param cols       Hex column of each world.
+    #  @param indices    Index of each world within its hex, see stream.
+    #  @return List of worlds.
+    def worlds(self,worldNames,rows,cols,indices):
+        exception.arg_range_check(self.version,3)
+        rng = self.stream_batch(STAGE_WORLDS,rows,cols,indices)
+        # Sample tables (one draw each)
+        atmospheres = world.SAMPLER_ATMOSPHERE.sample_batch(rng)
+        biospheres  = world.SAMPLER_BIOSPHERE.sample_batch(rng)
+        populations = world.SAMPLER_POPULATION.sample_batch(rng)
+        populationRanges = np.array([world.SAMPLER_POPULATION.outcomes[p][1] for p in populations],dtype=np.int64).reshape(-1,2)
+        populationAlts   = rng.randint(populationRanges[:,0],populationRanges[:,1]+1)
+        # Second tag is any tag but the first
+        t1s = rng.randint(0,len(world.TAG_LIST))
+        t2s = rng.randint(0,len(world.TAG_LIST)-1)
+        t2s += (t2s >= t1s)
+        techLevels   = world.SAMPLER_TECH_LEVEL.sample_batch(rng)
+        temperatures = world.SAMPLER_TEMPERATURE.sample_batch(rng)
+        # Create worlds
+        newWorlds = list()
+        for (i, worldName) in enumerate(worldNames):
+            newWorlds.append(world.World(name          = worldName,
+                                         atmosphere    = world.SAMPLER_ATMOSPHERE.outcomes[atmospheres[i]],
+                                         biosphere     = world.SAMPLER_BIOSPHERE.outcomes[biospheres[i]],
+                                         population    = world.SAMPLER_POPULATION.outcomes[populations[i]][0],
+                                         populationAlt = int(populationAlts[i]),
+                                         tags          = [world.TAG_LIST[t1s[i]],world.TAG_LIST[t2s[i]]],
+                                         temperature   = world.SAMPLER_TEMPERATURE.outcomes[temperatures[i]],
+                                         techLevel     = world.SAMPLER_TECH_LEVEL.outcomes[techLevels[i]]))
+        return(newWorlds)
+
+# Deferred ORSS class ----------------------------------------------------------
+## Deferred one roll star system (ORSS) class.
+#
+# Fills systems whose ORSS data was deferred in lazy mode, see 
+# Generator.lazyOrss and system.System.defer_orss. Each system is filled from
+# its own stream, so it gets the same data as when the sector is generated 
+# eagerly, whenever and in whatever order systems are used. One is shared by
+# every system of a sector.
+class DeferredOrss(object):
+    ## Deferred ORSS constructor.
+    #  @param self       The object pointer.
+    #  @param version    Generation version, 2 or later.
+    #  @param seedString Seed of the sector.
+    def __init__(self,version,seedString):
+        self.version = exception.arg_range_check(exception.arg_check(version,int),2,GENERATOR_VERSION)
+        self.seed    = exception.arg_check(seedString,str)
+        # Generator to fill systems with, created on first use
+        self._generator = None
+
+    ## Pickle and copy without the generator.
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_generator'] = None
+        return(state)
+
+    ## Fill a system's ORSS data.
+    #  @param self      The object pointer.
+    #  @param systemObj System with worlds.
+    #  @param key       Hex of the system.
+    def fill(self,systemObj,key):
+        if (self._generator is None):
+            self._generator = Generator(self.version)
+            self._generator.set_seed(self.seed)
+        self._generator.fill_system(systemObj,self._generator.stream(STAGE_ORSS,key[0],key[1]))
+
+# Generator snapshot class -----------------------------------------------------
+## Generator snapshot class.
+#
+# Copy of a generator's partial sector and random number generator state, see
+# Generator.snapshot and Generator.fork.
+class GeneratorSnapshot(object):
+    # Generator attributes copied into a snapshot. They're copied together so
+    # streams shared between them stay shared.
+    _STATE = ['rng',
+              'partialSector',
+              '_stage',
+              '_groupingMethod',
+              '_rows',
+              '_cols',
+              '_names',
+              '_nameRng']
+
+    ## Generator snapshot constructor.
+    #  @param self      The object pointer.
+    #  @param generator Generator to snapshot.
+    def __init__(self,generator):
+        self.version = generator.version
+        self.seed    = generator.seed
+        self.stage   = generator._stage
+        self.state   = copy.deepcopy(dict((a, getattr(generator,a)) for a in self._STATE))
@@ -1,7 +1,15 @@
 #!/usr/bin/env python
 
+import collections
 import exception
 import math
+import numpy as np
+
+# Grids with more hexes than this compute distance table rows as needed
+ODD_Q_DISTANCE_TABLE_MAX_HEXES = 4096
+# Most distances cached in the rows of such grids, as many as the largest
+# whole table
+ODD_Q_DISTANCE_TABLE_MAX_CACHED = ODD_Q_DISTANCE_TABLE_MAX_HEXES**2
 
 # Notes ------------------------------------------------------------------------
 # Flat topped hex vertices
@@ -99,6 +107,91 @@ def odd_q_distance(aRow, aCol, bRow, bCol):
     (bX, bY, bZ) = odd_q_to_cube(bRow, bCol)
     return(cube_distance(aX, aY, aZ, bX, bY, bZ))
 
+# Distance tables --------------------------------------------------------------
+## Odd-q distance table class.
+#
+# Distances between every pair of hexes of an odd-q grid, so distances can be
+# looked up by fancy indexing instead of converted to cube coordinates on
+# every call. Hexes are indexed row*cols+col. Grids up to
+# ODD_Q_DISTANCE_TABLE_MAX_HEXES hexes build the whole table at once, larger
+# grids build the rows of the table as they're used. Tables are shared by every
+# sector of a shape, so only the most recently used rows are kept, up to 
+# ODD_Q_DISTANCE_TABLE_MAX_CACHED distances.
+class OddQDistanceTable(object):
+    ## Odd-q distance table constructor.
+    #  @param self The object pointer.
+    #  @param rows Number of grid rows.
+    #  @param cols Number of grid columns.
+    def __init__(self, rows, cols):
+        self.rows = exception.arg_check(rows, int)
+        self.cols = exception.arg_check(cols, int)
+        exception.arg_range_check(rows, 1)
+        exception.arg_range_check(cols, 1)
+        # No distance is more than rows+cols
+        if (rows + cols < 256):
+            self.dtype = np.uint8
+        else:
+            self.dtype = np.uint16
+        (self._hexRows, self._hexCols) = [a.ravel() for a in np.indices((rows, cols))]
+        # Rows from least to most recently used
+        self._rowCache     = collections.OrderedDict()
+        self._rowCacheSize = max(1, ODD_Q_DISTANCE_TABLE_MAX_CACHED//(rows*cols))
+        if (rows*cols <= ODD_Q_DISTANCE_TABLE_MAX_HEXES):
+            self._table = odd_q_distance(self._hexRows[:,None], self._hexCols[:,None],
+                                         self._hexRows[None,:], self._hexCols[None,:]).astype(self.dtype)
+        else:
+            self._table = None
+
+    ## Distances from a hex to every hex, indexed by hex.
+    def _row(self, index):
+        if (self._table is not None):
+            return(self._table[index])
+        try:
+            row = self._rowCache.pop(index)
+        except KeyError:
+            row = odd_q_distance(self._hexRows[index], self._hexCols[index],
+                                 self._hexRows, self._hexCols).astype(self.dtype)
+            if (len(self._rowCache) >= self._rowCacheSize):
+                self._rowCache.popitem(last=False)
+        self._rowCache[index] = row
+        return(row)
+
+    ## Distances between two lists of hexes.
+    #  @param aRows Rows of the first hexes.
+    #  @param aCols Columns of the first hexes.
+    #  @param bRows Rows of the second hexes.
+    #  @param bCols Columns of the second hexes.
+    #  @return Array of distances indexed [first hex, second hex].
+    def distances(self, aRows, aCols, bRows, bCols):
+        aIndices = np.asarray(aRows)*self.cols + np.asarray(aCols)
+        bIndices = np.asarray(bRows)*self.cols + np.asarray(bCols)
+        if (self._table is not None):
+            return(self._table[np.ix_(aIndices, bIndices)])
+        return(np.array([self._row(a)[bIndices] for a in aIndices], dtype=self.dtype).reshape(len(aIndices), len(bIndices)))
+
+    ## Distances from a hex to every hex of the grid.
+    #  @param row Row of the hex.
+    #  @param col Column of the hex.
+    #  @return Array of distances indexed [row, col].
+    def hex_distances(self, row, col):
+        return(self._row(row*self.cols + col).reshape(self.rows, self.cols))
+
+# Distance tables built so far, keyed by grid shape
+_oddQDistanceTables = dict()
+
+## Odd-q distance table for a grid shape.
+#
+# Tables are built once per grid shape and shared.
+# @param rows Number of grid rows.
+# @param cols Number of grid columns.
+def odd_q_distance_table(rows, cols):
+    try:
+        return(_oddQDistanceTables[(rows, cols)])
+    except KeyError:
+        table = OddQDistanceTable(rows, cols)
+        _oddQDistanceTables[(rows, cols)] = table
+        return(table)
+
 # Neighbors --------------------------------------------------------------------
 def axial_neighbors(q, r):
     (x, y, z) = axialtoCube(q, r)
@@ -107,6 +107,31 @@ _SYSTEM_NAME_MARGIN_RATIO        = 1./6.
 _TABLE_FONT_SIZE_RATIO           = 2./3.
 _TABLE_TITLE_FONT_SIZE_RATIO     = 2.
 
+# Functions --------------------------------------------------------------------
+## Hex number text.
+#
+#  Major column, column, major row, then row, e.g. '0304' for row 4, column 3 
+#  of sector 0,0. Rows and columns are padded to the same number of digits.
+#  @param majorRow Major row of sector.
+#  @param majorCol Major column of sector.
+#  @param row      Hex row.
+#  @param col      Hex column.
+#  @param digits   Digits of rows and columns. Default is 1.
+def hex_number(majorRow, majorCol, row, col, digits=1):
+    return('{mCol}{col:0{d}}{mRow}{row:0{d}}'.format(mCol = majorCol,
+                                                     col  = col,
+                                                     mRow = majorRow,
+                                                     row  = row,
+                                                     d    = digits))
+
+## Digits of hex numbers.
+#
+#  Enough digits for every row and column of a grid.
+#  @param rows Number of rows.
+#  @param cols Number of columns.
+def hex_digits(rows, cols):
+    return(len(str(max(rows, cols)-1)))
+
 ## Hex class.
 #
 #  The hex class is used to create imagery for a hex to display in a
@@ -363,10 +388,11 @@ class HexGrid(object):
                 # Offset centers by margins
                 (xc, yc) = (xc + self._horizontalMargin, yc + self._verticalMargin)
                 # Hex number text
-                hexNum = '{mCol}{col}{mRow}{row}'.format(mCol = self._majorCol,
-                                                         col  = col,
-                                                         mRow = self._majorRow,
-                                                         row  = row)
+                hexNum = hex_number(self._majorRow, 
+                                    self._majorCol, 
+                                    row, 
+                                    col, 
+                                    hex_digits(self._rows, self._cols))
                 # Hex number text size
                 w, h = drawingImage.textsize(hexNum, font=self._font)
                 # Draw hex number text
@@ -628,18 +654,21 @@ class InfoTable(object):
     #  @param verticalMargin   Vertical margin in pixels.
     #  @param horizontalMargin Horizontal margin in pixels.
     #  @param background       Background image.
+    #  @param hexDigits        Digits of hex rows and columns, see hex_digits.
     def __init__(self, 
                  sectorName, 
                  height, 
                  verticalMargin   = None,
                  horizontalMargin = None,
-                 background       = None):
+                 background       = None,
+                 hexDigits        = None):
         # Check arguments.
         self._sectorName       = exception.arg_check(sectorName,       str)
         self._height           = exception.arg_check(height,           int)
         self._verticalMargin   = exception.arg_check(verticalMargin,   int, 0)
         self._horizontalMargin = exception.arg_check(horizontalMargin, int, 0)
         self._background       = exception.arg_check(background,       pilimage.Image, pilimage.new("RGBA", (height,height), color=color.BLACK.rgba()))
+        self._hexDigits        = exception.arg_check(hexDigits,        int, 1)
 
         # Set parameters.
         self._set_params(self._height,
@@ -686,13 +715,13 @@ class InfoTable(object):
 
         # Check arguments.
         exception.arg_check(majorRow,       int)
-        exception.arg_range_check(majorRow, 0, 9)
+        exception.arg_range_check(majorRow, 0)
         exception.arg_check(majorCol,       int)
-        exception.arg_range_check(majorCol, 0, 9)
+        exception.arg_range_check(majorCol, 0)
         exception.arg_check(hRow,           int)
-        exception.arg_range_check(hRow,     0, 9)
+        exception.arg_range_check(hRow,     0)
         exception.arg_check(hCol,           int)
-        exception.arg_range_check(hCol,     0, 9)
+        exception.arg_range_check(hCol,     0)
         exception.arg_check(systemName,     str)
         exception.arg_check(worldName,      str)
         exception.arg_check(techLevel,      str)
@@ -709,10 +738,7 @@ class InfoTable(object):
             exception.arg_check(a,          str)
 
         # Calculate hex string
-        hexString = '{mc}{hc}{mr}{hr}'.format(mc=majorCol,
-                                              hc=hCol,
-                                              mr=majorRow,
-                                              hr=hRow)
+        hexString = hex_number(majorRow, majorCol, hRow, hCol, self._hexDigits)
 
         # Check to see if any system in hex.
         tableKey = (hexString, systemName)
@@ -731,6 +757,23 @@ class InfoTable(object):
                                               'tags':          ', '.join(tags),
                                               'advisory':      ', '.join(advisory)}
 
+    ## Remove the worlds of a hex.
+    #  @param self     The object pointer.
+    #  @param majorRow Major row of sector.
+    #  @param majorCol Major column of sector.
+    #  @param hRow     Hex row.
+    #  @param hCol     Hex column.
+    def reset_hex(self,
+                  majorRow,
+                  majorCol,
+                  hRow,
+                  hCol):
+        # Calculate hex string
+        hexString = hex_number(majorRow, majorCol, hRow, hCol, self._hexDigits)
+        # Delete systems in hex
+        for tableKey in [k for k in self._hexInfo if k[0] == hexString]:
+            del self._hexInfo[tableKey]
+
     def draw(self, gm=False):
         # Blank image before drawing
         if not (self._workingImage is None):
@@ -1534,13 +1577,13 @@ class OrbitMapGroup(object):
                    systemName):
         # Check arguments.
         exception.arg_check(majorRow,       int)
-        exception.arg_range_check(majorRow, 0, 9)
+        exception.arg_range_check(majorRow, 0)
         exception.arg_check(majorCol,       int)
-        exception.arg_range_check(majorCol, 0, 9)
+        exception.arg_range_check(majorCol, 0)
         exception.arg_check(hRow,           int)
-        exception.arg_range_check(hRow,     0, 9)
+        exception.arg_range_check(hRow,     0)
         exception.arg_check(hCol,           int)
-        exception.arg_range_check(hCol,     0, 9)
+        exception.arg_range_check(hCol,     0)
         exception.arg_check(systemName,     str)
 
         # Check to see if system exists.
@@ -1572,9 +1615,9 @@ class OrbitMapGroup(object):
                   hCol):
         # Check arguments.
         exception.arg_check(hRow,           int)
-        exception.arg_range_check(hRow,     0, 9)
+        exception.arg_range_check(hRow,     0)
         exception.arg_check(hCol,           int)
-        exception.arg_range_check(hCol,     0, 9)
+        exception.arg_range_check(hCol,     0)
 
         # Delete hex
         hexKey = (hRow, hCol)
@@ -1607,9 +1650,9 @@ class OrbitMapGroup(object):
                       hCol):
         # Check arguments.
         exception.arg_check(hRow,       int)
-        exception.arg_range_check(hRow, 0, 9)
+        exception.arg_range_check(hRow, 0)
         exception.arg_check(hCol,       int)
-        exception.arg_range_check(hCol, 0, 9)
+        exception.arg_range_check(hCol, 0)
         # Check to see if system exists.
         hexKey = (hRow, hCol)
         if (self.maps.has_key(hexKey)):
@@ -1680,7 +1723,8 @@ class SectorImage(object):
                                    self._height, 
                                    self._verticalMargin,
                                    self._horizontalMargin,
-                                   self._background)
+                                   self._background,
+                                   hex_digits(self._rows, self._cols))
         # Create orbit maps.
         self.orbitMapGroup = OrbitMapGroup(self._height, 
                                            self._verticalMargin,
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 import functools
+import numpy as np
 import os
 
+import exception
+
 _THIS_PATH = os.path.dirname(os.path.realpath(__file__))
 _NAME_FILE_PATH = os.path.join(_THIS_PATH,'namefiles')
 
@@ -61,4 +64,102 @@ WORLD_NAME_FILES = ['AncientGreekFemale',
 worldNameList = list()
 for fName in WORLD_NAME_FILES:
     for name in NAMES[fName]:
-        worldNameList.append(name)
\ No newline at end of file
+        worldNameList.append(name)
+
+# Name pools -------------------------------------------------------------------
+# Unique names of each list as arrays, keyed by pool name
+NAME_POOL_STAR  = 'star'
+NAME_POOL_WORLD = 'world'
+NAME_POOLS = {NAME_POOL_STAR:  np.array(sorted(set(starNameList))),
+              NAME_POOL_WORLD: np.array(sorted(set(worldNameList)))}
+
+# Roman numerals, largest first
+_ROMAN_NUMERALS = [(1000,'M'),(900,'CM'),(500,'D'),(400,'CD'),(100,'C'),(90,'XC'),
+                   (50,'L'),(40,'XL'),(10,'X'),(9,'IX'),(5,'V'),(4,'IV'),(1,'I')]
+
+# Functions --------------------------------------------------------------------
+## Roman numeral.
+#  @param number Number, 1 or more.
+#  @return Number in roman numerals, e.g. 'IV' for 4.
+def roman_numeral(number):
+    number  = exception.arg_range_check(exception.arg_check(number,int),1)
+    numeral = ''
+    for (value, letters) in _ROMAN_NUMERALS:
+        while (number >= value):
+            numeral += letters
+            number  -= value
+    return(numeral)
+
+# Name allocator class ---------------------------------------------------------
+## Name allocator class.
+#
+# Hands out names that haven't been used yet in a generation scope, e.g. a 
+# sector or a campaign of sectors. Each pool is drawn without replacement 
+# from a shuffled permutation that is only shuffled as far as it's been 
+# drawn, one draw per name. Names used from any pool are kept in one set, so 
+# names shared by pools are only handed out once.
+#
+# Once a pool has been drawn through, it's drawn through again with a roman
+# numeral added to its names, e.g. 'Vega II', so large scopes never run out.
+class NameAllocator(object):
+    ## Name allocator constructor.
+    #  @param self The object pointer.
+    def __init__(self):
+        # Names used so far
+        self.used = set()
+        # Permutation of each pool drawn from and how far it's been drawn,
+        # keyed by pool name
+        self._permutations = dict()
+        self._drawn        = dict()
+        # Times each pool has been drawn through, keyed by pool name
+        self._rounds       = dict()
+
+    ## Allocate a name.
+    #  @param self The object pointer.
+    #  @param pool Pool name, see NAME_POOLS.
+    #  @param rng  Random stream, see random.DiceStream.
+    #  @return Name not used before in this allocator.
+    def allocate(self, pool, rng):
+        names = NAME_POOLS[pool]
+        if (pool not in self._permutations):
+            self._permutations[pool] = np.arange(len(names))
+            self._drawn[pool]        = 0
+            self._rounds[pool]       = 0
+        permutation = self._permutations[pool]
+        drawn       = self._drawn[pool]
+        while (True):
+            # Start the next round
+            if (drawn == len(names)):
+                drawn = 0
+                self._rounds[pool] += 1
+            # Next step of a Fisher-Yates shuffle
+            other = drawn + rng.randint(0,len(names)-drawn)
+            (permutation[drawn], permutation[other]) = (permutation[other], permutation[drawn])
+            newName = str(names[permutation[drawn]])
+            if (self._rounds[pool] > 0):
+                newName += ' ' + roman_numeral(self._rounds[pool]+1)
+            drawn += 1
+            # Skip names already used from another pool
+            if (newName not in self.used):
+                self.used.add(newName)
+                self._drawn[pool] = drawn
+                return(newName)
+
+    ## Release a used name.
+    #
+    #  The name can be used again, e.g. by add. Pools that already drew it 
+    #  don't draw it again.
+    #  @param self    The object pointer.
+    #  @param oldName Name to release.
+    def release(self, oldName):
+        self.used.discard(oldName)
+
+    ## Mark a name as used.
+    #  @param self    The object pointer.
+    #  @param newName Name to mark.
+    #  @return True if the name wasn't used yet.
+    def add(self, newName):
+        if (newName in self.used):
+            return(False)
+        self.used.add(newName)
+        return(True)
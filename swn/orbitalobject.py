@@ -3,6 +3,7 @@
 import abc
 
 import exception
+import rolltable
 import world
 
 # Tables -----------------------------------------------------------------------
@@ -116,6 +117,12 @@ TABLE_ORBITAL_OBJECT_ABBREVIATIONS = {
     'space station':            'SS' 
 }
 
+# Roll tables ------------------------------------------------------------------
+# Tables compiled into arrays and checked to cover every roll, see rolltable
+TABLE_MEDIUM_MOONS = rolltable.register('orbitalobject.TABLE_MEDIUM_MOONS',TABLE_MEDIUM_MOONS,1,20)
+TABLE_MINOR_RINGS  = rolltable.register('orbitalobject.TABLE_MINOR_RINGS',TABLE_MINOR_RINGS,1,20)
+TABLE_SMALL_MOONS  = rolltable.register('orbitalobject.TABLE_SMALL_MOONS',TABLE_SMALL_MOONS,1,20)
+
 # Base orbital object class ----------------------------------------------------
 class BaseOrbitalObject(object):
     __metaclass__ = abc.ABCMeta
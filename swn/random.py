@@ -1,11 +1,44 @@
 #!/usr/bin/env python
 
+import fractions
 import numpy as np
 
+import exception
+
+DICE_STREAM_BLOCK_SIZE  = 4096 # Number of 32-bit words drawn per block
+KEYED_STREAM_BLOCK_SIZE = 64   # Keyed streams are short, draw smaller blocks
+ROLL_TRACE_CAPACITY     = 65536 # Number of rolls kept by a roll trace
 SEED_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
 SEED_ALPHABET_DICT = dict((c, i) for i, c in enumerate(SEED_ALPHABET))
 SEED_MAX = 'ZZZZZ'
 SEED_MAX_CHAR_LEN = 5 # ZZZZZ is under max uint32, ZZZZZZ is above max uint32
+SEED_RANGE_CHUNK_SIZE = 65536 # Number of seeds per chunk of a seed range
+
+## Random number generator
+#
+# Returns the random number generator to draw from. Falls back to the global
+# numpy random state when no generator is given.
+# @param rng Random number generator (numpy RandomState). Default is None.
+def _rng(rng=None):
+    if (rng is None):
+        return(np.random)
+    return(rng)
+
+## Dice distribution
+#
+# Exact distribution of the sum of N number of D dice.
+# @param num Number of dice.
+# @param die Which sided die.
+# @return Dictionary of the number of ways to roll each sum.
+def dice_distribution(num,die):
+    ways = {0: 1}
+    for n in xrange(num):
+        nextWays = dict()
+        for (total, count) in ways.iteritems():
+            for face in xrange(1,die+1):
+                nextWays[total+face] = nextWays.get(total+face,0) + count
+        ways = nextWays
+    return(ways)
 
 ## Dice roll + modifer
 #
@@ -13,16 +46,29 @@ SEED_MAX_CHAR_LEN = 5 # ZZZZZ is under max uint32, ZZZZZZ is above max uint32
 # @param num Number of dice to roll.
 # @param die Which sided die to roll.
 # @param mod Modifier to add to the roll sum result. Default is 0.
-def dice_roll(num,die,mod=0):
-    return(sum(np.random.random_integers(1,die,num))+mod)
+# @param rng Random number generator to roll with. Default is the global state.
+def dice_roll(num,die,mod=0,rng=None):
+    rng = _rng(rng)
+    # Dice streams roll from their buffered words
+    if (isinstance(rng,DiceStream)):
+        return(rng.roll(num,die,mod))
+    return(sum(rng.random_integers(1,die,num))+mod)
+
+## New random number generator
+#
+# Creates a random number generator that is independent of the global numpy
+# random state, so each owner can be seeded and used from its own thread.
+def new_rng():
+    return(np.random.RandomState())
 
 ## Random Seed
 #
 # Randomly selects a seed string and then sets is as the seed.
-def random_seed():
-    randomSeedUInt = np.random.random_integers(0,seed_alphabet_decode(SEED_MAX))
+# @param rng Random number generator to seed. Default is the global state.
+def random_seed(rng=None):
+    randomSeedUInt = _rng(rng).randint(0,SEED_MAX_UINT+1)
     randomSeedString = seed_alphabet_encode(randomSeedUInt)
-    set_seed(randomSeedUInt)
+    set_seed(randomSeedUInt,rng)
     return(randomSeedString)
 
 ## Random seed alphabet decode
@@ -52,7 +98,7 @@ def seed_alphabet_decode(seedString):
 def seed_alphabet_encode(seedUInt):
     if (seedUInt<0):
         raise(InvalidSeedNumberError("Negative number: %i" % seedUInt))
-    if (seedUInt>seed_alphabet_decode(SEED_MAX)):
+    if (seedUInt>SEED_MAX_UINT):
         raise(InvalidSeedNumberError("Seed too large: %i" % seedUInt))
     base=SEED_ALPHABET
     length = len(base)
@@ -61,13 +107,687 @@ def seed_alphabet_encode(seedUInt):
         ret = base[seedUInt % length] + ret
         seedUInt /= length
     return(ret)
-    
+
+SEED_MAX_UINT = seed_alphabet_decode(SEED_MAX)
+
+# Seed alphabet arrays ---------------------------------------------------------
+# Seed strings as fixed width byte arrays, dtype S5. Seeds shorter than the
+# width are padded with trailing nulls, which numpy drops when reading them
+# back, so each item is the same string seed_alphabet_encode returns.
+SEED_DTYPE = np.dtype('S%i' % SEED_MAX_CHAR_LEN)
+
+# Seed alphabet value of each byte, -1 for bytes outside the alphabet
+_SEED_BYTE_VALUE = np.full(256, -1, np.int64)
+_SEED_BYTE_VALUE[np.frombuffer(SEED_ALPHABET, np.uint8)] = np.arange(len(SEED_ALPHABET))
+
+# Seed alphabet as bytes, indexed by value
+_SEED_ALPHABET_BYTES = np.frombuffer(SEED_ALPHABET, np.uint8)
+
+## Random seed alphabet decode array
+#
+# Decodes an array of seeds into unsigned integers. Characters are checked
+# once for the whole array.
+# @param seedArray Seed strings, as a byte array or a sequence of strings.
+def seed_alphabet_decode_array(seedArray):
+    seedArray = np.asarray(seedArray)
+    if (seedArray.dtype.kind != 'S'):
+        raise(exception.InvalidArgType(seedArray.dtype.type(),np.string_))
+    # Check length
+    if (seedArray.dtype.itemsize>SEED_MAX_CHAR_LEN):
+        if (np.any(np.char.str_len(seedArray)>SEED_MAX_CHAR_LEN)):
+            raise(InvalidSeedLengthError("Seed length exceeds max allowed: max %s" % SEED_MAX_CHAR_LEN))
+    seedArray = seedArray.astype(SEED_DTYPE).ravel()
+    # One row of bytes per seed, nulls after the end of shorter seeds
+    seedBytes = seedArray.view(np.uint8).reshape(-1,SEED_MAX_CHAR_LEN)
+    values    = _SEED_BYTE_VALUE[seedBytes]
+    used      = seedBytes != 0
+    # Check for invalid characters
+    invalid = used & (values<0)
+    if (np.any(invalid)):
+        badSeed = seedArray[np.nonzero(invalid.any(axis=1))[0][0]]
+        raise(InvalidSeedCharError("Invalid seed character in %s" % badSeed))
+    # Convert to uInt, one character column at a time
+    ret = np.zeros(len(seedArray),np.int64)
+    for i in xrange(SEED_MAX_CHAR_LEN):
+        column = used[:,i]
+        ret[column] = ret[column]*len(SEED_ALPHABET) + values[column,i]
+    return(ret.astype(np.uint32))
+
+## Random seed alphabet encode array
+#
+# Encodes an array of unsigned integers into the seed alphabet. The range is
+# checked once for the whole array.
+# @param seedUInts Integers to be encoded.
+def seed_alphabet_encode_array(seedUInts):
+    seedUInts = np.asarray(seedUInts).ravel()
+    if (seedUInts.dtype.kind not in 'iu'):
+        raise(exception.InvalidArgType(seedUInts.dtype.type(),np.uint32))
+    if (len(seedUInts) == 0):
+        return(np.zeros(0,SEED_DTYPE))
+    if (seedUInts.min()<0):
+        raise(InvalidSeedNumberError("Negative number: %i" % seedUInts.min()))
+    if (seedUInts.max()>SEED_MAX_UINT):
+        raise(InvalidSeedNumberError("Seed too large: %i" % seedUInts.max()))
+    # Digits, most significant first
+    length = len(SEED_ALPHABET)
+    digits = np.zeros((len(seedUInts),SEED_MAX_CHAR_LEN),np.int64)
+    rest   = seedUInts.astype(np.int64)
+    for i in xrange(SEED_MAX_CHAR_LEN-1,-1,-1):
+        digits[:,i] = rest % length
+        rest //= length
+    # Drop leading zero digits by shifting each row left, as
+    # seed_alphabet_encode does
+    numDigits = np.zeros(len(seedUInts),np.int64)
+    for i in xrange(SEED_MAX_CHAR_LEN):
+        numDigits += seedUInts >= length**i
+    columns = np.arange(SEED_MAX_CHAR_LEN)
+    source  = columns + (SEED_MAX_CHAR_LEN - numDigits)[:,None]
+    used    = columns < numDigits[:,None]
+    source[~used] = 0
+    seedBytes = _SEED_ALPHABET_BYTES[digits[np.arange(len(seedUInts))[:,None],source]]
+    seedBytes[~used] = 0
+    return(seedBytes.view(SEED_DTYPE).ravel())
+
+## Random seed range
+#
+# Generator yielding the seeds in a range as encoded byte arrays, a chunk at a
+# time.
+# @param start     First seed number. Default is 0.
+# @param stop      Seed number to stop before. Default is past SEED_MAX.
+# @param chunkSize Number of seeds per chunk. Default is SEED_RANGE_CHUNK_SIZE.
+def seed_range(start=None, stop=None, chunkSize=None):
+    # Check arguments
+    start     = exception.arg_check(start,int,0)
+    stop      = exception.arg_check(stop,int,SEED_MAX_UINT+1)
+    chunkSize = exception.arg_check(chunkSize,int,SEED_RANGE_CHUNK_SIZE)
+    exception.arg_range_check(start,0,SEED_MAX_UINT+1)
+    exception.arg_range_check(stop,start,SEED_MAX_UINT+1)
+    exception.arg_range_check(chunkSize,1)
+    for chunkStart in xrange(start,stop,chunkSize):
+        chunkStop = min(chunkStart+chunkSize,stop)
+        yield(seed_alphabet_encode_array(np.arange(chunkStart,chunkStop,dtype=np.uint32)))
+
 ## Set random number generator seed
 #
 # Set the seed for the numpy random number generator.
 # @param seedInt
-def set_seed(seedInt):
-    np.random.seed(seedInt)
+# @param rng Random number generator to seed. Default is the global state.
+def set_seed(seedInt,rng=None):
+    _rng(rng).seed(seedInt)
+
+# Dice stream class ------------------------------------------------------------
+## Dice stream class.
+#
+# Buffered source of dice rolls. Raw 32-bit words are drawn from a numpy 
+# RandomState a block at a time and turned into rolls in plain Python, which
+# avoids the numpy call overhead of rolling one or two dice at a time. Every
+# draw consumes words exactly the way the matching RandomState method does, so
+# a seeded stream gives the same results as the RandomState calls it replaces.
+class DiceStream(object):
+    ## Dice stream constructor.
+    #  @param self      The object pointer.
+    #  @param rng       RandomState to draw words from. Default is a new one.
+    #  @param blockSize Number of words to draw at a time.
+    def __init__(self, rng=None, blockSize=None):
+        self._rng       = exception.arg_check(rng,       np.random.RandomState, None)
+        self._blockSize = exception.arg_check(blockSize, int,                   DICE_STREAM_BLOCK_SIZE)
+        if (self._rng is None):
+            self._rng = new_rng()
+        # Masks for rejection sampling, keyed by the largest allowed value
+        self._masks = dict()
+        # Buffered words
+        self._block = list()
+        self._index = 0
+
+    ## Mask covering all bits of a value.
+    def _mask(self, high):
+        try:
+            return(self._masks[high])
+        except KeyError:
+            mask = (1 << high.bit_length()) - 1
+            self._masks[high] = mask
+            return(mask)
+
+    ## Draw more words.
+    def _refill(self):
+        self._block = self._rng.randint(0, 1 << 32, self._blockSize, np.uint32).astype(np.int64).tolist()
+        self._index = 0
+
+    ## Next 32-bit word.
+    def _word(self):
+        if (self._index == len(self._block)):
+            self._refill()
+        word = self._block[self._index]
+        self._index += 1
+        return(word)
+
+    ## Uniform integer in [0,high].
+    #
+    #  Masked rejection sampling, as used by numpy for bounded integers.
+    #  @param high Largest value to return.
+    def _interval(self, high):
+        # A single possible value consumes no words
+        if (high == 0):
+            return(0)
+        mask = self._mask(high)
+        # 32-bit values
+        if (high <= 0xffffffff):
+            value = self._word() & mask
+            while (value > high):
+                value = self._word() & mask
+        # 64-bit values from two words, upper half first
+        else:
+            value = ((self._word() << 32) | self._word()) & mask
+            while (value > high):
+                value = ((self._word() << 32) | self._word()) & mask
+            # Back to a plain int, as numpy returns
+            value = int(value)
+        return(value)
+
+    ## Choose a random item of a sequence.
+    #  Same as RandomState.choice for a sequence without probabilities.
+    def choice(self, seq):
+        return(seq[self._interval(len(seq)-1)])
+
+    ## Random integer in [low,high).
+    #  Same as RandomState.randint for a single integer.
+    def randint(self, low, high):
+        return(low + self._interval(high-low-1))
+
+    ## Random float in [0,1).
+    #  Same as RandomState.random_sample for a single float.
+    def random_sample(self):
+        a = self._word() >> 5
+        b = self._word() >> 6
+        return((a*67108864.0+b)/9007199254740992.0)
+
+    ## Roll N number of D dice, adding M as a modifier to the result.
+    #  Same as the sum of RandomState.random_integers(1,D,N) plus M.
+    #  @param num Number of dice to roll.
+    #  @param die Which sided die to roll.
+    #  @param mod Modifier to add to the roll sum result. Default is 0.
+    def roll(self, num, die, mod=0):
+        total = num + mod
+        high  = die - 1
+        if (high == 0):
+            return(total)
+        mask = self._mask(high)
+        for n in xrange(num):
+            value = self._word() & mask
+            while (value > high):
+                value = self._word() & mask
+            total += value
+        return(total)
+
+    ## Seed the stream.
+    #  Buffered words are dropped so the next draw starts at the new seed.
+    def seed(self, seedInt):
+        self._rng.seed(seedInt)
+        self._block = list()
+        self._index = 0
+
+    ## Shuffle a list in place.
+    #
+    #  Same as RandomState.shuffle for a list. Draws are inlined, as shuffles
+    #  of large lists take a draw per item.
+    def shuffle(self, x):
+        block = self._block
+        index = self._index
+        for i in reversed(xrange(1,len(x))):
+            mask = (1 << i.bit_length()) - 1
+            while (True):
+                if (index == len(block)):
+                    self._refill()
+                    block = self._block
+                    index = 0
+                j = block[index] & mask
+                index += 1
+                if (j <= i):
+                    break
+            x[i], x[j] = x[j], x[i]
+        self._index = index
+
+# Keyed streams ----------------------------------------------------------------
+# Weyl sequence increment for counter based streams (splitmix64)
+_GOLDEN_GAMMA = np.uint64(0x9e3779b97f4a7c15)
+
+## 64-bit mix.
+#
+# Splitmix64 finalizer. Scrambles each value of a uint64 array.
+# @param x Array of uint64 values.
+def _mix64(x):
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return(x ^ (x >> np.uint64(31)))
+
+## Keyed words.
+#
+# Counter based random words: word i of a stream is a mix of the stream key
+# and i, so any word of any stream can be computed without drawing the words
+# before it.
+# @param key     Stream key, or array of stream keys.
+# @param counter First counter.
+# @param count   Number of 64-bit counters.
+# @return Array of words, indexed [key, word] for an array of keys.
+def keyed_words(key, counter, count):
+    counters = np.arange(counter, counter+count, dtype=np.uint64) + np.uint64(1)
+    words64  = _mix64(np.asarray(key, dtype=np.uint64)[...,None] + counters*_GOLDEN_GAMMA)
+    # Split into 32-bit words, upper half first
+    words = np.empty(words64.shape[:-1]+(2*count,), dtype=np.int64)
+    words[...,0::2] = words64 >> np.uint64(32)
+    words[...,1::2] = words64 & np.uint64(0xffffffff)
+    return(words)
+
+## Substream keys.
+#
+# Derives stream keys from paths of non-negative integers, e.g. seed, stage,
+# hex row, hex column, and world index. Each path gives an independent stream.
+# Path items can be integers or arrays of integers, giving an array of keys.
+# @param path Integers or arrays of integers identifying the streams.
+# @return Array of uint64 keys.
+def substream_keys(*path):
+    key = np.zeros(1, dtype=np.uint64)
+    for p in path:
+        key = _mix64((key + _GOLDEN_GAMMA) ^ np.asarray(p, dtype=np.uint64))
+    return(key)
+
+## Substream key.
+#
+# Derives a stream key from a path of non-negative integers, see 
+# substream_keys.
+# @param path Integers identifying the stream.
+def substream_key(*path):
+    return(int(substream_keys(*path)[0]))
+
+## Keyed stream class.
+#
+# Dice stream drawing its words from a counter based keyed stream instead of a
+# RandomState. Streams with different keys don't share any state, so they can 
+# be rolled in any order, or in different processes, with the same results.
+class KeyedStream(DiceStream):
+    ## Keyed stream constructor.
+    #  @param self      The object pointer.
+    #  @param key       Stream key, see substream_key.
+    #  @param blockSize Number of words to draw at a time.
+    def __init__(self, key, blockSize=None):
+        self._blockSize = exception.arg_check(blockSize, int, KEYED_STREAM_BLOCK_SIZE)
+        self._masks     = dict()
+        self.seed(key)
+
+    ## Draw more words.
+    def _refill(self):
+        self._block    = keyed_words(self._key, self._counter, self._blockSize/2).tolist()
+        self._index    = 0
+        self._counter += self._blockSize/2
+
+    ## Seed the stream with a new key.
+    def seed(self, key):
+        self._key     = key
+        self._counter = 0
+        self._block   = list()
+        self._index   = 0
+
+## Keyed stream batch class.
+#
+# Many keyed streams drawn from in lockstep with numpy arrays. Each draw takes
+# one value from every stream, and every stream gives exactly the values its
+# own KeyedStream would, consuming words the same way.
+class KeyedStreamBatch(object):
+    ## Keyed stream batch constructor.
+    #  @param self      The object pointer.
+    #  @param keys      Array of stream keys, see substream_keys.
+    #  @param blockSize Number of words per stream to draw at a time.
+    def __init__(self, keys, blockSize=None):
+        self._blockSize = exception.arg_check(blockSize, int, KEYED_STREAM_BLOCK_SIZE)
+        self._keys      = np.asarray(keys, dtype=np.uint64)
+        self._words     = np.empty((len(self._keys),0), dtype=np.uint64)
+        self._counter   = 0
+        # Next word of each stream
+        self._index     = np.zeros(len(self._keys), dtype=np.int64)
+
+    def __len__(self):
+        return(len(self._keys))
+
+    ## Draw more words for every stream.
+    def _refill(self):
+        words = keyed_words(self._keys, self._counter, self._blockSize/2).astype(np.uint64)
+        self._words    = np.hstack((self._words, words.reshape(len(self._keys),-1)))
+        self._counter += self._blockSize/2
+
+    ## Next word of some of the streams.
+    #  @param streams Array of stream indices.
+    def _next_words(self, streams):
+        index = self._index[streams]
+        while ((len(index) > 0) and (index.max() >= self._words.shape[1])):
+            self._refill()
+        self._index[streams] += 1
+        return(self._words[streams,index])
+
+    ## Indices of selected streams.
+    def _streams(self, select):
+        if (select is None):
+            return(np.arange(len(self._keys)))
+        return(np.nonzero(select)[0])
+
+    ## Uniform integers in [0,high].
+    #
+    #  Masked rejection sampling, see DiceStream._interval. Streams that
+    #  reject draw again, the rest wait.
+    #  @param high   Largest value to return, for every stream or each stream.
+    #  @param select Boolean array of the streams to draw from. Default is
+    #                every stream. Other streams get 0 and draw nothing.
+    def _interval(self, high, select=None):
+        high   = np.broadcast_to(np.asarray(high, dtype=np.uint64), self._keys.shape)
+        values = np.zeros(len(self._keys), dtype=np.uint64)
+        # Mask covering all bits of each value
+        mask = high.copy()
+        for shift in (1, 2, 4, 8, 16, 32):
+            mask |= mask >> np.uint64(shift)
+        # A single possible value draws no words
+        pending = self._streams(select)
+        pending = pending[high[pending] > 0]
+        while (len(pending) > 0):
+            value = self._next_words(pending)
+            # 64-bit values from two words, upper half first
+            wide = high[pending] > np.uint64(0xffffffff)
+            if (wide.any()):
+                value[wide] = (value[wide] << np.uint64(32)) | self._next_words(pending[wide])
+            value &= mask[pending]
+            accept = value <= high[pending]
+            values[pending[accept]] = value[accept]
+            pending = pending[~accept]
+        return(values.astype(np.int64))
+
+    ## Random integers in [low,high).
+    #  @param low    Lowest value, for every stream or each stream.
+    #  @param high   One past the highest value, for every stream or each 
+    #                stream.
+    #  @param select Boolean array of the streams to draw from. Default is
+    #                every stream.
+    #  @return Array of one value per stream.
+    def randint(self, low, high, select=None):
+        low = np.asarray(low, dtype=np.int64)
+        return(low + self._interval(np.asarray(high, dtype=np.int64) - low - 1, select))
+
+    ## Random floats in [0,1).
+    #  Same as DiceStream.random_sample for each stream.
+    #  @param select Boolean array of the streams to draw from. Default is
+    #                every stream. Other streams get 0.
+    def random_sample(self, select=None):
+        streams = self._streams(select)
+        a = self._next_words(streams) >> np.uint64(5)
+        b = self._next_words(streams) >> np.uint64(6)
+        values = np.zeros(len(self._keys))
+        values[streams] = (a*67108864.0+b)/9007199254740992.0
+        return(values)
+
+    ## Single stream of the batch.
+    #
+    #  Keyed stream continuing from the next word of one of the streams, to
+    #  keep drawing from it on its own.
+    #  @param index Index of the stream in the batch.
+    def stream(self, index):
+        rng = KeyedStream(int(self._keys[index]))
+        # Start with the words already drawn for the stream
+        rng._block   = self._words[index,self._index[index]:].astype(np.int64).tolist()
+        rng._counter = self._counter
+        return(rng)
+
+# Alias samplers ---------------------------------------------------------------
+## Alias sampler class.
+#
+# Samples from a discrete distribution with integer weights using one random
+# integer per sample (Walker's alias method). Weights are kept as integers so
+# each outcome has exactly the probability of its weight, e.g. a table rolled
+# on 2d6 samples each entry exactly as often as rolling 2d6 would.
+class AliasSampler(object):
+    ## Alias sampler constructor.
+    #  @param self    The object pointer.
+    #  @param weights Dictionary of positive integer weights keyed by outcome.
+    def __init__(self, weights):
+        weights = exception.arg_check(weights, dict)
+        if (len(weights) == 0):
+            raise(exception.OutsideArgRange(0,1,None))
+        self.outcomes = sorted(weights.keys())
+        scale = reduce(fractions.gcd, weights.values())
+        # Each column holds the same total weight, split between its own
+        # outcome and an alias
+        columnWeight = sum(weights.values())/scale
+        numColumns   = len(self.outcomes)
+        weightLeft   = [weights[o]/scale*numColumns for o in self.outcomes]
+        self._threshold = [columnWeight]*numColumns
+        self._alias     = range(numColumns)
+        small = [i for i in xrange(numColumns) if weightLeft[i] <  columnWeight]
+        large = [i for i in xrange(numColumns) if weightLeft[i] >= columnWeight]
+        while (small and large):
+            s = small.pop()
+            l = large.pop()
+            self._threshold[s] = weightLeft[s]
+            self._alias[s]     = l
+            weightLeft[l]     -= columnWeight - weightLeft[s]
+            if (weightLeft[l] < columnWeight):
+                small.append(l)
+            else:
+                large.append(l)
+        self._columnWeight = columnWeight
+        self._size         = columnWeight*numColumns
+        # Array copies for sampling batches
+        self._thresholdArray = np.array(self._threshold, dtype=np.int64)
+        self._aliasArray     = np.array(self._alias,     dtype=np.int64)
+
+    ## Sample an outcome from every stream of a batch.
+    #  @param self  The object pointer.
+    #  @param batch Keyed stream batch, see KeyedStreamBatch.
+    #  @return Array of indices into outcomes, one per stream.
+    def sample_batch(self, batch):
+        (column, weight) = np.divmod(batch.randint(0, self._size), self._columnWeight)
+        return(np.where(weight < self._thresholdArray[column], column, self._aliasArray[column]))
+
+    ## Sample an outcome.
+    #  @param rng Random number generator to draw from. Default is the global state.
+    def sample(self, rng=None):
+        (column, weight) = divmod(_rng(rng).randint(0, self._size), self._columnWeight)
+        if (weight < self._threshold[column]):
+            return(self.outcomes[column])
+        return(self.outcomes[self._alias[column]])
+
+## Table sampler
+#
+# Alias sampler for the entries of a table rolled with N number of D dice.
+# Entries are weighted by the number of ways to roll them.
+# @param table Table dictionary keyed by roll. Entries must be hashable.
+# @param num   Number of dice rolled.
+# @param die   Which sided die rolled.
+def table_sampler(table, num, die):
+    weights = dict()
+    for (roll, count) in dice_distribution(num,die).iteritems():
+        weights[table[roll]] = weights.get(table[roll],0) + count
+    return(AliasSampler(weights))
+
+# Roll traces ------------------------------------------------------------------
+# One traced roll: generation stage, number of sides, and value rolled
+ROLL_TRACE_DTYPE = np.dtype([('stage', np.uint8),
+                             ('die',   np.uint64),
+                             ('value', np.uint64)])
+
+## Roll trace class.
+#
+# Ring buffer of the rolls made through traced streams. Every integer draw is
+# recorded as a die roll: dice are recorded one die at a time, and choices,
+# random integers, and shuffle swaps are recorded as a roll of a die with one
+# side per possible result. Random floats are recorded as a roll of a 0 sided
+# die with the float's 53-bit integer value. Once full, the oldest rolls are 
+# overwritten.
+class RollTrace(object):
+    ## Roll trace constructor.
+    #  @param self     The object pointer.
+    #  @param capacity Number of rolls to keep.
+    def __init__(self, capacity=None):
+        capacity = exception.arg_check(capacity, int, ROLL_TRACE_CAPACITY)
+        exception.arg_range_check(capacity, 1)
+        self._entries = np.zeros(capacity, ROLL_TRACE_DTYPE)
+        # Total number of rolls recorded, including overwritten ones
+        self.count = 0
+
+    ## Number of rolls kept.
+    def __len__(self):
+        return(min(self.count, len(self._entries)))
+
+    ## Record a roll.
+    def add(self, stage, die, value):
+        self._entries[self.count % len(self._entries)] = (stage, die, value)
+        self.count += 1
+
+    ## Rolls kept, oldest first.
+    def entries(self):
+        if (self.count <= len(self._entries)):
+            return(self._entries[:self.count].copy())
+        start = self.count % len(self._entries)
+        return(np.concatenate((self._entries[start:], self._entries[:start])))
+
+    ## True if the oldest rolls have been overwritten.
+    def overflowed(self):
+        return(self.count > len(self._entries))
+
+    ## Clear the trace.
+    def reset(self):
+        self.count = 0
+
+    ## Save the rolls kept to a binary file.
+    #  @param fName File name.
+    def save(self, fName):
+        self.entries().tofile(fName)
+
+    ## Traced stream.
+    #  @param source Stream to draw from.
+    #  @param stage  Generation stage of the stream.
+    def stream(self, source, stage):
+        return(TraceStream(source, self, stage))
+
+## Load roll trace.
+#
+# Loads a roll trace saved with RollTrace.save.
+# @param fName File name.
+def load_roll_trace(fName):
+    entries = np.fromfile(fName, ROLL_TRACE_DTYPE)
+    trace   = RollTrace(max(len(entries), 1))
+    trace._entries[:len(entries)] = entries
+    trace.count = len(entries)
+    return(trace)
+
+## Roll replay class.
+#
+# Feeds the rolls of a trace back in the order they were recorded, instead of
+# drawing new ones. Each roll is checked against the stage and die of the 
+# recorded roll, so a replay that diverges from the trace fails at the first
+# roll that differs. Recorded values can be edited before replaying to test
+# a particular outcome.
+class RollReplay(object):
+    ## Roll replay constructor.
+    #  @param self  The object pointer.
+    #  @param trace Roll trace to replay. It must not have overflowed.
+    def __init__(self, trace):
+        trace = exception.arg_check(trace, RollTrace)
+        if (trace.overflowed()):
+            raise(ReplayMismatchError("Trace overflowed, oldest %i rolls lost" % (trace.count-len(trace))))
+        self._entries = trace.entries().astype([('stage',np.int64),('die',np.int64),('value',np.int64)]).tolist()
+        self.index    = 0
+
+    ## Next recorded roll.
+    #  @param stage Generation stage of the roll.
+    #  @param die   Number of sides of the roll.
+    def next(self, stage, die):
+        if (self.index == len(self._entries)):
+            raise(ReplayMismatchError("Replay ran past the %i recorded rolls" % len(self._entries)))
+        (recordedStage, recordedDie, value) = self._entries[self.index]
+        if ((recordedStage != stage) or (recordedDie != die)):
+            raise(ReplayMismatchError("Roll %i is stage %i d%i, recorded stage %i d%i" % (self.index,stage,die,recordedStage,recordedDie)))
+        self.index += 1
+        return(value)
+
+    ## Rewind to the first roll.
+    def reset(self):
+        self.index = 0
+
+    ## Replay stream.
+    #  @param source Stream that would be drawn from. Unused.
+    #  @param stage  Generation stage of the stream.
+    def stream(self, source, stage):
+        return(ReplayStream(self, stage))
+
+## Trace stream class.
+#
+# Dice stream drawing from another stream and recording each roll in a trace.
+# Draws consume the source words exactly as they would untraced.
+class TraceStream(DiceStream):
+    ## Trace stream constructor.
+    #  @param self   The object pointer.
+    #  @param source Stream to draw from.
+    #  @param trace  Roll trace to record to.
+    #  @param stage  Generation stage to record rolls as.
+    def __init__(self, source, trace, stage):
+        self._source = source
+        self._trace  = trace
+        self._stage  = stage
+
+    ## Uniform integer in [0,high], recorded as a roll of a high+1 sided die.
+    def _interval(self, high):
+        value = self._source._interval(high)
+        self._trace.add(self._stage, high+1, value+1)
+        return(value)
+
+    ## Next 32-bit word from the source. Not recorded.
+    def _word(self):
+        return(self._source._word())
+
+    ## Random float in [0,1), recorded as a roll of a 0 sided die.
+    def random_sample(self):
+        value = (self._word() >> 5)*67108864 + (self._word() >> 6)
+        self._trace.add(self._stage, 0, value)
+        return(value/9007199254740992.0)
+
+    ## Roll N number of D dice one die at a time, adding M as a modifier.
+    def roll(self, num, die, mod=0):
+        total = num + mod
+        for n in xrange(num):
+            total += self._interval(die-1)
+        return(total)
+
+    ## Shuffle a list in place one recorded draw at a time.
+    def shuffle(self, x):
+        for i in reversed(xrange(1,len(x))):
+            j = self._interval(i)
+            x[i], x[j] = x[j], x[i]
+
+    def seed(self, seedInt):
+        self._source.seed(seedInt)
+
+## Replay stream class.
+#
+# Dice stream returning the rolls of a replay.
+class ReplayStream(TraceStream):
+    ## Replay stream constructor.
+    #  @param self   The object pointer.
+    #  @param replay Roll replay to draw from.
+    #  @param stage  Generation stage of the stream.
+    def __init__(self, replay, stage):
+        self._replay = replay
+        self._stage  = stage
+
+    ## Recorded integer in [0,high].
+    def _interval(self, high):
+        return(self._replay.next(self._stage, high+1)-1)
+
+    ## Recorded float in [0,1).
+    def random_sample(self):
+        return(self._replay.next(self._stage, 0)/9007199254740992.0)
+
+    ## Words aren't recorded, so can't be replayed.
+    def _word(self):
+        raise(ReplayMismatchError("Raw words can't be replayed"))
+
+    def seed(self, seedInt):
+        pass
 
 ## Invalid seed character exception class.
 class InvalidSeedCharError(Exception):
@@ -79,4 +799,8 @@ class InvalidSeedLengthError(Exception):
 
 ## Invalid seed number exception class.
 class InvalidSeedNumberError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+## Replay mismatch exception class.
+class ReplayMismatchError(Exception):
+    pass
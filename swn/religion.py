@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 
+import rolltable
+
 # Tables -----------------------------------------------------------------------
 TABLE_EVOLUTION = {
     1: 'New holy book',
@@ -36,6 +38,12 @@ TABLE_ORIGIN_TRADITION = {
     12: 'Ideology',
 }
 
+# Roll tables ------------------------------------------------------------------
+# Tables compiled into arrays and checked to cover every roll, see rolltable
+TABLE_EVOLUTION        = rolltable.register('religion.TABLE_EVOLUTION',TABLE_EVOLUTION,1,8)
+TABLE_LEADERSHIP       = rolltable.register('religion.TABLE_LEADERSHIP',TABLE_LEADERSHIP,1,6)
+TABLE_ORIGIN_TRADITION = rolltable.register('religion.TABLE_ORIGIN_TRADITION',TABLE_ORIGIN_TRADITION,1,12)
+
 # Religion class ---------------------------------------------------------------
 class Religion(object):
     def __init__(self,
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+import exception
+
+# Roll tables registered so far, keyed by name
+TABLES = dict()
+
+# Roll table class -------------------------------------------------------------
+## Roll table class.
+#
+# Table of entries keyed by roll, compiled into numpy arrays. It is still a
+# dictionary, so a single roll is looked up as table[roll], and arrays of
+# rolls are looked up at once with lookup. The table is read only, so the
+# dictionary and arrays always hold the same entries.
+#
+# Entries are also numbered as categories, in order of their first roll, so
+# rolls can be kept as small integer codes and turned back into entries.
+class RollTable(dict):
+    ## Roll table constructor.
+    #
+    #  Every roll from low to high must have an entry, so lookups of possible
+    #  rolls can't fail part way through.
+    #  @param self    The object pointer.
+    #  @param name    Table name, e.g. 'world.TABLE_ATMOSPHERE'.
+    #  @param entries Dictionary of entries keyed by roll.
+    #  @param low     Lowest possible roll.
+    #  @param high    Highest possible roll.
+    def __init__(self, name, entries, low, high):
+        dict.__init__(self, exception.arg_check(entries, dict))
+        self.name = exception.arg_check(name, str)
+        self.low  = exception.arg_check(low,  int)
+        self.high = exception.arg_check(high, int)
+        exception.arg_range_check(high, low)
+        # Check every possible roll has an entry
+        missing = [r for r in xrange(low, high+1) if r not in entries]
+        if (len(missing) > 0):
+            raise MissingRollError(name, missing)
+        # Categories and the code of each roll, indexed by roll-low
+        self.categories = list()
+        codes = list()
+        for r in xrange(low, high+1):
+            if (entries[r] not in self.categories):
+                self.categories.append(entries[r])
+            codes.append(self.categories.index(entries[r]))
+        self.codes = np.array(codes, dtype=np.int64)
+        # Entries indexed by roll-low, as valueArray so dict.values still
+        # works. Numbers stay numbers.
+        if (all(isinstance(c, bool) for c in self.categories)):
+            categories = np.array(self.categories, dtype=bool)
+        elif (all(isinstance(c, (int, bool)) for c in self.categories)):
+            categories = np.array(self.categories, dtype=np.int64)
+        else:
+            categories = np.empty(len(self.categories), dtype=object)
+            for (c, category) in enumerate(self.categories):
+                categories[c] = category
+        self.valueArray = categories[self.codes]
+
+    ## Pickle as the entries and roll range.
+    def __reduce__(self):
+        return(RollTable, (self.name, dict(self), self.low, self.high))
+
+    ## Tables are read only.
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('Roll table {0} is read only.'.format(self.name))
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear       = _read_only
+    pop         = _read_only
+    popitem     = _read_only
+    setdefault  = _read_only
+    update      = _read_only
+
+    ## Check rolls are possible rolls.
+    def _check_rolls(self, rolls):
+        rolls = np.asarray(rolls, dtype=np.int64)
+        if ((rolls.size > 0) and ((rolls.min() < self.low) or (rolls.max() > self.high))):
+            badRoll = rolls.min() if (rolls.min() < self.low) else rolls.max()
+            raise exception.OutsideArgRange(badRoll, self.low, self.high)
+        return(rolls)
+
+    ## Codes of rolls.
+    #  @param rolls Roll or array of rolls.
+    #  @return Array of category codes, see categories.
+    def code(self, rolls):
+        return(self.codes[self._check_rolls(rolls) - self.low])
+
+    ## Look up rolls.
+    #
+    #  Rolls are checked before any are looked up.
+    #  @param rolls Roll or array of rolls.
+    #  @return Array of entries, integers for tables of numbers.
+    def lookup(self, rolls):
+        return(self.valueArray[self._check_rolls(rolls) - self.low])
+
+# Functions --------------------------------------------------------------------
+## Register a roll table.
+#
+# Compiles the table and adds it to TABLES.
+# @param name    Table name, e.g. 'world.TABLE_ATMOSPHERE'.
+# @param entries Dictionary of entries keyed by roll.
+# @param low     Lowest possible roll.
+# @param high    Highest possible roll.
+# @return Compiled table.
+def register(name, entries, low, high):
+    if (name in TABLES):
+        raise exception.ExistingDictKey(name)
+    TABLES[name] = RollTable(name, entries, low, high)
+    return(TABLES[name])
+
+# Exceptions -------------------------------------------------------------------
+class MissingRollError(Exception):
+    def __init__(self,name,rolls):
+        eStringTemplate = 'Table {0} has no entries for rolls {1}.'
+        self.eString = eStringTemplate.format(name,rolls)
+        Exception.__init__(self,self.eString)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+
+from __future__ import print_function
+
+import json
+import multiprocessing as mp
+import os
+import numpy as np
+import time
+
+import exception
+import generator
+import random
+
+SCAN_CHUNK_SIZE          = 1000 # Seeds per task sent to a worker
+SCAN_CHECKPOINT_INTERVAL = 10.  # Seconds between checkpoint writes
+
+# Workers ----------------------------------------------------------------------
+# Each worker process keeps one generator and the predicate for the whole scan
+_workerGenerator      = None
+_workerPredicate      = None
+_workerGroupingMethod = None
+
+## Initialize scan worker.
+#  @param predicate      Predicate called with each generated sector.
+#  @param groupingMethod Grouping method to generate sectors with.
+#  @param version        Generation version to generate sectors with.
+def _init_worker(predicate, groupingMethod, version):
+    global _workerGenerator, _workerPredicate, _workerGroupingMethod
+    _workerGenerator      = generator.Generator(version)
+    _workerPredicate      = predicate
+    _workerGroupingMethod = groupingMethod
+
+## Scan a chunk of seeds.
+#
+#  Sectors are only generated up to the predicate's stage, if it has one.
+#  @param chunk (start, stop) range of seed numbers.
+def _scan_chunk(chunk):
+    lastStage = getattr(_workerPredicate, 'stage', None)
+    matches   = list()
+    failures  = 0
+    start     = time.time()
+    for seedString in random.seed_alphabet_encode_array(np.arange(chunk[0], chunk[1])).tolist():
+        _workerGenerator.set_seed(seedString)
+        try:
+            newSector = _workerGenerator.sector(_workerGroupingMethod, lastStage)
+        except exception.MaxLoopIterationsExceed:
+            # Seed can't generate a sector, so it can't match
+            failures += 1
+            continue
+        if (_workerPredicate(newSector)):
+            matches.append(seedString)
+    return(chunk, matches, failures, os.getpid(), time.time()-start)
+
+# Seed scanner class -----------------------------------------------------------
+## Seed scanner class.
+#
+#  Searches the seed space for sectors that match a predicate. Seed ranges are
+#  split into chunks that are generated in a process pool, matching seeds are
+#  streamed back as chunks finish, and progress can be checkpointed to disk so
+#  long scans can be resumed.
+#
+#  The predicate is called with each generated sector and returns True for a
+#  match. It must be picklable, e.g. a module level function. If it has a
+#  stage attribute (see generator.STAGE_*), sectors are only generated up to
+#  that stage, e.g. a predicate that only looks at worlds skips ORSS.
+class SeedScanner(object):
+    ## Seed scanner constructor.
+    #  @param self           The object pointer.
+    #  @param predicate      Predicate called with each generated sector.
+    #  @param groupingMethod Grouping method to generate sectors with.
+    #  @param version        Generation version to generate sectors with.
+    #  @param workers        Number of worker processes. Default is CPU count.
+    #  @param chunkSize      Number of seeds per worker task.
+    #  @param checkpoint     Checkpoint file path. Default is no checkpoint.
+    def __init__(self,
+                 predicate,
+                 groupingMethod = None,
+                 version        = None,
+                 workers        = None,
+                 chunkSize      = None,
+                 checkpoint     = None):
+        # Check arguments
+        if (not callable(predicate)):
+            raise exception.InvalidArgType(predicate, type(_scan_chunk))
+        self.predicate      = predicate
+        self.groupingMethod = exception.arg_check(groupingMethod, int, generator.GROUPING_METHOD)
+        self.version        = exception.arg_check(version,        int, generator.GENERATOR_VERSION)
+        self.workers        = exception.arg_check(workers,        int, mp.cpu_count())
+        self.chunkSize      = exception.arg_check(chunkSize,      int, SCAN_CHUNK_SIZE)
+        self.checkpoint     = exception.arg_check(checkpoint,     str, None)
+        exception.arg_range_check(self.workers,   1)
+        exception.arg_range_check(self.chunkSize, 1)
+        # Matching seeds found so far, including ones from a resumed checkpoint
+        self.matches = list()
+        # Per worker statistics, keyed by process id: [seeds, seconds]
+        self.workerStats = dict()
+        # Seeds that couldn't generate a sector
+        self.failures = 0
+
+    ## Load checkpoint.
+    #
+    #  Returns the completed chunk indices of a previous run of the same scan.
+    def _load_checkpoint(self, start, stop):
+        if ((self.checkpoint is None) or (not os.path.exists(self.checkpoint))):
+            return(0, set())
+        with open(self.checkpoint, 'r') as f:
+            state = json.load(f)
+        # Only resume the same scan
+        if ((state['start']     != start) or
+            (state['stop']      != stop) or
+            (state['chunkSize'] != self.chunkSize) or
+            (state['version']   != self.version) or
+            (state['groupingMethod'] != self.groupingMethod)):
+            raise CheckpointMismatchError(self.checkpoint)
+        self.matches  = [str(m) for m in state['matches']]
+        self.failures = state['failures']
+        return(state['doneBelow'], set(state['done']))
+
+    ## Save checkpoint.
+    #
+    #  Completed chunks are saved as every chunk below doneBelow, plus the set
+    #  of chunks done out of order above it. The file is replaced atomically.
+    def _save_checkpoint(self, start, stop, doneBelow, done):
+        if (self.checkpoint is None):
+            return
+        state = {'start':          start,
+                 'stop':           stop,
+                 'chunkSize':      self.chunkSize,
+                 'version':        self.version,
+                 'groupingMethod': self.groupingMethod,
+                 'doneBelow':      doneBelow,
+                 'done':           sorted(done),
+                 'matches':        self.matches,
+                 'failures':       self.failures}
+        tmpPath = self.checkpoint + '.tmp'
+        with open(tmpPath, 'w') as f:
+            json.dump(state, f)
+        os.rename(tmpPath, self.checkpoint)
+
+    ## Scan a range of seeds.
+    #
+    #  Generator yielding matching seed strings as worker chunks finish, in
+    #  completion order. Resumes from the checkpoint file if one exists.
+    #  @param self       The object pointer.
+    #  @param start      First seed number. Default is 0.
+    #  @param stop       Seed number to stop before. Default is past SEED_MAX.
+    #  @param maxMatches Stop after this many matches. Default is no limit.
+    def scan(self, start=None, stop=None, maxMatches=None):
+        # Check arguments
+        seedMax    = random.SEED_MAX_UINT
+        start      = exception.arg_check(start,      int, 0)
+        stop       = exception.arg_check(stop,       int, seedMax+1)
+        maxMatches = exception.arg_check(maxMatches, int, None)
+        exception.arg_range_check(start, 0,     seedMax)
+        exception.arg_range_check(stop,  start, seedMax+1)
+        # Resume
+        (doneBelow, done) = self._load_checkpoint(start, stop)
+        numChunks = (stop - start + self.chunkSize - 1) / self.chunkSize
+        # Chunks are created lazily, the pool only reads ahead as it has room
+        def chunks():
+            for c in xrange(doneBelow, numChunks):
+                if (c not in done):
+                    chunkStart = start + c*self.chunkSize
+                    yield((chunkStart, min(chunkStart+self.chunkSize, stop)))
+        # Already have enough matches
+        if ((maxMatches is not None) and (len(self.matches) >= maxMatches)):
+            return
+        pool = mp.Pool(self.workers,
+                       _init_worker,
+                       (self.predicate, self.groupingMethod, self.version))
+        try:
+            lastSave = time.time()
+            # Matches of a chunk rescanned after stopping part way through it
+            # were already yielded
+            found = set(self.matches)
+            for (chunk, matches, failures, pid, seconds) in pool.imap_unordered(_scan_chunk, chunks()):
+                # Worker statistics
+                stats = self.workerStats.setdefault(pid, [0, 0.])
+                stats[0] += chunk[1] - chunk[0]
+                stats[1] += seconds
+                # Stream matches
+                stopScan = False
+                newMatches = [m for m in matches if (m not in found)]
+                for (i, m) in enumerate(newMatches):
+                    self.matches.append(m)
+                    found.add(m)
+                    yield(m)
+                    if ((maxMatches is not None) and (len(self.matches) >= maxMatches)):
+                        stopScan = True
+                        break
+                # Mark chunk done once all of its matches are yielded, moving 
+                # the watermark past finished chunks. Chunks stopped part way 
+                # through are scanned again on resume.
+                if ((not stopScan) or (i == len(newMatches)-1)):
+                    self.failures += failures
+                    done.add((chunk[0] - start) / self.chunkSize)
+                    while (doneBelow in done):
+                        done.remove(doneBelow)
+                        doneBelow += 1
+                # Checkpoint
+                if (stopScan or (time.time() - lastSave > SCAN_CHECKPOINT_INTERVAL)):
+                    self._save_checkpoint(start, stop, doneBelow, done)
+                    lastSave = time.time()
+                if (stopScan):
+                    break
+            self._save_checkpoint(start, stop, doneBelow, done)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    ## Seeds per second of each worker.
+    #  Dictionary keyed by worker process id.
+    def worker_rates(self):
+        rates = dict()
+        for (pid, (seeds, seconds)) in self.workerStats.iteritems():
+            rates[pid] = seeds/seconds if (seconds > 0) else 0.
+        return(rates)
+
+# Exceptions -------------------------------------------------------------------
+class CheckpointMismatchError(Exception):
+    def __init__(self,path):
+        eStringTemplate = 'Checkpoint {0} is for a different scan.'
+        self.eString = eStringTemplate.format(path)
+        Exception.__init__(self,self.eString)
@@ -2,6 +2,8 @@
 
 from __future__ import print_function
 
+import collections
+import copy
 import math
 import numpy as np
 import operator
@@ -11,6 +13,7 @@ import generator
 import hexinfo
 import hexutils
 import image
+import name
 import orbitalobject
 import star
 import system
@@ -22,6 +25,16 @@ SECTOR_MAJOR_COL = 0
 SECTOR_ROWS = 10
 SECTOR_COLS = 8
 
+# Group distance of unused group slots, and of a group to itself
+_NO_GROUP_DISTANCE = np.iinfo(np.int64).max
+
+# Functions --------------------------------------------------------------------
+## New name allocator.
+#
+#  Sector's name argument hides the name module in its constructor.
+def _name_allocator():
+    return(name.NameAllocator())
+
 # Sector class -----------------------------------------------------------------
 ## Sector class.
 #
@@ -33,18 +46,21 @@ class Sector(object):
     #  @param majorCol Major column of sector.
     #  @param rows     Number of rows in sector.
     #  @param cols     Number of columns in sector.
+    #  @param seed     Seed string the sector was generated from, if any.
     def __init__(self,
                  name,
                  majorRow = None,
                  majorCol = None,
                  rows     = None,
-                 cols     = None):
+                 cols     = None,
+                 seed     = None):
         # General information
         self.name     = exception.arg_check(name,     str, 'Default Name')
         self.majorRow = exception.arg_check(majorRow, int, SECTOR_MAJOR_ROW)
         self.majorCol = exception.arg_check(majorCol, int, SECTOR_MAJOR_COL)
         self._rows    = exception.arg_check(rows,     int, SECTOR_ROWS)
         self._cols    = exception.arg_check(cols,     int, SECTOR_COLS)
+        self.seed     = exception.arg_check(seed,     str, None)
         # Roll information
         self.corporations = list()
         self.heresies     = list()
@@ -58,12 +74,96 @@ class Sector(object):
                 self.hexes[(sRow,sCol)] = hexinfo.Hex()
 
         self.routes = list()
-        # Images
-        self.images = image.SectorImage(self.name,
-                                        self.majorRow,
-                                        self.majorCol,
-                                        self._rows,
-                                        self._cols)
+        # Names used in the sector
+        self.names  = _name_allocator()
+        # Distances between hexes, shared by sectors of the same size
+        self._distanceTable = hexutils.odd_q_distance_table(self._rows,self._cols)
+        # Occupied hexes, and the sum of distances from each hex to every
+        # system, updated as systems are added
+        self._occupied     = np.zeros((self._rows,self._cols),dtype=bool)
+        self._distanceSums = np.zeros((self._rows,self._cols),dtype=np.int64)
+        # Sum of distances between every ordered pair of systems
+        self._pairDistanceSum = 0
+        # Empty hexes as hex indices (row*cols+col). The first _numEmpty
+        # entries of _emptyHexes are the empty hexes, and _emptyPositions 
+        # holds where each hex is in it. Filled hexes are swapped to the end.
+        self._emptyHexes     = np.arange(self._rows*self._cols)
+        self._emptyPositions = np.arange(self._rows*self._cols)
+        self._numEmpty       = self._rows*self._cols
+        # Groups of neighboring systems as a disjoint set. Each system points
+        # to its parent, and each group root has the group's members, first
+        # system in sorted order, number of neighboring pairs, and slot.
+        self._groupParent    = dict()
+        self._groupMembers   = dict()
+        self._groupFirst     = dict()
+        self._groupEdges     = dict()
+        self._groupSlots     = dict()
+        # Minimum distance between every pair of groups, indexed by slot. 
+        # Slots of merged groups are reused, and the matrix doubles in size
+        # when every slot is used.
+        self._groupDistances = np.zeros((0,0),dtype=np.int64)
+        self._freeSlots      = list()
+        # Slot of each system's group, -1 for empty hexes
+        self._hexSlots       = np.full((self._rows,self._cols),-1,dtype=np.int64)
+        # Neighboring hexes in the map of each hex, found on first use
+        self._neighborHexes = dict()
+        # Images, created on first use
+        self._images = None
+
+    ## Sector deep copy.
+    #
+    #  Images hold fonts that can't be copied, so the copy creates its own 
+    #  images on first use. They can be redrawn from the copied data with 
+    #  update_images.
+    def __deepcopy__(self,memo):
+        newSector = Sector.__new__(Sector)
+        memo[id(self)] = newSector
+        for (key,value) in self.__dict__.iteritems():
+            if (key != '_images'):
+                newSector.__dict__[key] = copy.deepcopy(value,memo)
+        newSector._images = None
+        return(newSector)
+
+    ## Sector pickle state.
+    #
+    #  Images are left out like in a deep copy. The distance table is shared 
+    #  by sectors of the same size, so it's looked up again when unpickled,
+    #  and neighboring hexes are found again on use.
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_images'] = None
+        del state['_distanceTable']
+        del state['_neighborHexes']
+        return(state)
+
+    def __setstate__(self,state):
+        self.__dict__.update(state)
+        self._distanceTable = hexutils.odd_q_distance_table(self._rows,self._cols)
+        self._neighborHexes = dict()
+
+    ## Sector images.
+    #
+    #  Images are created on first use, so sectors that are never drawn skip
+    #  loading the starfield, building the hex map, and loading fonts.
+    @property
+    def images(self):
+        if (self._images is None):
+            self._images = image.SectorImage(self.name,
+                                             self.majorRow,
+                                             self.majorCol,
+                                             self._rows,
+                                             self._cols)
+        return(self._images)
+
+    ## Number of hex rows.
+    @property
+    def rows(self):
+        return(self._rows)
+
+    ## Number of hex columns.
+    @property
+    def cols(self):
+        return(self._cols)
 
     ## Add a blank system.
     #
@@ -76,6 +176,115 @@ class Sector(object):
                                                           stars   = list(),
                                                           objects = list(),
                                                           worlds  = list())
+            # Update distance sums with the new system
+            distances = self._distanceTable.hex_distances(sRow,sCol)
+            self._pairDistanceSum += 2*int(self._distanceSums[sRow,sCol])
+            self._distanceSums    += distances
+            self._occupied[sRow,sCol] = True
+            self._remove_empty_hex(sRow*self._cols+sCol)
+            # Update groups with the new system
+            self._add_to_groups(sRow,sCol,distances)
+
+    ## Remove a hex from the empty hexes.
+    #
+    #  Swaps the hex with the last empty hex, then shortens the empty hexes.
+    #  @param index Hex index, row*cols+col.
+    def _remove_empty_hex(self,index):
+        position = self._emptyPositions[index]
+        lastHex  = self._emptyHexes[self._numEmpty-1]
+        self._emptyHexes[position]         = lastHex
+        self._emptyPositions[lastHex]      = position
+        self._emptyHexes[self._numEmpty-1] = index
+        self._emptyPositions[index]        = self._numEmpty-1
+        self._numEmpty -= 1
+
+    ## Add a system to the system groups.
+    #
+    #  The system starts a group of its own, which is then merged with the
+    #  groups of its neighbors.
+    #  @param sRow      Row of the new system.
+    #  @param sCol      Column of the new system.
+    #  @param distances Array of distances from the new system to every hex.
+    def _add_to_groups(self,sRow,sCol,distances):
+        newHex = (sRow,sCol)
+        neighbors = self.system_neighbors(sRow,sCol)
+        neighborRoots = set(self._group_root(n) for n in neighbors)
+        # Distance to the other groups is the distance to their nearest 
+        # member. Sorting the systems by group slot then distance puts each
+        # group's nearest member first.
+        occupied     = np.flatnonzero(self._hexSlots >= 0)
+        systemSlots  = self._hexSlots.flat[occupied]
+        order        = np.lexsort((distances.flat[occupied],systemSlots))
+        sortedSlots  = systemSlots[order]
+        nearest      = order[np.r_[True,sortedSlots[1:] != sortedSlots[:-1]]] if (len(order) > 0) else order
+        # New group
+        slot = self._new_group_slot()
+        self._groupParent[newHex]  = newHex
+        self._groupMembers[newHex] = [newHex]
+        self._groupFirst[newHex]   = newHex
+        self._groupEdges[newHex]   = len(neighbors)
+        self._groupSlots[newHex]   = slot
+        self._hexSlots[sRow,sCol]  = slot
+        newDistances = np.full(len(self._groupDistances),_NO_GROUP_DISTANCE,dtype=np.int64)
+        newDistances[systemSlots[nearest]] = distances.flat[occupied[nearest]]
+        self._groupDistances[slot,:] = newDistances
+        self._groupDistances[:,slot] = newDistances
+        # Merge with the neighboring groups
+        root = newHex
+        for neighborRoot in neighborRoots:
+            root = self._merge_groups(root,neighborRoot)
+
+    ## Slot for a new group.
+    #
+    #  Reuses the slot of a merged group, or doubles the distance matrix if 
+    #  every slot is used.
+    def _new_group_slot(self):
+        if (len(self._freeSlots) == 0):
+            oldSize = len(self._groupDistances)
+            newSize = max(2*oldSize,16)
+            newDistances = np.full((newSize,newSize),_NO_GROUP_DISTANCE,dtype=np.int64)
+            newDistances[:oldSize,:oldSize] = self._groupDistances
+            self._groupDistances = newDistances
+            self._freeSlots = range(newSize-1,oldSize-1,-1)
+        return(self._freeSlots.pop())
+
+    ## Root system of a system's group.
+    def _group_root(self,sHex):
+        root = sHex
+        while (self._groupParent[root] != root):
+            root = self._groupParent[root]
+        # Point the path straight to the root
+        while (self._groupParent[sHex] != root):
+            (self._groupParent[sHex], sHex) = (root, self._groupParent[sHex])
+        return(root)
+
+    ## Merge two system groups.
+    #  @return Root of the merged group.
+    def _merge_groups(self,rootA,rootB):
+        # Keep the root of the larger group
+        if (len(self._groupMembers[rootA]) < len(self._groupMembers[rootB])):
+            (rootA, rootB) = (rootB, rootA)
+        self._groupParent[rootB] = rootA
+        membersB = self._groupMembers.pop(rootB)
+        self._groupMembers[rootA] += membersB
+        self._groupFirst[rootA] = min(self._groupFirst[rootA],
+                                      self._groupFirst.pop(rootB),
+                                      key=lambda e: (e[1], e[0]))
+        self._groupEdges[rootA] += self._groupEdges.pop(rootB)
+        # Distance to the other groups is the nearer of the two
+        slotA = self._groupSlots[rootA]
+        slotB = self._groupSlots.pop(rootB)
+        mergedDistances = np.minimum(self._groupDistances[slotA],self._groupDistances[slotB])
+        mergedDistances[[slotA,slotB]] = _NO_GROUP_DISTANCE
+        self._groupDistances[slotA,:] = mergedDistances
+        self._groupDistances[:,slotA] = mergedDistances
+        self._groupDistances[slotB,:] = _NO_GROUP_DISTANCE
+        self._groupDistances[:,slotB] = _NO_GROUP_DISTANCE
+        self._freeSlots.append(slotB)
+        # Systems of the smaller group move to the merged group's slot
+        (rowsB,colsB) = zip(*membersB)
+        self._hexSlots[rowsB,colsB] = slotA
+        return(rootA)
 
     ## Draw sector
     def draw_sector(self):
@@ -87,6 +296,21 @@ class Sector(object):
     def hex_empty(self,sRow,sCol):
         return (self.hexes[(sRow,sCol)].system is None)
 
+    ## Number of empty hexes.
+    def num_empty_hexes(self):
+        return(self._numEmpty)
+
+    ## Random empty hex.
+    #
+    #  Every empty hex is equally likely, picked with one draw.
+    #  @param rng Random stream, see random.DiceStream.
+    #  @return (row, col) of the hex.
+    def random_empty_hex(self,rng):
+        if (self._numEmpty == 0):
+            raise exception.NoEmptyHex()
+        index = int(self._emptyHexes[rng.randint(0,self._numEmpty)])
+        return(divmod(index,self._cols))
+
     ## Print table of corporations.
     def print_corporations(self):
         # Create table
@@ -245,10 +469,11 @@ class Sector(object):
                 if ( firstWorld ):
                     firstWorld = False
                     # Hex
-                    row.append('{mc}{hc}{mr}{hr}'.format(mc=self.majorCol,
-                                                         hc=systemKey[1],
-                                                         mr=self.majorRow,
-                                                         hr=systemKey[0]))
+                    row.append(image.hex_number(self.majorRow,
+                                                self.majorCol,
+                                                systemKey[0],
+                                                systemKey[1],
+                                                image.hex_digits(self._rows,self._cols)))
                     # System name
                     row.append(system.name)
                 else:
@@ -287,8 +512,8 @@ class Sector(object):
         # Create hexmap
         hexMap = text.HexMap(title  = self.name + ' - ' + 'Sector Map',
                              size   = text.SMALL_MAP,
-                             rows   = SECTOR_ROWS,
-                             cols   = SECTOR_COLS,
+                             rows   = self._rows,
+                             cols   = self._cols,
                              coords = coords)
         # Add systems to map
         sIndex = 1
@@ -305,52 +530,50 @@ class Sector(object):
 
     ## Calculate hex distances between all systems.
     def system_distances(self):
-        systems = self.sorted_systems()
-        systemDistancesCalc = [ [0] * len(systems) for i in xrange(len(systems)) ]
-        # For each system
-        for sAIndex in xrange(0,len(systems)):
-            # For each other system
-            for sBIndex in xrange(0,len(systems)):
-                # Calculate distances for current systems
-                systemDistancesCalc[sAIndex][sBIndex] = hexutils.odd_q_distance(systems[sAIndex][0],systems[sAIndex][1],systems[sBIndex][0],systems[sBIndex][1])
-        return(systemDistancesCalc)
+        (rows,cols) = np.array(self.sorted_systems(),dtype=int).reshape(-1,2).T
+        return(self._distanceTable.distances(rows,cols,rows,cols).astype(int).tolist())
 
     ## Test distances between all systems if a new system is added.
-    def system_distances_test(self):
-        systems = self.sorted_systems()
-        # Distance sum list
-        sumDistAll = list()
-        sumDistAllPos = list()
+    #
+    #  For each empty hex, sums the distances between every pair of systems if
+    #  a new system were added there. Sums come from the distance sums kept up
+    #  to date by add_blank_system, so no distances are recalculated.
+    #  @param rng Random number generator used to shuffle the search order.
+    #  @return Array of distance sums and list of their hexes, in search order.
+    def system_distances_test(self,rng=None):
+        # Default to the global numpy random state
+        if (rng is None):
+            rng = np.random
         # For each hex row
         rowList = range(0,self._rows)
         # Shuffle rowList to not favor any specific row
-        np.random.shuffle(rowList)
+        rng.shuffle(rowList)
+        searchRows = list()
+        searchCols = list()
         for row in rowList:
             # For each hex column
-            colList =range(0,self._cols)
+            colList = range(0,self._cols)
             # Shuffle colList to not favor any specific column
-            np.random.shuffle(colList)
-            for col in colList:
-                # Sum of distances between stars
-                sumDist = 0
-                # Ignore hexes where there is already a system
-                if ( self.hex_empty(row,col) ):
-                    systemDistancesCalc = self.system_distances()
-                    # Add new row for new system
-                    systemDistancesCalc.append([0] * (len(self.system_hex_list()) + 1))
-                    # For each system
-                    for sAIndex in xrange(0,len(systems)):
-                        # Calculate distances for new system
-                        systemDistancesCalc[sAIndex].append(hexutils.odd_q_distance(row,col,systems[sAIndex][0],systems[sAIndex][1]))
-                        systemDistancesCalc[len(systems)][sAIndex] = hexutils.odd_q_distance(row,col,systems[sAIndex][0],systems[sAIndex][1])
-                        # Sum this row
-                        sumDist += int(sum(systemDistancesCalc[sAIndex]))
-                    # Store sum for this options
-                    sumDistAll.append(sumDist)
-                    sumDistAllPos.append((row,col))
+            rng.shuffle(colList)
+            searchRows += [row]*self._cols
+            searchCols += colList
+        searchRows = np.array(searchRows)
+        searchCols = np.array(searchCols)
+        # Ignore hexes where there is already a system
+        empty      = ~self._occupied[searchRows,searchCols]
+        searchRows = searchRows[empty]
+        searchCols = searchCols[empty]
+        # Existing pairs plus the distances from the new system to every system,
+        # counted both ways
+        sumDistAll    = self._pairDistanceSum + self._distanceSums[searchRows,searchCols]
+        sumDistAllPos = zip(searchRows.tolist(),searchCols.tolist())
         return(sumDistAll,sumDistAllPos)
 
     ## Calculate distances between groups of systems.
+    #
+    #  The systems that make up the distance between two groups are the first
+    #  pair at the minimum distance, going through the systems of each group
+    #  in search order.
     def system_group_distances(self):
         # Get system groups
         systemGroups = self.system_groups()
@@ -358,68 +581,105 @@ class Sector(object):
         groupDistances = [ [0] * len(systemGroups) for i in xrange(len(systemGroups)) ]
         # Array to hold which two systems in the groups make up the minimum distance between them
         minDistGroupSystems = [ [0] * len(systemGroups) for i in xrange(len(systemGroups)) ]
+        # Distances between all systems, in group order
+        allSystems = [s for g in systemGroups for s in g]
+        (rows,cols) = np.array(allSystems,dtype=int).reshape(-1,2).T
+        distances = self._distanceTable.distances(rows,cols,rows,cols)
+        groupStarts = np.cumsum([0]+[len(g) for g in systemGroups])
         # For each group
         for sgAIndex in xrange(0,len(systemGroups)):
             # For each other group
             for sgBIndex in xrange(0,len(systemGroups)):
                 # Don't check current group against itself
                 if (sgAIndex != sgBIndex ):
-                    # Assume minimum is first parining
-                    minDist = hexutils.odd_q_distance(systemGroups[sgAIndex][0][0],
-                                                    systemGroups[sgAIndex][0][1],
-                                                    systemGroups[sgBIndex][0][0],
-                                                    systemGroups[sgBIndex][0][1])
-                    minDistPair = (systemGroups[sgAIndex][0],systemGroups[sgBIndex][0])
-                    # For each star in each group
-                    for (sARow,sACol) in systemGroups[sgAIndex]:
-                        # For each star in each other group
-                        for (sbRow,sBCol) in systemGroups[sgBIndex]:
-                            newDist = hexutils.odd_q_distance(sARow,sACol,sbRow,sBCol)
-                            if ( newDist < minDist ):
-                                minDist = newDist
-                                minDistPair = ((sARow,sACol),(sbRow,sBCol))
-                    groupDistances[sgAIndex][sgBIndex] = minDist
-                    minDistGroupSystems[sgAIndex][sgBIndex] = minDistPair
+                    groupDist = distances[groupStarts[sgAIndex]:groupStarts[sgAIndex+1],
+                                          groupStarts[sgBIndex]:groupStarts[sgBIndex+1]]
+                    (aIndex,bIndex) = np.unravel_index(groupDist.argmin(),groupDist.shape)
+                    groupDistances[sgAIndex][sgBIndex] = int(groupDist[aIndex,bIndex])
+                    minDistGroupSystems[sgAIndex][sgBIndex] = (systemGroups[sgAIndex][aIndex],systemGroups[sgBIndex][bIndex])
         return(groupDistances,minDistGroupSystems)
 
+    ## Minimum distance between two groups of systems.
+    #  @param rootA Root system of the first group, see system_group_roots.
+    #  @param rootB Root system of the second group.
+    def system_group_distance(self,rootA,rootB):
+        if (rootA == rootB):
+            return(0)
+        return(int(self._groupDistances[self._groupSlots[rootA],self._groupSlots[rootB]]))
+
+    ## Nearest group to each group.
+    #
+    #  Ties go to the group that comes first in roots.
+    #  @param roots Root systems of the groups, see system_group_roots. There
+    #               must be at least two.
+    #  @return Array of the distance of each group to its nearest group, and
+    #          array of the nearest group's index in roots.
+    def system_group_nearest(self,roots):
+        slots = [self._groupSlots[r] for r in roots]
+        distances = self._groupDistances[np.ix_(slots,slots)]
+        nearest = distances.argmin(axis=1)
+        return(distances[np.arange(len(slots)),nearest],nearest)
+
+    ## Systems of a group.
+    #
+    #  Systems are in search order: the group's first system in sorted order,
+    #  then its neighbors, then their neighbors, and so on.
+    #  @param root Root system of the group, see system_group_roots.
+    def system_group_members(self,root):
+        firstSystem = self._groupFirst[root]
+        members = [firstSystem]
+        grouped = set(members)
+        neighborSystems = collections.deque(self.system_neighbors(firstSystem[0],firstSystem[1]))
+        while (len(neighborSystems) > 0):
+            ns = neighborSystems.popleft()
+            if (ns not in grouped):
+                members.append(ns)
+                grouped.add(ns)
+                neighborSystems.extend(self.system_neighbors(ns[0],ns[1]))
+        return(members)
+
+    ## Systems that make up the minimum distance between two groups.
+    #
+    #  The first pair at the minimum distance, going through the systems of 
+    #  each group in search order.
+    #  @param rootA Root system of the first group, see system_group_roots.
+    #  @param rootB Root system of the second group.
+    def system_group_pair(self,rootA,rootB):
+        membersA = self.system_group_members(rootA)
+        membersB = self.system_group_members(rootB)
+        (rowsA,colsA) = np.array(membersA).T
+        (rowsB,colsB) = np.array(membersB).T
+        distances = self._distanceTable.distances(rowsA,colsA,rowsB,colsB)
+        (aIndex,bIndex) = np.unravel_index(distances.argmin(),distances.shape)
+        return((membersA[aIndex],membersB[bIndex]))
+
+    ## Root systems of the groups of systems.
+    #
+    #  Groups are ordered by their first system in sorted order.
+    #  @param maxSearch Most steps a search of a group could take, for 
+    #                   generation versions that capped group searches. 
+    #                   Default is no limit.
+    def system_group_roots(self,maxSearch=None):
+        roots = sorted(self._groupFirst, key=lambda r: (self._groupFirst[r][1], self._groupFirst[r][0]))
+        # Searching a group checks both systems of each neighboring pair.
+        # Searches were capped, so groups that are too large aren't allowed.
+        if (maxSearch is not None):
+            for root in roots:
+                if (2*self._groupEdges[root] > maxSearch):
+                    raise exception.MaxLoopIterationsExceed(maxSearch)
+        return(roots)
+
+    ## Number of systems in a group.
+    #  @param root Root system of the group, see system_group_roots.
+    def system_group_size(self,root):
+        return(len(self._groupMembers[root]))
+
     ## Find groups of systems.
+    #
+    #  Groups are ordered by their first system in sorted order, and the 
+    #  systems of each group are in search order, see system_group_members.
     def system_groups(self):
-        # Sort star systems by hex, col first, row second
-        starKeys = self.sorted_systems()
-        # List for placing groups
-        groups = list()
-        # Add stars to groups by recursively searching nearby stars
-        loop1Count = 0
-        while (len(starKeys) > 0):
-            # Start first group with first star system remaining in list
-            currentStar = starKeys[0]
-            starKeys.pop(0)
-            currentGroup = [currentStar]
-            # Get current star neighboring hexes
-            neighborSystems = self.system_neighbors(currentStar[0],currentStar[1])
-            # For all neighbor systems
-            loop2Count = 0
-            while (len(neighborSystems) > 0):
-                try:
-                    # Add to current group and remove from ungrouped list
-                    currentGroup.append(starKeys.pop(starKeys.index(neighborSystems[0])))
-                    # Add neighbor's neighbors to search list
-                    for ns in self.system_neighbors(neighborSystems[0][0],neighborSystems[0][1]):
-                        neighborSystems.append(ns)
-                except ValueError:
-                    pass
-                # Remove from neighboring systems search list
-                neighborSystems.pop(0)
-                # Catch runaway loop
-                loop2Count += 1
-                if (loop2Count>100):
-                    raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
-            groups.append(currentGroup)
-            # Catch runaway loop
-            loop1Count += 1
-            if (loop1Count>100):
-                raise exception.MaxLoopIterationsExceed(MAX_LOOP_ITER)
-        return(groups)
+        return([self.system_group_members(root) for root in self.system_group_roots(generator.MAX_LOOP_ITER)])
 
     ## List of hexes with systems.
     def system_hex_list(self):
@@ -436,17 +696,14 @@ class Sector(object):
 
     ## Find neighbors of systems.
     def system_neighbors(self,row,col):
-        # Get neighboring hexes
-        neighborHexes = hexutils.odd_q_neighbors(row,col)
-        # Container for neighboring star systems
-        neighborSystems = list()
-        for nh in neighborHexes:
-            # Check if neighbor is in map
-            if self.hexes.has_key(nh):
-                # Check if system exists in hex
-                if (not (self.hexes[nh].system is None)):
-                    neighborSystems.append(nh)
-        return(neighborSystems)
+        # Get neighboring hexes in the map
+        try:
+            neighborHexes = self._neighborHexes[(row,col)]
+        except KeyError:
+            neighborHexes = [nh for nh in hexutils.odd_q_neighbors(row,col) if nh in self.hexes]
+            self._neighborHexes[(row,col)] = neighborHexes
+        # Neighboring hexes with a system
+        return([nh for nh in neighborHexes if (self.hexes[nh].system is not None)])
 
     ## Update image hex with system data.
     def update_hex_image(self, hRow, hCol):
@@ -472,27 +729,9 @@ class Sector(object):
             self.update_hex_image(hRow,hCol)
             
         # World info table.
-        infoTable = self.images.infoTable
         # For each hex with a system.
         for (hRow,hCol) in self.system_hex_list():
-            systemData = self.hexes[(hRow,hCol)].system
-            # For each world.
-            for w in systemData.sorted_worlds():
-                # Fill out world info in table.
-                infoTable.add_world(self.majorRow,
-                                    self.majorCol,
-                                    hRow, 
-                                    hCol, 
-                                    systemData.name,
-                                    w.name,
-                                    w.techLevel,
-                                    w.atmosphere,
-                                    w.biosphere, 
-                                    w.population,
-                                    w.population_alt_text(),
-                                    w.tags,
-                                    w.temperature,
-                                    [])
+            self.update_info_table_hex(hRow,hCol)
 
         # For each hex with a system.
         for (hRow,hCol) in self.system_hex_list():
@@ -500,6 +739,46 @@ class Sector(object):
             self.update_system_map_image(hRow, hCol)
             
 
+    ## Update world info table with a hex's worlds.
+    def update_info_table_hex(self, hRow, hCol):
+        systemData = self.hexes[(hRow,hCol)].system
+        # World info table.
+        infoTable = self.images.infoTable
+        # Remove worlds from before.
+        infoTable.reset_hex(self.majorRow,
+                            self.majorCol,
+                            hRow,
+                            hCol)
+        # For each world.
+        for w in systemData.sorted_worlds():
+            # Fill out world info in table.
+            infoTable.add_world(self.majorRow,
+                                self.majorCol,
+                                hRow, 
+                                hCol, 
+                                systemData.name,
+                                w.name,
+                                w.techLevel,
+                                w.atmosphere,
+                                w.biosphere, 
+                                w.population,
+                                w.population_alt_text(),
+                                w.tags,
+                                w.temperature,
+                                [])
+
+    ## Update images with one system's data.
+    #
+    #  Updates the hex, world info, and orbit map of a system that changed.
+    #  Does nothing if the images haven't been created, they get every system
+    #  from update_images.
+    def update_system_images(self, hRow, hCol):
+        if (self._images is None):
+            return
+        self.update_hex_image(hRow,hCol)
+        self.update_info_table_hex(hRow,hCol)
+        self.update_system_map_image(hRow,hCol)
+
     ## Update system map image with system data.
     def update_system_map_image(self, hRow, hCol):
         systemData = self.hexes[(hRow,hCol)].system
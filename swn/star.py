@@ -3,6 +3,7 @@
 import color
 import exception
 import numpy as np
+import rolltable
 
 # Tables -----------------------------------------------------------------------
 # One Roll Star System tables
@@ -77,6 +78,15 @@ TABLE_RADIUS_MAP = {
     'M': (0.2,  0.7)
 }
 
+# Roll tables ------------------------------------------------------------------
+# Tables compiled into arrays and checked to cover every roll, see rolltable
+TABLE_COLOR             = rolltable.register('star.TABLE_COLOR',TABLE_COLOR,1,5)
+TABLE_COLOR_SEQUENCE    = rolltable.register('star.TABLE_COLOR_SEQUENCE',TABLE_COLOR_SEQUENCE,1,5)
+TABLE_COLOR_ID          = rolltable.register('star.TABLE_COLOR_ID',TABLE_COLOR_ID,0,30)
+TABLE_COLOR_TEXT        = rolltable.register('star.TABLE_COLOR_TEXT',TABLE_COLOR_TEXT,0,30)
+TABLE_SPECTRAL_MODIFIER = rolltable.register('star.TABLE_SPECTRAL_MODIFIER',TABLE_SPECTRAL_MODIFIER,1,6)
+TABLE_SPECTRAL_SUBCLASS = rolltable.register('star.TABLE_SPECTRAL_SUBCLASS',TABLE_SPECTRAL_SUBCLASS,1,10)
+
 # Star class -------------------------------------------------------------------
 class Star(object):
     def __init__(self,
@@ -2,6 +2,7 @@
 
 import exception
 import orbitalobject
+import rolltable
 import star
 
 # Tables -----------------------------------------------------------------------
@@ -169,13 +170,47 @@ TABLE_STARS = {
     5: 2
 }
 
+# Roll tables ------------------------------------------------------------------
+# Tables compiled into arrays and checked to cover every roll, see rolltable
+TABLE_WORLDS                           = rolltable.register('system.TABLE_WORLDS',TABLE_WORLDS,1,10)
+TABLE_HYDROCARBON_INNER_ASTEROID_BELTS = rolltable.register('system.TABLE_HYDROCARBON_INNER_ASTEROID_BELTS',TABLE_HYDROCARBON_INNER_ASTEROID_BELTS,1,8)
+TABLE_HYDROCARBON_OUTER_ASTEROID_BELTS = rolltable.register('system.TABLE_HYDROCARBON_OUTER_ASTEROID_BELTS',TABLE_HYDROCARBON_OUTER_ASTEROID_BELTS,1,8)
+TABLE_ICY_INNER_ASTEROID_BELTS         = rolltable.register('system.TABLE_ICY_INNER_ASTEROID_BELTS',TABLE_ICY_INNER_ASTEROID_BELTS,1,8)
+TABLE_ICY_OUTER_ASTEROID_BELTS         = rolltable.register('system.TABLE_ICY_OUTER_ASTEROID_BELTS',TABLE_ICY_OUTER_ASTEROID_BELTS,1,8)
+TABLE_METALLIC_INNER_ASTEROID_BELTS    = rolltable.register('system.TABLE_METALLIC_INNER_ASTEROID_BELTS',TABLE_METALLIC_INNER_ASTEROID_BELTS,1,8)
+TABLE_METALLIC_OUTER_ASTEROID_BELTS    = rolltable.register('system.TABLE_METALLIC_OUTER_ASTEROID_BELTS',TABLE_METALLIC_OUTER_ASTEROID_BELTS,1,8)
+TABLE_ROCKY_INNER_ASTEROID_BELTS       = rolltable.register('system.TABLE_ROCKY_INNER_ASTEROID_BELTS',TABLE_ROCKY_INNER_ASTEROID_BELTS,1,8)
+TABLE_ROCKY_OUTER_ASTEROID_BELTS       = rolltable.register('system.TABLE_ROCKY_OUTER_ASTEROID_BELTS',TABLE_ROCKY_OUTER_ASTEROID_BELTS,1,8)
+TABLE_GAS_GIANT_LARGE                  = rolltable.register('system.TABLE_GAS_GIANT_LARGE',TABLE_GAS_GIANT_LARGE,1,10)
+TABLE_GAS_GIANT_SMALL                  = rolltable.register('system.TABLE_GAS_GIANT_SMALL',TABLE_GAS_GIANT_SMALL,1,10)
+TABLE_MAIN_WORLD_ORBIT                 = rolltable.register('system.TABLE_MAIN_WORLD_ORBIT',TABLE_MAIN_WORLD_ORBIT,1,6)
+TABLE_MAIN_WORLD_ORBIT_MOD             = rolltable.register('system.TABLE_MAIN_WORLD_ORBIT_MOD',TABLE_MAIN_WORLD_ORBIT_MOD,0,30)
+TABLE_STARS                            = rolltable.register('system.TABLE_STARS',TABLE_STARS,1,5)
+
 # Star system class ------------------------------------------------------------
+## Star system class.
+#
+# A system's one roll star system (ORSS) stars and orbital objects can be 
+# deferred until they're first used, see defer_orss. Systems only hold 
+# references until then, so attributes are slots instead of a dictionary.
+# Generating ORSS data also changes the names and atmospheres of worlds, which
+# generate it first too, see world.World.defer_orss.
 class System(object):
+    __slots__ = ['name',
+                 'worlds',
+                 '_stars',
+                 '_objects',
+                 '_orssSource',
+                 '_orssKey']
+
     def __init__(self,
                  name    = None,
                  stars   = None,
                  objects = None,
                  worlds  = None):
+        # Deferred ORSS source and key, see defer_orss
+        self._orssSource = None
+        self._orssKey    = None
         # Check arguments
         self.name    = exception.arg_check(name,str,'')
         self.stars   = exception.arg_check(stars,list,list())
@@ -185,5 +220,190 @@ class System(object):
                 raise exception.InvalidListItemType(o,orbitalobject.BaseObject)
         self.worlds  = exception.arg_check(worlds,list,list())
 
+    ## Pickle and copy the slots.
+    def __getstate__(self):
+        return(dict((s, getattr(self,s)) for s in self.__slots__))
+
+    def __setstate__(self,state):
+        for (s, value) in state.iteritems():
+            setattr(self,s,value)
+
+    ## Generate deferred ORSS data now, if it was deferred.
+    def fill_orss(self):
+        if (self._orssSource is not None):
+            (source, key) = (self._orssSource, self._orssKey)
+            self.reset_orss()
+            source.fill(self,key)
+
+    ## Defer ORSS data.
+    #
+    #  Stars and orbital objects are generated by the source when either, or
+    #  the name or atmosphere of a world, is first used, e.g. 
+    #  generator.DeferredOrss. Until then the system only holds the source, 
+    #  shared by the sector, and the key.
+    #  @param self   The object pointer.
+    #  @param source Object with a fill(system, key) method that fills the 
+    #                system's stars and objects.
+    #  @param key    Key of the system passed to fill, e.g. its hex.
+    def defer_orss(self,source,key):
+        self._stars      = None
+        self._objects    = None
+        self._orssSource = source
+        self._orssKey    = key
+        for w in self.worlds:
+            w.defer_orss(self)
+
+    ## Clear ORSS data.
+    #
+    #  Removes the stars and orbital objects, without generating them if they
+    #  were deferred.
+    def reset_orss(self):
+        self._orssSource = None
+        self._orssKey    = None
+        self._stars      = list()
+        self._objects    = list()
+        for w in self.worlds:
+            w.defer_orss(None)
+
+    ## Check if ORSS data is deferred and not generated yet.
+    def orss_deferred(self):
+        return(self._orssSource is not None)
+
+    ## Orbital objects, generated first if deferred.
+    @property
+    def objects(self):
+        self.fill_orss()
+        return(self._objects)
+
+    @objects.setter
+    def objects(self,objects):
+        self.fill_orss()
+        self._objects = objects
+
+    ## Stars, generated first if deferred.
+    @property
+    def stars(self):
+        self.fill_orss()
+        return(self._stars)
+
+    @stars.setter
+    def stars(self,stars):
+        self.fill_orss()
+        self._stars = stars
+
     def sorted_worlds(self):
-        return(sorted(self.worlds, key=lambda w: w.name))
\ No newline at end of file
+        return(sorted(self.worlds, key=lambda w: w.name))
+
+# Orbit slots class ------------------------------------------------------------
+## Orbit slots class.
+#
+# Orbits of a system being filled with orbital objects. Free orbits are kept
+# as a bitset, so free orbits are found with a few integer operations instead
+# of scanning the orbit list.
+class OrbitSlots(object):
+    ## Orbit slots constructor.
+    #  @param self      The object pointer.
+    #  @param numOrbits Number of orbits, all free.
+    def __init__(self, numOrbits):
+        self.objects = [None] * numOrbits
+        # Bit i is set if orbit i is free
+        self._free   = (1 << numOrbits) - 1
+
+    def __len__(self):
+        return(len(self.objects))
+
+    def __getitem__(self, index):
+        return(self.objects[index])
+
+    ## Free orbits as a bitset, limited to a range of orbits.
+    def _free_bits(self, start, stop):
+        start = max(start, 0)
+        stop  = min(stop, len(self.objects))
+        if (start >= stop):
+            return(0)
+        return(self._free & (((1 << stop) - 1) ^ ((1 << start) - 1)))
+
+    ## Add an object in a new orbit past the last one.
+    #  @param obj Orbital object.
+    def append(self, obj):
+        self.objects.append(obj)
+
+    ## First free orbit in a range.
+    #  @param start First orbit of the range.
+    #  @param stop  Orbit to stop before.
+    #  @return Orbit index, None if every orbit in the range is taken.
+    def first_free(self, start, stop):
+        bits = self._free_bits(start, stop)
+        if (bits == 0):
+            return(None)
+        return((bits & -bits).bit_length() - 1)
+
+    ## Free orbits in a range.
+    #  @param start First orbit of the range.
+    #  @param stop  Orbit to stop before.
+    #  @return List of orbit indices, innermost first.
+    def free_orbits(self, start, stop):
+        bits  = self._free_bits(start, stop)
+        ret   = list()
+        while (bits != 0):
+            lowest = bits & -bits
+            ret.append(lowest.bit_length() - 1)
+            bits  ^= lowest
+        return(ret)
+
+    ## Check if an orbit is free.
+    def is_free(self, index):
+        return(((self._free >> index) & 1) == 1)
+
+    ## Nearest free orbit.
+    #
+    #  Searches outward from an orbit in both directions, alternating between
+    #  the orbit just inside and the orbit just outside the searched ones,
+    #  inside first: index-1, index, index-2, index+1, and so on.
+    #  @param index Orbit to search from.
+    #  @return Orbit index, None if every orbit is taken.
+    def nearest_free(self, index):
+        inner = self._free_bits(0, index).bit_length() - 1
+        outer = self.first_free(index, len(self.objects))
+        if (inner < 0):
+            return(outer)
+        if ((outer is None) or (index - 1 - inner <= outer - index)):
+            return(inner)
+        return(outer)
+
+    ## Put an object in an orbit.
+    #  @param index Orbit index.
+    #  @param obj   Orbital object.
+    def place(self, index, obj):
+        self.objects[index] = obj
+        self._free &= ~(1 << index)
+
+    ## Random free orbit.
+    #
+    #  Every free orbit is equally likely, picked with one draw. The drawn 
+    #  free orbit is found by halving the range of orbits, counting the free
+    #  orbits in the lower half to pick which half it's in.
+    #  @param rng Random stream, see random.DiceStream.
+    #  @return Orbit index, None if every orbit is taken.
+    def random_free(self, rng):
+        bits = self._free
+        numFree = bin(bits).count('1')
+        if (numFree == 0):
+            return(None)
+        # Index of the drawn orbit among the free orbits
+        index = rng.randint(0, numFree)
+        orbit = 0
+        width = bits.bit_length()
+        while (width > 1):
+            half      = width / 2
+            lowerBits = bits & ((1 << half) - 1)
+            lowerFree = bin(lowerBits).count('1')
+            if (index < lowerFree):
+                bits  = lowerBits
+                width = half
+            else:
+                index -= lowerFree
+                bits  >>= half
+                orbit += half
+                width -= half
+        return(orbit)
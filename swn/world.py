@@ -2,6 +2,8 @@
 
 import exception
 import orbitalobject
+import random
+import rolltable
 
 # Tables -----------------------------------------------------------------------
 # SWN tables
@@ -202,7 +204,41 @@ TABLE_MAIN_WORLD_ORBIT_TEMP_MOD = {
     'Burning':           -2
 }
 
+# Roll tables ------------------------------------------------------------------
+# Tables compiled into arrays and checked to cover every roll, see rolltable
+TABLE_ALT_ATMOSPHERE = rolltable.register('world.TABLE_ALT_ATMOSPHERE',TABLE_ALT_ATMOSPHERE,2,10)
+TABLE_ATMOSPHERE     = rolltable.register('world.TABLE_ATMOSPHERE',TABLE_ATMOSPHERE,2,12)
+TABLE_BIOSPHERE      = rolltable.register('world.TABLE_BIOSPHERE',TABLE_BIOSPHERE,2,12)
+TABLE_POPULATION     = rolltable.register('world.TABLE_POPULATION',TABLE_POPULATION,2,12)
+TABLE_POPULATION_ALT = rolltable.register('world.TABLE_POPULATION_ALT',TABLE_POPULATION_ALT,2,12)
+TABLE_TECH_LEVEL     = rolltable.register('world.TABLE_TECH_LEVEL',TABLE_TECH_LEVEL,2,12)
+TABLE_TEMPERATURE    = rolltable.register('world.TABLE_TEMPERATURE',TABLE_TEMPERATURE,2,12)
+# Tags by d6 then d10
+TABLE_TAGS = rolltable.register('world.TABLE_TAGS',
+                                dict((d6, rolltable.register('world.TABLE_TAGS[{0}]'.format(d6),TABLE_TAGS[d6],1,10))
+                                     for d6 in TABLE_TAGS),
+                                1,6)
+
+# Samplers ---------------------------------------------------------------------
+# Tables rolled on 2d6, compiled to alias samplers that draw an entry with one
+# random integer instead of rolling both dice
+SAMPLER_ATMOSPHERE  = random.table_sampler(TABLE_ATMOSPHERE,2,6)
+SAMPLER_BIOSPHERE   = random.table_sampler(TABLE_BIOSPHERE,2,6)
+SAMPLER_POPULATION  = random.table_sampler(dict((r, (TABLE_POPULATION[r], tuple(TABLE_POPULATION_ALT[r])))
+                                                for r in TABLE_POPULATION),2,6)
+SAMPLER_TECH_LEVEL  = random.table_sampler(TABLE_TECH_LEVEL,2,6)
+SAMPLER_TEMPERATURE = random.table_sampler(TABLE_TEMPERATURE,2,6)
+
+# Tags in d6, d10 order, each equally likely
+TAG_LIST = [TABLE_TAGS[d6][d10] for d6 in sorted(TABLE_TAGS) for d10 in sorted(TABLE_TAGS[d6])]
+
 # World class ------------------------------------------------------------------
+## World class.
+#
+# A world's name and atmosphere are changed by its system's one roll star 
+# system (ORSS) data, e.g. names of worlds on space stations, so reading or 
+# writing either generates the system's ORSS data first if it was deferred, see
+# system.System.defer_orss. Other attributes don't wait for it.
 class World(object):
     def __init__(self,
                  name = '',
@@ -213,6 +249,8 @@ class World(object):
                  tags = ['',''],
                  temperature = '',
                  techLevel = '0'):
+        # System whose deferred ORSS data changes the world, see defer_orss
+        self._orssSystem = None
         # General information
         self.name = exception.arg_check(name,str,'')
 
@@ -230,6 +268,39 @@ class World(object):
         # Alternate roll information
         self.populationAlt = exception.arg_check(populationAlt,int,0)
 
+    ## Set the system whose deferred ORSS data changes the world.
+    #  @param self      The object pointer.
+    #  @param systemObj System filled before the name or atmosphere is used,
+    #                   None once its ORSS data is generated.
+    def defer_orss(self,systemObj):
+        self._orssSystem = systemObj
+
+    ## Name, with the system's deferred ORSS data generated first.
+    @property
+    def name(self):
+        if (self._orssSystem is not None):
+            self._orssSystem.fill_orss()
+        return(self._name)
+
+    @name.setter
+    def name(self,name):
+        if (self._orssSystem is not None):
+            self._orssSystem.fill_orss()
+        self._name = name
+
+    ## Atmosphere, with the system's deferred ORSS data generated first.
+    @property
+    def atmosphere(self):
+        if (self._orssSystem is not None):
+            self._orssSystem.fill_orss()
+        return(self._atmosphere)
+
+    @atmosphere.setter
+    def atmosphere(self,atmosphere):
+        if (self._orssSystem is not None):
+            self._orssSystem.fill_orss()
+        self._atmosphere = atmosphere
+
     def population_alt_text(self):
         # Floor to 3 significant figures
         if ( self.populationAlt > 99999 ):
@@ -2,10 +2,14 @@
 
 from __future__ import print_function
 
+import cPickle
 import cProfile
 import matplotlib.pyplot as plt
 import multiprocessing as mp
 import numpy as np
+import sys
+import time
+from multiprocessing.pool import ThreadPool
 
 import swn
 
@@ -105,7 +109,460 @@ def gen(gType=1):
     sec.images.save_sector_info('test/testinfo.png')
     sec.images.save_sector_orbits('test/map.png')
 
+def dicebench(numRolls=700000):
+    # Dice rolled by sector generation
+    dice = [(1,4),(1,6),(1,8),(1,10),(1,12),(1,20),(2,6)]
+    # Roll directly from numpy and from a buffered dice stream
+    rngs = [('RandomState', swn.random.new_rng()),
+            ('DiceStream',  swn.random.DiceStream(swn.random.new_rng()))]
+    for (label, rng) in rngs:
+        rng.seed(0)
+        start = time.time()
+        for i in xrange(numRolls/len(dice)):
+            for (num, die) in dice:
+                swn.random.dice_roll(num, die, rng=rng)
+        elapsed = time.time() - start
+        print('{0:12} {1:12,.0f} rolls/sec'.format(label, numRolls/elapsed))
+
+def seedbench(numSeeds=1000000):
+    # Encode a range of seeds one at a time and as arrays
+    start = time.time()
+    seeds = [swn.random.seed_alphabet_encode(i) for i in xrange(numSeeds)]
+    print('{0:12} {1:12,.0f} seeds/sec'.format('Scalar', numSeeds/(time.time()-start)))
+    start = time.time()
+    chunks = list(swn.random.seed_range(0, numSeeds))
+    print('{0:12} {1:12,.0f} seeds/sec'.format('Array', numSeeds/(time.time()-start)))
+    print('Match' if seeds == np.concatenate(chunks).tolist() else 'MISMATCH')
+
+def tracebench(numSectors=10, gType=1):
+    seeds = [swn.random.seed_alphabet_encode(i) for i in xrange(1, numSectors+1)]
+    gen   = swn.generator.Generator()
+    # Generate sectors with tracing off, then recording each sector's rolls
+    traces  = [swn.random.RollTrace() for seed in seeds]
+    results = dict()
+    for mode in ['off', 'record', 'replay']:
+        results[mode] = list()
+        elapsed = 0.
+        for (seed, trace) in zip(seeds, traces):
+            gen.set_seed(seed)
+            if (mode == 'off'):
+                gen.tracer = None
+            elif (mode == 'record'):
+                gen.tracer = trace
+            else:
+                gen.tracer = swn.random.RollReplay(trace)
+            start = time.time()
+            sec = gen.sector(gType)
+            elapsed += time.time() - start
+            results[mode].append(summary(sec))
+        print('{0:8} {1:8.3f} sec/sector'.format(mode, elapsed/numSectors))
+    gen.tracer = None
+    print('{0:,.0f} rolls/sector'.format(np.mean([t.count for t in traces])))
+    # Recording and replaying must give the same sectors
+    for (seed, off, record, replay) in zip(seeds, results['off'], results['record'], results['replay']):
+        print(seed, 'match' if off == record == replay else 'MISMATCH')
+
+def aliascheck():
+    # Each sampler must give every table entry exactly its 2d6 probability
+    ways = swn.random.dice_distribution(2, 6)
+    tables = [('Atmosphere',  swn.world.SAMPLER_ATMOSPHERE,  swn.world.TABLE_ATMOSPHERE),
+              ('Biosphere',   swn.world.SAMPLER_BIOSPHERE,   swn.world.TABLE_BIOSPHERE),
+              ('Tech level',  swn.world.SAMPLER_TECH_LEVEL,  swn.world.TABLE_TECH_LEVEL),
+              ('Temperature', swn.world.SAMPLER_TEMPERATURE, swn.world.TABLE_TEMPERATURE)]
+    for (label, sampler, table) in tables:
+        # Count the draws that give each outcome
+        drawCounts = dict()
+        for u in xrange(sampler._size):
+            (column, weight) = divmod(u, sampler._columnWeight)
+            outcome = sampler.outcomes[column if weight < sampler._threshold[column] else sampler._alias[column]]
+            drawCounts[outcome] = drawCounts.get(outcome, 0) + 1
+        rollCounts = dict()
+        for (roll, count) in ways.iteritems():
+            rollCounts[table[roll]] = rollCounts.get(table[roll], 0) + count
+        exact = all(drawCounts[o]*36 == rollCounts[o]*sampler._size for o in rollCounts)
+        print('{0:12} {1}'.format(label, 'exact' if exact else 'MISMATCH'))
+
+def exact(numSectors=200, gType=0):
+    # Exact distributions
+    start = time.time()
+    pWorlds  = swn.distribution.worlds_per_system()
+    (levels, pLevels) = swn.distribution.main_world_tech_level()
+    (pStars, pFirst, pSecond) = swn.distribution.system_stars()
+    pGasMoon = swn.distribution.main_world_gas_giant_moon()
+    print('Exact in {0:.1f} ms'.format((time.time()-start)*1000))
+    # Sample the same statistics
+    start = time.time()
+    gen = swn.generator.Generator()
+    sampledWorlds = np.zeros(4)
+    sampledLevels = np.zeros(len(levels))
+    sampledStars  = np.zeros(2)
+    sampledGasMoon = 0
+    numSystems = 0
+    for i in xrange(numSectors):
+        gen.set_seed(swn.random.seed_alphabet_encode(i+1))
+        sec = gen.sector(gType, swn.generator.STAGE_ORSS)
+        for s in sec.sorted_systems():
+            systemObj = sec.hexes[s].system
+            mainWorld = max(systemObj.worlds, key=lambda w: swn.world.TABLE_TECH_LEVEL_REVERSE[w.techLevel])
+            sampledWorlds[len(systemObj.worlds)] += 1
+            sampledLevels[levels.index(mainWorld.techLevel)] += 1
+            sampledStars[len(systemObj.stars)-1] += 1
+            for o in systemObj.objects:
+                if (isinstance(o, swn.orbitalobject.Planet) and o.objectType != swn.orbitalobject.TABLE_ORBITAL_OBJECT_TYPE['ROCKY']):
+                    if any(m.world is mainWorld for m in o.moons):
+                        sampledGasMoon += 1
+            numSystems += 1
+    print('Sampled {0} sectors in {1:.1f} sec'.format(numSectors, time.time()-start))
+    print('Worlds per system', pWorlds.sum(axis=0)/pWorlds.sum(), sampledWorlds/numSystems)
+    print('Main world TL    ', pLevels, sampledLevels/numSystems)
+    print('Stars per system ', pStars, sampledStars/numSystems)
+    print('Gas giant moon   ', pGasMoon, float(sampledGasMoon)/numSystems)
+
+def branches(numBranches=5, gType=1, seed='Bipiw'):
+    gen = swn.generator.Generator()
+    gen.set_seed(seed)
+    # Generate the sector up to its worlds, then snapshot it
+    start = time.time()
+    gen.sector(gType, swn.generator.STAGE_WORLDS)
+    snap = gen.snapshot()
+    base = gen.resume()
+    print('Base     {0:8.3f} sec'.format(time.time()-start))
+    # A fork with the same seed finishes the same sector
+    fork = gen.fork(snap)
+    print('Same seed', 'match' if full_summary(fork.resume()) == full_summary(base) else 'MISMATCH')
+    # Forks with other seeds share the positions and worlds
+    for i in xrange(numBranches):
+        start = time.time()
+        fork = gen.fork(snap, swn.random.seed_alphabet_encode(i+1))
+        sec  = fork.resume()
+        print('Branch {0} {1:8.3f} sec'.format(i, time.time()-start),
+              'same worlds' if summary(sec) == summary(base) else 'DIFFERENT WORLDS',
+              [len(sec.hexes[s].system.stars) for s in sec.sorted_systems()][:10])
+    # Forked sectors take the fork's seed, and reroll the same from it
+    rerolls = list()
+    for i in xrange(2):
+        fork = gen.fork(snap, 'Zozox')
+        sec  = fork.resume()
+        assert sec.seed == fork.seed == 'Zozox'
+        (row, col) = sec.sorted_systems()[0]
+        gen.regenerate_system(sec, row, col, 1)
+        rerolls.append(full_summary(sec))
+    print('Forked reroll', 'match' if rerolls[0] == rerolls[1] else 'MISMATCH')
+
+def full_summary(sec):
+    # Summary plus stars and orbital objects of every system
+    return(summary(sec) + [([st.colorText for st in sec.hexes[s].system.stars],
+                            [o.objectType for o in sec.hexes[s].system.objects]) for s in sec.sorted_systems()])
+
+def imagebench(numSectors=10, gType=1):
+    # Sector generation alone, then with the images created
+    gen = swn.generator.Generator()
+    for label in ['Generate', 'With images']:
+        start = time.time()
+        for i in xrange(numSectors):
+            gen.set_seed(swn.random.seed_alphabet_encode(i+1))
+            sec = gen.sector(gType)
+            if (label == 'With images'):
+                sec.images
+        print('{0:12} {1:8.3f} sec/sector'.format(label, (time.time()-start)/numSectors))
+
+def groupbench(numSectors=20):
+    # Time to generate sectors with each grouping method
+    gen = swn.generator.Generator()
+    for gType in xrange(9):
+        start = time.time()
+        for i in xrange(numSectors):
+            gen.set_seed(swn.random.seed_alphabet_encode(i+1))
+            gen.sector(gType, swn.generator.STAGE_POSITIONS)
+        print('Grouping method {0} {1:8.4f} sec/sector'.format(gType, (time.time()-start)/numSectors))
+
+def distbench(numSectors=20, gType=7):
+    # Distances between all systems, one pair at a time and from the table
+    gen = swn.generator.Generator()
+    sectors = list()
+    for i in xrange(numSectors):
+        gen.set_seed(swn.random.seed_alphabet_encode(i+1))
+        sectors.append(gen.sector(gType, swn.generator.STAGE_POSITIONS))
+    start = time.time()
+    for sec in sectors:
+        systems = sec.sorted_systems()
+        pairs = [[swn.hexutils.odd_q_distance(a[0], a[1], b[0], b[1]) for b in systems] for a in systems]
+    print('{0:12} {1:8.5f} sec/sector'.format('Pairs', (time.time()-start)/numSectors))
+    start = time.time()
+    for sec in sectors:
+        sec.system_distances()
+    print('{0:12} {1:8.5f} sec/sector'.format('Table', (time.time()-start)/numSectors))
+
+def worldcheck(numSectors=100, gType=1):
+    # Worlds rolled together must match worlds rolled one at a time
+    gen = swn.generator.Generator()
+    start = time.time()
+    for i in xrange(numSectors):
+        gen.set_seed(swn.random.seed_alphabet_encode(i+1))
+        sec = gen.sector(gType, swn.generator.STAGE_WORLDS)
+        for (row, col) in sec.sorted_systems():
+            for (index, w) in enumerate(sec.hexes[(row, col)].system.worlds):
+                single = gen.world(w.name, gen.stream(swn.generator.STAGE_WORLDS, row, col, index+1))
+                if (vars(single) != vars(w)):
+                    print('Mismatch', gen.seed, row, col, index)
+    print('{0} sectors checked, {1:8.4f} sec/sector'.format(numSectors, (time.time()-start)/numSectors))
+
+def orssbench(numSectors=30, gType=1):
+    # Fill systems one at a time and all at once, from the same worlds
+    gen = swn.generator.Generator()
+    times = [0., 0.]
+    for i in xrange(numSectors):
+        gen.set_seed(swn.random.seed_alphabet_encode(i+1))
+        gen.sector(gType, swn.generator.STAGE_WORLDS)
+        snap = gen.snapshot()
+        sectors = list()
+        for label in xrange(2):
+            sec = gen.fork(snap).partialSector
+            systemKeys = sec.sorted_systems()
+            start = time.time()
+            if (label == 0):
+                for (row, col) in systemKeys:
+                    gen.fill_system(sec.hexes[(row, col)].system, gen.stream(swn.generator.STAGE_ORSS, row, col))
+            else:
+                (rows, cols) = np.array(systemKeys).T
+                gen.fill_systems([sec.hexes[k].system for k in systemKeys], rows, cols)
+            times[label] += time.time()-start
+            sectors.append([([(o.objectType, [w.name for w in o.world_list()]) for o in sec.hexes[k].system.objects],
+                             [vars(s) for s in sec.hexes[k].system.stars]) for k in systemKeys])
+        if (sectors[0] != sectors[1]):
+            print('Mismatch', gen.seed)
+    print('{0:14} {1:8.5f} sec/sector'.format('One at a time', times[0]/numSectors))
+    print('{0:14} {1:8.5f} sec/sector'.format('All at once', times[1]/numSectors))
+
+def batch(numSectors=200, gType=1, workers=4):
+    seeds = [swn.random.seed_alphabet_encode(i) for i in xrange(1, numSectors+1)]
+    # Generate sectors one at a time
+    gen = swn.generator.Generator()
+    start = time.time()
+    serial = list()
+    for seed in seeds:
+        gen.set_seed(seed)
+        serial.append(full_summary(gen.sector(gType)))
+    print('{0:10} {1:8.4f} sec/sector'.format('Serial', (time.time()-start)/numSectors))
+    # Generate sectors in a process pool, in seed order and as they finish
+    for ordered in [True, False]:
+        start = time.time()
+        results = dict()
+        order = list()
+        for (seed, sec) in gen.sectors(seeds, gType, workers=workers, ordered=ordered):
+            results[seed] = full_summary(sec)
+            order.append(seed)
+        print('{0:10} {1:8.4f} sec/sector'.format('Ordered' if ordered else 'Unordered', (time.time()-start)/numSectors),
+              'in order' if order == seeds else 'out of order')
+        # Each seed must give the same sector no matter how it was generated
+        if ([results[seed] for seed in seeds] != serial):
+            print('MISMATCH')
+
+def columnbench(numSectors=200, gType=1, workers=4):
+    seeds = [swn.random.seed_alphabet_encode(i) for i in xrange(1, numSectors+1)]
+    # Columns of sectors generated one at a time
+    gen = swn.generator.Generator()
+    sectors = list()
+    for seed in seeds:
+        gen.set_seed(seed)
+        sectors.append(gen.sector(gType))
+    serial = [swn.columns.sector_columns(sec) for sec in sectors]
+    # Sectors pickled back from workers, then columns in shared memory
+    for sectorColumns in [False, True]:
+        start = time.time()
+        results = list(gen.sectors(seeds, gType, workers=workers, sectorColumns=sectorColumns))
+        print('{0:10} {1:8.4f} sec/sector'.format('Columns' if sectorColumns else 'Pickled', (time.time()-start)/numSectors))
+    # Each seed must give the same columns no matter how it was generated
+    for ((seed, shared), local) in zip(results, serial):
+        if ((shared.name != local.name) or
+            any(not np.array_equal(getattr(shared, c[0]), getattr(local, c[0])) for c in swn.columns.COLUMNS)):
+            print('Mismatch', seed)
+    # Bytes sent back for each sector
+    print('Pickled {0:,.0f} bytes/sector, columns {1:,.0f} bytes/sector'.format(
+          np.mean([len(cPickle.dumps(sec, 2)) for sec in sectors]),
+          np.mean([sum(getattr(c, column[0]).nbytes for column in swn.columns.COLUMNS) for c in serial])))
+
+def lazybench(numSectors=50, gType=1):
+    seeds = [swn.random.seed_alphabet_encode(i) for i in xrange(1, numSectors+1)]
+    gen = swn.generator.Generator()
+    for lazy in [False, True]:
+        gen.lazyOrss = lazy
+        sectors = list()
+        start = time.time()
+        for seed in seeds:
+            gen.set_seed(seed)
+            sectors.append(gen.sector(gType))
+        print('{0:6} {1:8.4f} sec/sector'.format('Lazy' if lazy else 'Eager', (time.time()-start)/numSectors))
+        if (lazy):
+            # Size of a deferred system, without its worlds
+            systemObj = sectors[0].hexes[sectors[0].sorted_systems()[0]].system
+            print('{0} bytes/system deferred'.format(sys.getsizeof(systemObj)))
+            # Use systems in a random order
+            for sec in sectors:
+                systemKeys = sec.sorted_systems()
+                for i in np.random.permutation(len(systemKeys)):
+                    sec.hexes[systemKeys[i]].system.stars
+            lazySectors = sectors
+        else:
+            eagerSectors = sectors
+    gen.lazyOrss = False
+    # Lazy systems must get the same data as eager ones
+    for (seed, eager, lazy) in zip(seeds, eagerSectors, lazySectors):
+        (eager, lazy) = (swn.columns.sector_columns(eager), swn.columns.sector_columns(lazy))
+        if any(not np.array_equal(getattr(eager, c[0]), getattr(lazy, c[0])) for c in swn.columns.COLUMNS):
+            print('Mismatch', seed)
+
+def lazycheck(numSectors=20, gType=1):
+    seeds = [swn.random.seed_alphabet_encode(i) for i in xrange(1, numSectors+1)]
+    gen = swn.generator.Generator()
+    for seed in seeds:
+        gen.set_seed(seed)
+        gen.lazyOrss = False
+        eager = gen.sector(gType)
+        gen.lazyOrss = True
+        lazy = gen.sector(gType)
+        lazySystems = [lazy.hexes[s].system for s in lazy.sorted_systems()]
+        # Fields ORSS doesn't change stay deferred
+        for s in lazySystems:
+            for w in s.worlds:
+                (w.tags, w.techLevel, w.population)
+        assert all(s.orss_deferred() for s in lazySystems)
+        # Read worlds before any stars or objects
+        eagerWorlds = [(w.name, w.atmosphere) for s in eager.sorted_systems() for w in eager.hexes[s].system.worlds]
+        lazyWorlds  = [(w.name, w.atmosphere) for s in lazySystems for w in s.worlds]
+        assert not any(s.orss_deferred() for s in lazySystems)
+        print(seed, 'match' if eagerWorlds == lazyWorlds else 'MISMATCH')
+    gen.lazyOrss = False
+
+def regen(seed='Bipiw', gType=1, numRerolls=5):
+    gen = swn.generator.Generator()
+    gen.set_seed(seed)
+    sec = gen.sector(gType)
+    sec.update_images()
+    base = full_summary(sec)
+    # Reroll one system a few times
+    (row, col) = sec.sorted_systems()[0]
+    for salt in xrange(numRerolls):
+        start = time.time()
+        systemObj = gen.regenerate_system(sec, row, col, salt)
+        print('Salt {0} {1:8.4f} sec'.format(salt, time.time()-start), [w.name for w in systemObj.worlds])
+    # Only the rerolled system changes, and names stay unique
+    changed = [i for (i, (a, b)) in enumerate(zip(base, full_summary(sec))) if a != b]
+    print('Changed entries', changed)
+    names = [sec.hexes[s].system.name for s in sec.sorted_systems()]
+    names += [w.name for s in sec.sorted_systems() for w in sec.hexes[s].system.worlds]
+    print('Names unique' if len(names) == len(set(names)) else 'DUPLICATE NAMES')
+
+def sizebench(sizes=((10,8),(20,16),(40,32),(100,100)), gType=1):
+    for (rows, cols) in sizes:
+        gen = swn.generator.Generator()
+        gen.set_seed('Bipiw')
+        start = time.time()
+        sec = gen.sector(gType, rows=rows, cols=cols)
+        elapsed = time.time() - start
+        systems = sec.sorted_systems()
+        names = [sec.hexes[s].system.name for s in systems]
+        names += [w.name for s in systems for w in sec.hexes[s].system.worlds]
+        print('{0:3d}x{1:<3d} {2:5d} systems {3:8.3f} sec'.format(rows, cols, len(systems), elapsed),
+              'names unique' if len(names) == len(set(names)) else 'DUPLICATE NAMES')
+
+def campaignbench(rows=4, cols=4, seed='Bipiw', workers=4):
+    gen = swn.generator.Generator()
+    start = time.time()
+    camp = gen.campaign(rows, cols, seed, workers=workers)
+    print('{0}x{1} campaign {2:8.3f} sec'.format(rows, cols, time.time()-start))
+    # Sectors one at a time from the same seeds
+    start = time.time()
+    for (majorRow, majorCol) in sorted(camp.sectors):
+        gen.set_seed(swn.generator.campaign_sector_seed(seed, majorRow, majorCol))
+        gen.sector()
+    print('Serial       {0:8.3f} sec'.format(time.time()-start))
+    # No name repeats anywhere in the campaign
+    names = [s.name for s in camp.sectors.itervalues()]
+    for (gRow, gCol) in camp.sorted_systems():
+        systemObj = camp.system(gRow, gCol)
+        names.append(systemObj.name)
+        names += [w.name[:-len(swn.generator.STATION_SUFFIX)] if w.name.endswith(swn.generator.STATION_SUFFIX) else w.name
+                  for w in systemObj.worlds]
+    print(len(camp.sorted_systems()), 'systems,', 'names unique' if len(names) == len(set(names)) else 'DUPLICATE NAMES')
+
+def summary(sec):
+    # Sector name and every system name and position
+    return([sec.name] + [(s, sec.hexes[s].system.name) for s in sec.sorted_systems()])
+
+def threadgen(args):
+    (seed, gType) = args
+    # Create generator
+    gen = swn.generator.Generator()
+    # Set seed
+    gen.set_seed(seed)
+    # Generate sector
+    return(summary(gen.sector(gType)))
+
+def threads(numThreads=4, gType=1):
+    seeds = ['Bipiw', 'a', 'Zz9', 'Q3x', 'swn', 'Sec', 'ZZZZZ', '10000']
+    # Generate sectors one at a time
+    serial = [threadgen((seed, gType)) for seed in seeds]
+    # Generate sectors concurrently
+    pool = ThreadPool(numThreads)
+    threaded = pool.map(threadgen, [(seed, gType) for seed in seeds])
+    pool.close()
+    pool.join()
+    # Each seed must give the same sector no matter how it was generated
+    for (seed, s, t) in zip(seeds, serial, threaded):
+        print(seed, 'match' if s == t else 'MISMATCH')
+
+def tl5_cluster(sec):
+    # At least 3 TL5 worlds within 3 hexes of each other
+    hexList = [s for s in sec.sorted_systems()
+               if any(w.techLevel == '5' for w in sec.hexes[s].system.worlds)]
+    for a in hexList:
+        near = [b for b in hexList if swn.hexutils.odd_q_distance(a[0], a[1], b[0], b[1]) <= 3]
+        if (len(near) >= 3):
+            return(True)
+    return(False)
+# Only needs worlds, so skip generating ORSS and later stages
+tl5_cluster.stage = swn.generator.STAGE_WORLDS
+
+def no_red_dwarf_worlds(sec):
+    # No worlds in single red dwarf star systems
+    for s in sec.sorted_systems():
+        systemObj = sec.hexes[s].system
+        if ((len(systemObj.stars) == 1) and (systemObj.stars[0].color == 'red') and systemObj.worlds):
+            return(False)
+    return(True)
+no_red_dwarf_worlds.stage = swn.generator.STAGE_ORSS
+
+def scan(predicate=tl5_cluster, start=0, stop=2000, checkpoint=None):
+    scanner = swn.scan.SeedScanner(predicate, checkpoint=checkpoint, chunkSize=100)
+    startTime = time.time()
+    for seed in scanner.scan(start, stop):
+        print('Match:', seed)
+    print('{0} matches, {1:.1f} sec'.format(len(scanner.matches), time.time()-startTime))
+    for (pid, rate) in sorted(scanner.worker_rates().items()):
+        print('Worker {0}: {1:.1f} seeds/sec'.format(pid, rate))
+
 if __name__ == '__main__':
     gen()
     #stats()
+    #threads()
+    #dicebench()
+    #seedbench()
+    #tracebench()
+    #aliascheck()
+    #exact()
+    #branches()
+    #imagebench()
+    #groupbench()
+    #distbench()
+    #worldcheck()
+    #orssbench()
+    #batch()
+    #columnbench()
+    #lazybench()
+    #lazycheck()
+    #regen()
+    #sizebench()
+    #campaignbench()
+    #scan()
     #runStats = cProfile.run('gen()', sort='cumtime')
\ No newline at end of file